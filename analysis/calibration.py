@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Cross-machine calibration of benchmark times.
+
+Absolute 4.1 times (ns/run, ns/op) and 4.2 durations are only comparable when
+they come from the same machine. Dividing them by the time of a reference
+workload from the same run gives machine-independent units, so precomputed
+and fresh results (or runs in the history database) can be compared
+directly.
+
+The reference is the results themselves, over a fixed set of cells so that
+every source is measured in the same unit:
+
+- 4.1: the geomean of the baseline variant (base / SC) at n=10 over every
+  bundled group, per language. A source missing any of these cells has no
+  4.1 reference for that language.
+- 4.2: the geomean over (mutant, property) tasks of the baseline strategies
+  of each task's geomean duration, per system, over the tasks whose trials
+  all finished before the timeout in every source being calibrated
+  together. Taking the tasks each source happened to finish would favour
+  faster machines, which finish more of the hard ones.
+
+compare_results.py pins the two sources it compares against each other;
+single sources (`show`, results_history.py) are pinned against the bundled
+precomputed results. The reference is recorded with every run by
+construction and measured by the native OCaml and JVM code itself, but it
+hides changes that affect the baseline itself.
+
+compare_results.py --normalize and results_history.py query --normalize use
+these references.
+
+Usage:
+    python calibration.py show --source precomputed
+    python calibration.py show --source fresh
+"""
+
+import sys
+import argparse
+from pathlib import Path
+from collections import defaultdict
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+sys.path.insert(0, str(EVAL_DIR / "etna_data_processing"))
+sys.path.insert(0, str(EVAL_DIR / "parsers"))
+
+from common.benchmarks import GENERATOR_SIZES, SCALA_GROUPS, TIMEOUT
+from common.stats import geomean
+from calculate_speedups import WORKLOAD_KEYS
+from parse_results_ocaml import RESULT_FILES
+
+# 4.1 reference cells: the baseline variant of these groups at this size
+REFERENCE_SIZE = GENERATOR_SIZES[0]
+REFERENCE_GROUPS = {
+    "ocaml": sorted(RESULT_FILES.values()),
+    "scala": SCALA_GROUPS,
+}
+
+# Source that single sources are pinned against
+ANCHOR_SOURCE = "precomputed"
+
+
+def completed_tasks(cells, baselines):
+    """{system: {(mutant, prop, strategy)}} of baseline tasks whose trials all finished before the timeout."""
+    tasks = defaultdict(set)
+    for (system, mutant, prop, strategy), values in cells.items():
+        if strategy in baselines and values and all(0 < v < TIMEOUT for v in values.values()):
+            tasks[system].add((mutant, prop, strategy))
+    return tasks
+
+
+def baseline_references(sources):
+    """
+    {source: {"4.1": {language: ns}, "4.2": {system: ns}}} over the fixed 4.1
+    cells and the 4.2 tasks completed in every one of `sources`.
+    """
+    # Imported here because compare_results itself imports this module
+    from compare_results import load_41_results, load_42_results
+    from scaling_fits import BASELINE_VARIANTS
+
+    references = {source: {"4.1": {}, "4.2": {}} for source in sources}
+
+    for source in sources:
+        cells = load_41_results(source)
+        for language, groups in REFERENCE_GROUPS.items():
+            keys = [(language, group, BASELINE_VARIANTS[language], REFERENCE_SIZE) for group in groups]
+            if all(cells.get(key, 0) > 0 for key in keys):
+                references[source]["4.1"][language] = geomean([cells[key] for key in keys])
+
+    baselines = {baseline for baseline, _ in WORKLOAD_KEYS.values()}
+    cells = {source: load_42_results(source) for source in sources}
+    completed = [completed_tasks(cells[source], baselines) for source in sources]
+    for system in ["BST", "STLC"]:
+        tasks = set.intersection(*(c.get(system, set()) for c in completed))
+        if not tasks:
+            continue
+        for source in sources:
+            references[source]["4.2"][system] = geomean([
+                geomean(list(cells[source][(system, *task)].values())) for task in tasks
+            ]) * 1e9
+
+    return references
+
+
+def references(sources):
+    """
+    Reference times in ns as {source: {"4.1": {language: ns}, "4.2": {system: ns}}},
+    pinned across `sources`; a source without any reference maps to None.
+    """
+    refs = baseline_references(list(dict.fromkeys(sources)))
+    return {source: r if r["4.1"] or r["4.2"] else None for source, r in refs.items()}
+
+
+def normalize_41(cells, refs):
+    """Divide {(language, group, variant, size): ns} by the per-language reference."""
+    return {
+        cell: value / refs["4.1"][cell[0]]
+        for cell, value in cells.items()
+        if refs["4.1"].get(cell[0])
+    }
+
+
+def normalize_42(cells, refs):
+    """Divide {(system, mutant, property, strategy): {seed: seconds}} by the per-system reference."""
+    return {
+        cell: {seed: value * 1e9 / refs["4.2"][cell[0]] for seed, value in values.items()}
+        for cell, values in cells.items()
+        if refs["4.2"].get(cell[0])
+    }
+
+
+def cmd_show(args):
+    refs = references([args.source, ANCHOR_SOURCE])[args.source]
+    if refs is None:
+        print(f"Error: No reference cells found for source '{args.source}'")
+        return 1
+    for kind, scopes in refs.items():
+        for scope, ns in sorted(scopes.items()):
+            print(f"{args.source} {kind} {scope}: {ns / 1e6:.6f} ms")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate benchmark times across machines.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    show = subparsers.add_parser("show", help="Print the reference times of a source")
+    show.add_argument("--source", choices=["precomputed", "fresh"], required=True,
+                      help="Data source: 'precomputed' or 'fresh'")
+    show.set_defaults(func=cmd_show)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Detect performance regressions between two result sets (e.g. precomputed vs fresh).
+
+4.2 (ETNA): for every (system, mutant, property, strategy) cell the trials
+of both runs are paired by seed and the per-seed log ratios are tested with
+a two-sided Wilcoxon signed-rank test (effect size: matched-pairs
+rank-biserial correlation, ratio: median per-seed ratio). Cells with fewer
+than MIN_PAIRS shared seeds fall back to an unpaired Mann-Whitney U test
+(effect size: Cliff's delta, ratio: ratio of medians). p-values are
+Benjamini-Hochberg adjusted across all cells, and a cell is flagged only if
+the adjusted q-value is below --alpha, |effect size| is at least
+--min-delta and the ratio moves by more than --min-ratio.
+
+4.1 (OCaml/Scala): each (language, group, variant, size) cell holds a single
+time, so no test is possible; cells are flagged on the ratio alone.
+
+Results from different machines are only comparable after --normalize, which
+divides both sides by their own reference time, taken over the same
+reference cells on both sides (see calibration.py).
+
+A ranked report is printed and saved as JSON. The exit status is 1 if any
+regression (slowdown) was flagged, so the tool can gate changes.
+
+Usage:
+    python compare_results.py --reference precomputed --candidate fresh
+    python compare_results.py --reference precomputed --candidate fresh --kind 4.2 --min-ratio 1.2
+    python compare_results.py --reference precomputed --candidate fresh --normalize
+"""
+
+import os
+import sys
+import json
+import math
+import argparse
+from pathlib import Path
+from statistics import median
+from collections import defaultdict
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.profiling import add_profiling_arguments, phase, start_profiling
+from common.stats import benjamini_hochberg, cliffs_delta, mann_whitney_u, rank_biserial, wilcoxon_signed_rank
+from calibration import references, normalize_41, normalize_42
+
+# Fewest shared seeds for the paired test; with 6 the exact p-value can reach 0.03
+MIN_PAIRS = 6
+
+PARSED_41_DIRS = {
+    "ocaml": "parsed_4.1_data_ocaml",
+    "scala": "parsed_4.1_data_scala",
+}
+
+
+def load_41_results(source):
+    """Return {(language, group, variant, size): time} for one source."""
+    cells = {}
+    for language, dirname in PARSED_41_DIRS.items():
+        directory = EVAL_DIR / dirname / source
+        if not directory.exists():
+            continue
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(".json"):
+                continue
+            with open(directory / filename) as f:
+                data = json.load(f)
+            for group, variants in data.items():
+                for variant, timings in variants.items():
+                    for size, value in timings.items():
+                        cells[(language, group, variant, int(size))] = value
+    return cells
+
+
+def load_42_results(source):
+    """Return {(system, mutant, property, strategy): {seed: duration}} for one source."""
+    cells = defaultdict(dict)
+    directory = EVAL_DIR / "parsed_4.2_data" / source / "parsed"
+    for system in ["BST", "STLC"]:
+        path = directory / f"{system.lower()}_results.json"
+        if not path.exists():
+            continue
+        with open(path) as f:
+            data = json.load(f)
+        for mutant, properties in data.items():
+            for prop, values in properties.items():
+                for key, value in values.items():
+                    if value is None:
+                        continue
+                    strategy, seed = key.rsplit("_", 1)
+                    cells[(system, mutant, prop, strategy)][seed] = value
+    return cells
+
+
+def classify(ratio, significant, min_ratio):
+    if not significant or ratio is None:
+        return "unchanged"
+    if ratio >= min_ratio:
+        return "regression"
+    if ratio <= 1 / min_ratio:
+        return "improvement"
+    return "unchanged"
+
+
+def compare_41(reference, candidate, min_ratio):
+    rows = []
+    for cell in sorted(set(reference) & set(candidate)):
+        ref, cand = reference[cell], candidate[cell]
+        ratio = cand / ref if ref else None
+        language, group, variant, size = cell
+        rows.append({
+            "kind": "4.1",
+            "cell": {"language": language, "group": group, "variant": variant, "size": size},
+            "reference": ref,
+            "candidate": cand,
+            "ratio": ratio,
+            "status": classify(ratio, True, min_ratio),
+        })
+    return rows
+
+
+def paired_test(ref, cand):
+    """Wilcoxon signed-rank test on the per-seed log ratios of the shared seeds."""
+    seeds = sorted(set(ref) & set(cand))
+    logs = [math.log(cand[seed] / ref[seed]) for seed in seeds if ref[seed] > 0 and cand[seed] > 0]
+    w_plus, n, p_value = wilcoxon_signed_rank(logs)
+    return {
+        "test": "wilcoxon",
+        "pairs": len(logs),
+        "ratio": math.exp(median(logs)) if logs else None,
+        "effect_size": rank_biserial(w_plus, n),
+        "p_value": p_value,
+    }
+
+
+def unpaired_test(ref, cand):
+    """Mann-Whitney U test of all trials, for cells whose seeds do not match."""
+    ref, cand = list(ref.values()), list(cand.values())
+    u_cand, p_value = mann_whitney_u(cand, ref)
+    ref_median = median(ref)
+    return {
+        "test": "mann-whitney",
+        "pairs": 0,
+        "ratio": median(cand) / ref_median if ref_median else None,
+        "effect_size": cliffs_delta(cand, ref, u_cand),
+        "p_value": p_value,
+    }
+
+
+def compare_42(reference, candidate, alpha, min_delta, min_ratio):
+    rows = []
+    for cell in sorted(set(reference) & set(candidate)):
+        ref, cand = reference[cell], candidate[cell]
+        shared = len(set(ref) & set(cand))
+        result = paired_test(ref, cand) if shared >= MIN_PAIRS else unpaired_test(ref, cand)
+        system, mutant, prop, strategy = cell
+        rows.append({
+            "kind": "4.2",
+            "cell": {"system": system, "mutant": mutant, "property": prop, "strategy": strategy},
+            "n_reference": len(ref),
+            "n_candidate": len(cand),
+            "reference": median(ref.values()),
+            "candidate": median(cand.values()),
+            **result,
+        })
+
+    q_values = benjamini_hochberg([row["p_value"] for row in rows])
+    for row, q_value in zip(rows, q_values):
+        row["q_value"] = q_value
+        significant = q_value < alpha and abs(row["effect_size"]) >= min_delta
+        row["status"] = classify(row["ratio"], significant, min_ratio)
+    return rows
+
+
+def rank_rows(rows):
+    """Flagged cells first, then by magnitude of the log ratio."""
+    def key(row):
+        flagged = row["status"] != "unchanged"
+        magnitude = abs(math.log(row["ratio"])) if row["ratio"] else 0.0
+        return (not flagged, -magnitude)
+    return sorted(rows, key=key)
+
+
+def describe(row):
+    return "/".join(str(v) for v in row["cell"].values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result sets and flag regressions.")
+    parser.add_argument(
+        "--reference",
+        choices=["precomputed", "fresh"],
+        default="precomputed",
+        help="Reference data source (default: precomputed)"
+    )
+    parser.add_argument(
+        "--candidate",
+        choices=["precomputed", "fresh"],
+        default="fresh",
+        help="Candidate data source (default: fresh)"
+    )
+    parser.add_argument(
+        "--kind",
+        choices=["4.1", "4.2", "all"],
+        default="all",
+        help="Which results to compare (default: all)"
+    )
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=0.05,
+        help="Significance level for the adjusted q-values (default: 0.05)"
+    )
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=0.33,
+        help="Minimum |effect size| (rank-biserial or Cliff's delta) for a 4.2 cell to be flagged (default: 0.33)"
+    )
+    parser.add_argument(
+        "--min-ratio",
+        type=float,
+        default=1.1,
+        help="Minimum candidate/reference median ratio (or its inverse) to flag (default: 1.1)"
+    )
+    parser.add_argument(
+        "--normalize",
+        action="store_true",
+        help="Divide each source by its baseline reference (see calibration.py) before comparing"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        help="Number of ranked rows to print (default: 20)"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="Output file path (default: comparisons/{reference}_vs_{candidate}.json)"
+    )
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    timer = start_profiling("compare_results", args)
+
+    if args.normalize:
+        # Both sources are pinned to the same reference cells
+        with phase("deserialization"):
+            refs = references([args.reference, args.candidate])
+        for source, ref in refs.items():
+            if ref is None:
+                print(f"Error: No baseline reference for source '{source}'")
+                print("It needs every baseline cell at n=10 or ETNA baseline tasks completed in both sources.")
+                return 2
+
+    rows = []
+    if args.kind in ("4.1", "all"):
+        with phase("deserialization"):
+            reference = load_41_results(args.reference)
+            candidate = load_41_results(args.candidate)
+        if args.normalize:
+            reference = normalize_41(reference, refs[args.reference])
+            candidate = normalize_41(candidate, refs[args.candidate])
+        print(f"4.1: {len(reference)} reference cells, {len(candidate)} candidate cells")
+        with phase("aggregation"):
+            rows += compare_41(reference, candidate, args.min_ratio)
+    if args.kind in ("4.2", "all"):
+        with phase("deserialization"):
+            reference = load_42_results(args.reference)
+            candidate = load_42_results(args.candidate)
+        if args.normalize:
+            reference = normalize_42(reference, refs[args.reference])
+            candidate = normalize_42(candidate, refs[args.candidate])
+        print(f"4.2: {len(reference)} reference cells, {len(candidate)} candidate cells")
+        with phase("aggregation"):
+            rows += compare_42(reference, candidate, args.alpha, args.min_delta, args.min_ratio)
+
+    if not rows:
+        print("Error: No overlapping cells to compare")
+        return 2
+
+    rows = rank_rows(rows)
+    counts = defaultdict(int)
+    for row in rows:
+        counts[row["status"]] += 1
+
+    print(f"\nCompared {len(rows)} cells: {counts['regression']} regressions, "
+          f"{counts['improvement']} improvements, {counts['unchanged']} unchanged")
+    for row in rows[:args.top]:
+        q = f", q={row['q_value']:.3g}" if "q_value" in row else ""
+        ratio = f"{row['ratio']:.3f}x" if row["ratio"] is not None else "n/a"
+        print(f"  [{row['status']:>11}] {row['kind']} {describe(row)}: {ratio}{q}")
+
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        output_dir = EVAL_DIR / "comparisons"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / f"{args.reference}_vs_{args.candidate}.json"
+
+    report = {
+        "reference": args.reference,
+        "candidate": args.candidate,
+        "thresholds": {"alpha": args.alpha, "min_delta": args.min_delta, "min_ratio": args.min_ratio},
+        "normalize": args.normalize,
+        "counts": dict(counts),
+        "rows": rows,
+    }
+    with phase("serialization"):
+        with open(output_path, "w") as f:
+            json.dump(report, f, indent=2)
+    print(f"\nReport saved to {output_path}")
+
+    timer.finish(output_path.parent)
+    return 1 if counts["regression"] else 0
+
+
+if __name__ == "__main__":
+    exit(main())
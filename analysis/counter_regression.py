@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Relate staging speedups to generator counters (binds and random draws).
+
+For every OCaml group with parsed counters (parsers/parse_counters.py) the
+speedups are taken from the parsed 4.1 results:
+
+- AllegrOCaml speedup: base / base_Staged_SR, against monadic binds,
+- CSplitMix speedup: base_Staged_SR / base_Staged_CSR, against random draws.
+
+Speedups are the geometric mean over all sizes, or the value at --size.
+Each speedup is fitted with a log-log line (speedup = constant * count ** exponent)
+across all groups, and the report lists every group's observed and predicted
+speedup. f15.py plots the same points.
+
+Output is written to parsed_4.1_data_ocaml/{source}/counters/regression.json.
+
+Usage:
+    python counter_regression.py --source precomputed
+    python counter_regression.py --source fresh --size 1000
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from collections import defaultdict
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+sys.path.insert(0, str(EVAL_DIR / "parsers"))
+
+from common.profiling import add_profiling_arguments, phase, start_profiling
+from common.stats import fit_power_law, geomean
+from compare_results import load_41_results
+from parse_counters import counters_at
+
+# (name, counter, numerator variant, denominator variant)
+SPEEDUPS = [
+    ("allegrocaml", "binds", "base", "base_Staged_SR"),
+    ("csplitmix", "draws", "base_Staged_SR", "base_Staged_CSR"),
+]
+
+
+def load_counters(source):
+    path = EVAL_DIR / "parsed_4.1_data_ocaml" / source / "counters" / "counters.json"
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def counter_points(source, size=None):
+    """
+    Return one dict per group with counters: group, binds, draws and the
+    'allegrocaml' and 'csplitmix' speedups (None when a variant is missing).
+    """
+    counters = load_counters(source)
+    if not counters:
+        return []
+
+    times = defaultdict(dict)
+    for (language, group, variant, n), value in load_41_results(source).items():
+        if language == "ocaml":
+            times[(group, variant)][n] = value
+
+    points = []
+    for group in sorted(counters):
+        counts = counters_at(counters, group, size)
+        if counts is None:
+            continue
+        point = {"group": group, **counts}
+        for name, _, numerator, denominator in SPEEDUPS:
+            top, bottom = times.get((group, numerator), {}), times.get((group, denominator), {})
+            sizes = [n for n in top if n in bottom and (size is None or n == size)]
+            point[name] = geomean([top[n] / bottom[n] for n in sizes])
+        points.append(point)
+    return points
+
+
+def fit_speedups(points):
+    """Fit each speedup against its counter; returns {name: fit dict with per-group predictions}."""
+    fits = {}
+    for name, counter, _, _ in SPEEDUPS:
+        usable = [p for p in points if p[name] is not None and p[counter] > 0]
+        fit = fit_power_law([p[counter] for p in usable], [p[name] for p in usable])
+        if fit is None:
+            fits[name] = None
+            continue
+        fits[name] = {
+            "counter": counter,
+            "exponent": fit["exponent"],
+            "constant": fit["constant"],
+            "r_squared": fit["r_squared"],
+            "groups": {
+                p["group"]: {
+                    counter: p[counter],
+                    "observed": p[name],
+                    "predicted": fit["constant"] * p[counter] ** fit["exponent"],
+                }
+                for p in usable
+            },
+        }
+    return fits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit staging speedups against generator counters.")
+    parser.add_argument(
+        "--source",
+        choices=["precomputed", "fresh"],
+        required=True,
+        help="Data source: 'precomputed' or 'fresh'"
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        help="Use speedups at this size instead of the geomean over all sizes"
+    )
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    timer = start_profiling("counter_regression", args)
+
+    with phase("deserialization"):
+        points = counter_points(args.source, args.size)
+    if not points:
+        print(f"Error: No counters found for source '{args.source}'")
+        print("Run the parsers first: python parsers/parse_counters.py --source", args.source)
+        return 1
+
+    with phase("aggregation"):
+        fits = fit_speedups(points)
+    for name, fit in fits.items():
+        if fit is None:
+            print(f"{name}: not enough groups to fit")
+            continue
+        print(f"{name} speedup ~ {fit['constant']:.3g} * {fit['counter']}^{fit['exponent']:.3f} "
+              f"(R^2={fit['r_squared']:.3f}, {len(fit['groups'])} groups)")
+        for group, entry in fit["groups"].items():
+            print(f"  {group}: {fit['counter']}={entry[fit['counter']]}, "
+                  f"observed {entry['observed']:.2f}X, predicted {entry['predicted']:.2f}X")
+
+    output_file = EVAL_DIR / "parsed_4.1_data_ocaml" / args.source / "counters" / "regression.json"
+    with phase("serialization"):
+        with open(output_file, "w") as f:
+            json.dump({"size": args.size, "points": points, "fits": fits}, f, indent=2)
+    print(f"\nRegression report saved to {output_file}")
+
+    timer.finish(output_file.parent)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Compare staging speedups across the OCaml and Scala generator benchmarks.
+
+Reads the normalized long tables written by parse_results_ocaml.py and
+parse_results_scala_csv.py (results_long.csv) and, for every benchmark both
+languages implement (Bool List, BST (Single-Pass), STLC), reports the
+baseline-over-staged speedup of AllegrOCaml and ScAllegro at each size they
+share, plus the ratio between the two.
+
+Usage:
+    python cross_language.py --source precomputed
+    python cross_language.py --source fresh -o cross.json
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from collections import defaultdict
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.profiling import add_profiling_arguments, phase, start_profiling
+from common.results_schema import LONG_TABLE_NAME, STAGED_NAMES, read_long_table
+
+LANGUAGES = ["ocaml", "scala"]
+
+# Benchmarks implemented the same way in both languages. Scala's BstType is
+# plotted as "BST (Repeated Insert)" by f16 but is not the same generator as
+# OCaml's bst_bespoke, so it is left out.
+SHARED_BENCHMARKS = ["Bool List", "BST (Single-Pass)", "STLC"]
+
+
+def load_long_tables(source):
+    """Return all long-table rows for both languages; missing tables are skipped."""
+    rows = []
+    for language in LANGUAGES:
+        path = EVAL_DIR / f"parsed_4.1_data_{language}" / source / LONG_TABLE_NAME
+        if path.exists():
+            rows.extend(read_long_table(path))
+        else:
+            print(f"Warning: {path} not found, skipping {language}")
+    return rows
+
+
+def staged_speedups(rows):
+    """Return {benchmark: {language: {size: baseline / staged}}}."""
+    times = defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
+    for row in rows:
+        if row["role"] in ("baseline", "staged"):
+            times[row["benchmark"]][row["language"]][row["role"]][row["size"]] = row["time_ns"]
+
+    speedups = defaultdict(dict)
+    for benchmark, by_language in times.items():
+        for language, by_role in by_language.items():
+            base, staged = by_role.get("baseline", {}), by_role.get("staged", {})
+            speedups[benchmark][language] = {
+                size: base[size] / staged[size]
+                for size in sorted(base)
+                if size in staged and staged[size] > 0
+            }
+    return speedups
+
+
+def cross_language_report(rows):
+    """Per shared benchmark and size, the speedup in each language and their ratio."""
+    report = {}
+    speedups = staged_speedups(rows)
+    for benchmark in SHARED_BENCHMARKS:
+        by_language = speedups.get(benchmark, {})
+        if not all(by_language.get(language) for language in LANGUAGES):
+            continue
+        ocaml, scala = by_language["ocaml"], by_language["scala"]
+        report[benchmark] = [
+            {
+                "size": size,
+                STAGED_NAMES["ocaml"]: ocaml[size],
+                STAGED_NAMES["scala"]: scala[size],
+                "ratio": ocaml[size] / scala[size],
+            }
+            for size in sorted(set(ocaml) & set(scala))
+        ]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-language staging speedup report for 4.1 benchmarks.")
+    parser.add_argument(
+        "--source",
+        choices=["precomputed", "fresh"],
+        required=True,
+        help="Data source: 'precomputed' or 'fresh'"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="Output file path (default: comparisons/cross_language_{source}.json)"
+    )
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    timer = start_profiling(f"cross_language_{args.source}", args)
+
+    with phase("deserialization"):
+        rows = load_long_tables(args.source)
+    with phase("aggregation"):
+        report = cross_language_report(rows)
+    if not report:
+        print(f"Error: No benchmarks with results in both languages for source '{args.source}'")
+        print("Run parsers/parse_results_ocaml.py and parsers/parse_results_scala_csv.py first")
+        return 1
+
+    ocaml_name, scala_name = STAGED_NAMES["ocaml"], STAGED_NAMES["scala"]
+    for benchmark, entries in report.items():
+        print(f"{benchmark}:")
+        print(f"  {'n':>8}  {ocaml_name:>12}  {scala_name:>12}  {'ratio':>8}")
+        for entry in entries:
+            print(f"  {entry['size']:>8}  {entry[ocaml_name]:>11.2f}X  {entry[scala_name]:>11.2f}X  "
+                  f"{entry['ratio']:>8.2f}")
+
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        output_dir = EVAL_DIR / "comparisons"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / f"cross_language_{args.source}.json"
+
+    with phase("serialization"):
+        with open(output_path, "w") as f:
+            json.dump(report, f, indent=2)
+    print(f"\nCross-language report saved to {output_path}")
+
+    timer.finish(output_path.parent)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Measurement-quality gate for the 4.1 generator benchmarks.
+
+For every (language, group, variant, size) the relative error is estimated
+from whatever the raw results provide:
+
+- JMH: 'Score Error (99.9%)' / Score,
+- Core_bench: the '95ci' column when the tables were printed with it,
+- both: the coefficient of variation across repeated runs. Repeated runs
+  are the raw files of 4.1_data_{language}/{source}/ plus any run*/
+  subdirectories holding the same files.
+
+Core_bench measurements whose quota allows fewer than --min-runs executions
+(quota / time per run) are flagged as well. Each flagged measurement gets a
+suggested Core_bench -quota or JMH iteration count. The suggestion assumes the
+error shrinks with the square root of the measurement time. JMH's Samples
+column counts forks x iterations, and the CSV does not record the fork count,
+so pass --forks when the benchmarks ran with more than one fork.
+
+The report is written to quality/{source}.json. Pass --exclude-unstable to
+f14.py / f16.py to leave flagged points out of the figures.
+
+Usage:
+    python measurement_quality.py --source precomputed
+    python measurement_quality.py --source fresh --max-rel-error 0.02 --max-spread 0.03
+    python measurement_quality.py --source fresh --forks 5
+"""
+
+import sys
+import json
+import math
+import argparse
+import statistics
+from pathlib import Path
+from collections import defaultdict
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+sys.path.insert(0, str(EVAL_DIR / "parsers"))
+
+from common.profiling import add_profiling_arguments, phase, start_profiling
+from common.results_schema import benchmark_name
+from parse_results_ocaml import RESULT_FILES, parse_benchmark_file, parse_quota, parse_table_ci
+from parse_results_scala_csv import latency_rows, read_jmh_rows
+
+# Largest suggested increase in quota / iterations; errors beyond this usually
+# come from outliers that more measurement time will not fix
+MAX_SCALE = 20
+
+
+def run_dirs(raw_dir):
+    """The raw results directory itself plus any run*/ subdirectories, in order."""
+    dirs = [raw_dir] if raw_dir.exists() else []
+    if raw_dir.exists():
+        dirs += sorted(d for d in raw_dir.iterdir() if d.is_dir() and d.name.startswith("run"))
+    return dirs
+
+
+def collect_ocaml(source):
+    """Return {(group, variant, size): {"times", "ci", "quota"}} over all OCaml runs."""
+    cells = defaultdict(lambda: {"times": [], "ci": [], "quota": None})
+    for directory in run_dirs(EVAL_DIR / "4.1_data_ocaml" / source):
+        for filename, group in RESULT_FILES.items():
+            path = directory / filename
+            if not path.exists():
+                continue
+            data, _ = parse_benchmark_file(path, group)
+            lines = path.read_text().splitlines(keepends=True)
+            quota = parse_quota(lines)
+            ci = parse_table_ci(lines, group)
+            for variant, by_size in data.items():
+                for size, time_ns in by_size.items():
+                    cell = cells[(group, variant, size)]
+                    cell["times"].append(time_ns)
+                    if size in ci.get(variant, {}):
+                        cell["ci"].append(ci[variant][size])
+                    if quota is not None:
+                        cell["quota"] = min(quota, cell["quota"] or quota)
+    return cells
+
+
+def collect_scala(source):
+    """Return {(group, variant, size): {"times", "ci", "samples"}} over all Scala runs."""
+    cells = defaultdict(lambda: {"times": [], "ci": [], "samples": None})
+    for directory in run_dirs(EVAL_DIR / "4.1_data_scala" / source):
+        path = directory / "results_scala.csv"
+        if not path.exists():
+            continue
+        for row in latency_rows(read_jmh_rows(path)):
+            cell = cells[(row["group"], row["variant"], row["size"])]
+            cell["times"].append(row["score"])
+            if row["error"] is not None and row["score"] > 0:
+                cell["ci"].append(row["error"] / row["score"])
+            if row["samples"] is not None:
+                cell["samples"] = int(row["samples"])
+    return cells
+
+
+def spread(times):
+    """Coefficient of variation across runs, or None with fewer than two runs."""
+    if len(times) < 2:
+        return None
+    return statistics.stdev(times) / statistics.mean(times)
+
+
+def scale_factor(error, threshold):
+    """How much longer to measure to bring `error` down to `threshold` (error ~ 1/sqrt(time))."""
+    return min((error / threshold) ** 2, MAX_SCALE)
+
+
+def assess(language, key, cell, args):
+    group, variant, size = key
+    time_ns = statistics.median(cell["times"])
+    rel_error = max(cell["ci"]) if cell["ci"] else None
+    run_spread = spread(cell["times"])
+
+    reasons, factor = [], 1.0
+    if rel_error is not None and rel_error > args.max_rel_error:
+        reasons.append(f"relative error {rel_error:.1%} > {args.max_rel_error:.1%}")
+        factor = max(factor, scale_factor(rel_error, args.max_rel_error))
+    if run_spread is not None and run_spread > args.max_spread:
+        reasons.append(f"run-to-run spread {run_spread:.1%} > {args.max_spread:.1%}")
+        factor = max(factor, scale_factor(run_spread, args.max_spread))
+
+    entry = {
+        "language": language,
+        "group": group,
+        "benchmark": benchmark_name(language, group),
+        "variant": variant,
+        "size": size,
+        "time_ns": time_ns,
+        "runs": len(cell["times"]),
+        "rel_error": rel_error,
+        "spread": run_spread,
+    }
+
+    if language == "ocaml":
+        quota = cell["quota"]
+        entry["quota_s"] = quota
+        if quota is not None:
+            entry["est_runs"] = quota * 1e9 / time_ns
+            if entry["est_runs"] < args.min_runs:
+                reasons.append(f"only ~{entry['est_runs']:.0f} runs fit in the {quota:g}s quota")
+                factor = max(factor, args.min_runs / entry["est_runs"])
+        if reasons and quota is not None:
+            entry["suggestion"] = f"-quota {math.ceil(quota * factor)}s"
+    else:
+        samples = cell["samples"]
+        entry["samples"] = samples
+        if reasons and samples is not None:
+            iterations = max(samples // args.forks, 1)
+            entry["suggestion"] = f"-i {math.ceil(iterations * factor)}"
+
+    entry["status"] = "unstable" if reasons else "ok"
+    entry["reasons"] = reasons
+    return entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flag unstable 4.1 benchmark measurements.")
+    parser.add_argument(
+        "--source",
+        choices=["precomputed", "fresh"],
+        required=True,
+        help="Data source: 'precomputed' or 'fresh'"
+    )
+    parser.add_argument(
+        "--max-rel-error",
+        type=float,
+        default=0.10,
+        help="Largest acceptable harness-reported relative error (default: 0.10)"
+    )
+    parser.add_argument(
+        "--max-spread",
+        type=float,
+        default=0.05,
+        help="Largest acceptable coefficient of variation across runs (default: 0.05)"
+    )
+    parser.add_argument(
+        "--min-runs",
+        type=float,
+        default=100,
+        help="Fewest Core_bench executions the quota should allow (default: 100)"
+    )
+    parser.add_argument(
+        "--forks",
+        type=int,
+        default=1,
+        help="JMH forks per benchmark, used to turn Samples into iterations (default: 1)"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="Output file path (default: quality/{source}.json)"
+    )
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    timer = start_profiling(f"measurement_quality_{args.source}", args)
+
+    with phase("deserialization"):
+        sources = (("ocaml", collect_ocaml(args.source)), ("scala", collect_scala(args.source)))
+
+    measurements = []
+    with phase("aggregation"):
+        for language, cells in sources:
+            for key in sorted(cells):
+                measurements.append(assess(language, key, cells[key], args))
+
+    if not measurements:
+        print(f"Error: No raw 4.1 results found for source '{args.source}'")
+        return 1
+
+    unstable = [m for m in measurements if m["status"] == "unstable"]
+    print(f"{len(measurements)} measurements, {len(unstable)} unstable")
+    if unstable:
+        print("\nRe-run:")
+        for m in unstable:
+            suggestion = m.get("suggestion") or "(no quota/iteration information)"
+            print(f"  {m['language']} {m['group']}/{m['variant']} n={m['size']}: {suggestion}  "
+                  f"[{'; '.join(m['reasons'])}]")
+
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        output_dir = EVAL_DIR / "quality"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / f"{args.source}.json"
+
+    report = {
+        "thresholds": {
+            "max_rel_error": args.max_rel_error,
+            "max_spread": args.max_spread,
+            "min_runs": args.min_runs,
+        },
+        "measurements": measurements,
+        "reruns": [
+            {k: m[k] for k in ("language", "group", "variant", "size", "reasons")} | {"suggestion": m.get("suggestion")}
+            for m in unstable
+        ],
+    }
+    with phase("serialization"):
+        with open(output_path, "w") as f:
+            json.dump(report, f, indent=2)
+    print(f"\nQuality report saved to {output_path}")
+
+    timer.finish(output_path.parent)
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
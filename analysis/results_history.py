@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Keep a local SQLite history of parsed benchmark results across runs.
+
+`ingest` appends the current parsed OCaml, Scala and ETNA outputs of a source
+as a new run (with timestamp, git revision and host), together with its
+calibration references (see calibration.py; pinned against the precomputed
+results). `query` returns the trend series
+of one cell across the most recent runs, in milliseconds, or with --normalize
+in multiples of each run's reference time so that runs from different
+machines line up.
+
+Usage:
+    python results_history.py ingest --source precomputed
+    python results_history.py ingest --source fresh --note "after CSR change"
+    python results_history.py query 4.1 --group bst_bespoke --variant base_Staged_CSR --size 10000 --last 20
+    python results_history.py query 4.2 --system BST --strategy baseTypestagedcsr --mutant insert_2
+    python results_history.py query 4.1 --group bst_bespoke --variant base_Staged_CSR --size 10000 --normalize
+    python results_history.py runs
+"""
+
+import os
+import sys
+import json
+import socket
+import sqlite3
+import argparse
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from statistics import median
+from collections import defaultdict
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.benchmarks import TIMEOUT
+from calibration import ANCHOR_SOURCE, references
+
+DEFAULT_DB = EVAL_DIR / "results_history.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    git_revision TEXT,
+    host TEXT,
+    note TEXT
+);
+CREATE TABLE IF NOT EXISTS etna_results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    system TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    mutant TEXT NOT NULL,
+    property TEXT NOT NULL,
+    seed TEXT NOT NULL,
+    time_ms REAL NOT NULL,
+    timed_out INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS generator_results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    language TEXT NOT NULL,
+    "group" TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    time_ms REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS calibration (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    reference TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    value_ns REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_etna_cell
+    ON etna_results (system, strategy, mutant, property, seed);
+CREATE INDEX IF NOT EXISTS idx_generator_cell
+    ON generator_results ("group", variant, size);
+"""
+
+# Parsed 4.1 directories and the factor converting their times to ms.
+# OCaml Core_bench reports ns/run and the JMH runs use ns/op.
+GENERATOR_SOURCES = {
+    "ocaml": ("parsed_4.1_data_ocaml", 1e-6),
+    "scala": ("parsed_4.1_data_scala", 1e-6),
+}
+
+
+def connect(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def git_revision():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=EVAL_DIR, capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def iter_generator_rows(source):
+    """Yield (language, group, variant, size, time_ms) from the parsed 4.1 JSON files."""
+    for language, (dirname, to_ms) in GENERATOR_SOURCES.items():
+        directory = EVAL_DIR / dirname / source
+        if not directory.exists():
+            continue
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(".json"):
+                continue
+            with open(directory / filename) as f:
+                data = json.load(f)
+            for group, variants in data.items():
+                for variant, timings in variants.items():
+                    for size, value in timings.items():
+                        yield language, group, variant, int(size), value * to_ms
+
+
+def iter_etna_rows(source):
+    """Yield (system, strategy, mutant, property, seed, time_ms, timed_out) from parsed ETNA JSON."""
+    directory = EVAL_DIR / "parsed_4.2_data" / source / "parsed"
+    for system in ["BST", "STLC"]:
+        path = directory / f"{system.lower()}_results.json"
+        if not path.exists():
+            continue
+        with open(path) as f:
+            data = json.load(f)
+        for mutant, properties in data.items():
+            for prop, values in properties.items():
+                for key, value in values.items():
+                    if value is None:
+                        continue
+                    strategy, seed = key.rsplit("_", 1)
+                    yield system, strategy, mutant, prop, seed, value * 1000, int(value >= TIMEOUT)
+
+
+def iter_calibration_rows(source):
+    """Yield (reference, scope, value_ns): the baseline reference of every language and system."""
+    refs = references([source, ANCHOR_SOURCE])[source] or {}
+    for scopes in refs.values():
+        for scope, value in scopes.items():
+            yield "baseline", scope, value
+
+
+def ingest(conn, source, note=None):
+    """Append the parsed results of `source` as a new run and return (run_id, counts)."""
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO runs (source, timestamp, git_revision, host, note) VALUES (?, ?, ?, ?, ?)",
+            (source, datetime.now().isoformat(timespec="seconds"), git_revision(), socket.gethostname(), note)
+        )
+        run_id = cursor.lastrowid
+
+        generator_rows = [(run_id, *row) for row in iter_generator_rows(source)]
+        conn.executemany(
+            'INSERT INTO generator_results (run_id, language, "group", variant, size, time_ms) VALUES (?, ?, ?, ?, ?, ?)',
+            generator_rows
+        )
+        etna_rows = [(run_id, *row) for row in iter_etna_rows(source)]
+        conn.executemany(
+            "INSERT INTO etna_results (run_id, system, strategy, mutant, property, seed, time_ms, timed_out) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            etna_rows
+        )
+        conn.executemany(
+            "INSERT INTO calibration (run_id, reference, scope, value_ns) VALUES (?, ?, ?, ?)",
+            [(run_id, *row) for row in iter_calibration_rows(source)]
+        )
+
+        if not generator_rows and not etna_rows:
+            raise ValueError(f"No parsed results found for source '{source}'")
+
+    return run_id, {"generator": len(generator_rows), "etna": len(etna_rows)}
+
+
+def query_generator(conn, group, variant, size, language=None, last=20, normalize=False):
+    """
+    Return [(run_id, timestamp, git_revision, time_ms)] for the latest `last` runs.
+    With `normalize` the time is divided by the run's baseline reference and
+    runs without that reference are skipped.
+    """
+    if normalize:
+        sql = (
+            'SELECT r.id, r.timestamp, r.git_revision, g.time_ms / (c.value_ns * 1e-6) FROM generator_results g '
+            'JOIN runs r ON r.id = g.run_id '
+            "JOIN calibration c ON c.run_id = r.id AND c.reference = 'baseline' AND c.scope = g.language "
+            'WHERE g."group" = ? AND g.variant = ? AND g.size = ?'
+        )
+        params = [group, variant, size]
+    else:
+        sql = (
+            'SELECT r.id, r.timestamp, r.git_revision, g.time_ms FROM generator_results g '
+            'JOIN runs r ON r.id = g.run_id WHERE g."group" = ? AND g.variant = ? AND g.size = ?'
+        )
+        params = [group, variant, size]
+    if language:
+        sql += " AND g.language = ?"
+        params.append(language)
+    sql += " ORDER BY r.id DESC LIMIT ?"
+    params.append(last)
+    return list(reversed(conn.execute(sql, params).fetchall()))
+
+
+def query_etna(conn, system, strategy, mutant=None, prop=None, seed=None, last=20, normalize=False):
+    """
+    Return one summary per run for the matching ETNA trials:
+    [(run_id, timestamp, git_revision, median_ms, n, timeouts)].
+    With `normalize` the median is divided by the run's baseline reference and
+    runs without that reference are skipped.
+    """
+    filters = ["e.system = ?", "e.strategy = ?"]
+    params = [system, strategy]
+    for column, value in (("mutant", mutant), ("property", prop), ("seed", seed)):
+        if value is not None:
+            filters.append(f"e.{column} = ?")
+            params.append(value)
+
+    run_ids = [row[0] for row in conn.execute(
+        f"SELECT DISTINCT e.run_id FROM etna_results e WHERE {' AND '.join(filters)} "
+        "ORDER BY e.run_id DESC LIMIT ?", params + [last]
+    )]
+    if not run_ids:
+        return []
+
+    placeholders = ",".join("?" * len(run_ids))
+    rows = conn.execute(
+        f"SELECT r.id, r.timestamp, r.git_revision, e.time_ms, e.timed_out FROM etna_results e "
+        f"JOIN runs r ON r.id = e.run_id WHERE {' AND '.join(filters)} AND e.run_id IN ({placeholders})",
+        params + run_ids
+    ).fetchall()
+
+    per_run = defaultdict(list)
+    meta = {}
+    for run_id, timestamp, revision, time_ms, timed_out in rows:
+        per_run[run_id].append((time_ms, timed_out))
+        meta[run_id] = (timestamp, revision)
+
+    scale = dict.fromkeys(run_ids, 1.0)
+    if normalize:
+        scale = dict(conn.execute(
+            f"SELECT run_id, value_ns * 1e-6 FROM calibration WHERE reference = 'baseline' AND scope = ? "
+            f"AND run_id IN ({placeholders})", [system] + run_ids
+        ).fetchall())
+
+    series = []
+    for run_id in sorted(per_run):
+        if run_id not in scale:
+            continue
+        times = [t for t, _ in per_run[run_id]]
+        timeouts = sum(flag for _, flag in per_run[run_id])
+        series.append((run_id, *meta[run_id], median(times) / scale[run_id], len(times), timeouts))
+    return series
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite history of parsed benchmark results.")
+    parser.add_argument(
+        "--db",
+        default=str(DEFAULT_DB),
+        help="SQLite database path (default: results_history.sqlite)"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="Append the parsed results of a source as a new run")
+    ingest_parser.add_argument("--source", choices=["precomputed", "fresh"], required=True,
+                               help="Data source: 'precomputed' or 'fresh'")
+    ingest_parser.add_argument("--note", help="Free-form note stored with the run")
+
+    subparsers.add_parser("runs", help="List recorded runs")
+
+    query_parser = subparsers.add_parser("query", help="Print a trend series in milliseconds")
+    query_parser.add_argument("kind", choices=["4.1", "4.2"])
+    query_parser.add_argument("--group", help="4.1 benchmark group, e.g. bst_bespoke")
+    query_parser.add_argument("--variant", help="4.1 variant, e.g. base_Staged_CSR")
+    query_parser.add_argument("--size", type=int, help="4.1 size")
+    query_parser.add_argument("--language", choices=list(GENERATOR_SOURCES), help="4.1 language")
+    query_parser.add_argument("--system", choices=["BST", "STLC"], help="4.2 system")
+    query_parser.add_argument("--strategy", help="4.2 strategy, e.g. baseTypestagedcsr")
+    query_parser.add_argument("--mutant", help="4.2 mutant")
+    query_parser.add_argument("--property", help="4.2 property")
+    query_parser.add_argument("--seed", help="4.2 seed")
+    query_parser.add_argument("--last", type=int, default=20, help="Number of most recent runs (default: 20)")
+    query_parser.add_argument("--normalize", action="store_true",
+                              help="Report times as multiples of each run's baseline reference time")
+    query_parser.add_argument("--json", action="store_true", help="Print the series as JSON")
+
+    args = parser.parse_args()
+    conn = connect(args.db)
+
+    if args.command == "ingest":
+        try:
+            run_id, counts = ingest(conn, args.source, args.note)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        print(f"Recorded run {run_id} from {args.source}: "
+              f"{counts['generator']} generator rows, {counts['etna']} ETNA rows")
+        return 0
+
+    if args.command == "runs":
+        for run in conn.execute("SELECT id, source, timestamp, git_revision, host, note FROM runs ORDER BY id"):
+            run_id, source, timestamp, revision, host, note = run
+            print(f"{run_id:>4}  {timestamp}  {source:<11}  {(revision or '-')[:10]:<10}  {host or '-'}  {note or ''}")
+        return 0
+
+    if args.kind == "4.1":
+        if not (args.group and args.variant and args.size is not None):
+            print("Error: 4.1 queries need --group, --variant and --size")
+            return 1
+        series = query_generator(conn, args.group, args.variant, args.size, args.language, args.last, args.normalize)
+        key = "time_rel" if args.normalize else "time_ms"
+        records = [{"run": r, "timestamp": t, "git_revision": g, key: ms} for r, t, g, ms in series]
+    else:
+        if not (args.system and args.strategy):
+            print("Error: 4.2 queries need --system and --strategy")
+            return 1
+        series = query_etna(conn, args.system, args.strategy, args.mutant, args.property, args.seed,
+                            args.last, args.normalize)
+        key = "median_rel" if args.normalize else "median_ms"
+        records = [
+            {"run": r, "timestamp": t, "git_revision": g, key: ms, "trials": n, "timeouts": to}
+            for r, t, g, ms, n, to in series
+        ]
+
+    if not records:
+        print("No matching results")
+        return 1
+
+    if args.json:
+        print(json.dumps(records, indent=2))
+    else:
+        for record in records:
+            value = record.get("time_ms", record.get("median_ms"))
+            unit = "ms"
+            if value is None:
+                value = record.get("time_rel", record.get("median_rel"))
+                unit = "x baseline"
+            extra = f"  ({record['trials']} trials, {record['timeouts']} timeouts)" if "trials" in record else ""
+            print(f"{record['run']:>4}  {record['timestamp']}  {(record['git_revision'] or '-')[:10]:<10}  {value:.4f} {unit}{extra}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Local HTTP service for parsed 4.1 and 4.2 results.
+
+Loads the parsed outputs of every available source once, precomputes the
+aggregates the figure scripts show and serves them as JSON:
+
+    GET /                                   list of endpoints
+    GET /api/<source>/41/runtimes           {language: {group: {variant: {size: ns}}}}      (f14, f16)
+    GET /api/<source>/41/speedups           {language: {group: {variant: {size: speedup}}}} over the baseline
+    GET /api/<source>/42/geomeans           {system: {workload: {strategy: geomean}}}       (f17)
+    GET /api/<source>/42/distributions      {system: {workload: {strategy: quartiles}}}     (f18)
+
+Every response carries an ETag; requests with a matching If-None-Match
+(including `*` and weak W/ tags) get 304 Not Modified. HEAD returns the same
+headers as GET without the body. Input files are polled every --poll-interval seconds and
+all aggregates are rebuilt when any of them changes.
+
+Usage:
+    python results_server.py
+    python results_server.py --port 8042 --poll-interval 5
+"""
+
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+import statistics
+from pathlib import Path
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+sys.path.insert(0, str(EVAL_DIR / "etna_data_processing"))
+
+from calculate_speedups import WORKLOAD_KEYS
+from compare_results import PARSED_41_DIRS, load_41_results
+from scaling_fits import BASELINE_VARIANTS
+from timeout_budgets import flat_geomeans
+
+SOURCES = ["precomputed", "fresh"]
+
+
+def input_files():
+    """Every file the aggregates are built from."""
+    files = []
+    for source in SOURCES:
+        for dirname in PARSED_41_DIRS.values():
+            files += (EVAL_DIR / dirname / source).glob("*.json")
+        files += (EVAL_DIR / "parsed_4.2_data" / source / "speedups").glob("*.json")
+    return sorted(files)
+
+
+def input_signature():
+    signature = []
+    for path in input_files():
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def runtimes_41(source):
+    runtimes = defaultdict(lambda: defaultdict(dict))
+    for (language, group, variant, size), value in sorted(load_41_results(source).items()):
+        runtimes[language].setdefault(group, {}).setdefault(variant, {})[size] = value
+    return runtimes
+
+
+def speedups_41(runtimes):
+    speedups = {}
+    for language, groups in runtimes.items():
+        baseline = BASELINE_VARIANTS[language]
+        for group, variants in groups.items():
+            base = variants.get(baseline, {})
+            speedups.setdefault(language, {})[group] = {
+                variant: {size: base[size] / t for size, t in timings.items() if size in base and t > 0}
+                for variant, timings in variants.items()
+            }
+    return speedups
+
+
+def quartiles(values):
+    values = sorted(values)
+    if len(values) < 2:
+        return {"count": len(values), "min": values[0] if values else None}
+    q1, median, q3 = statistics.quantiles(values, n=4)
+    return {"count": len(values), "min": values[0], "q1": q1, "median": median, "q3": q3, "max": values[-1]}
+
+
+def aggregates_42(source):
+    geomeans, distributions = defaultdict(dict), defaultdict(dict)
+    directory = EVAL_DIR / "parsed_4.2_data" / source / "speedups"
+    for system in ["BST", "STLC"]:
+        for workload in WORKLOAD_KEYS:
+            path = directory / f"{system.lower()}_{workload}.json"
+            if not path.exists():
+                continue
+            with open(path) as f:
+                data = json.load(f)
+            if not data:
+                continue
+            values = defaultdict(list)
+            for properties in data.values():
+                for seeds in properties.values():
+                    for by_strategy in seeds.values():
+                        for strategy, value in by_strategy.items():
+                            values[strategy].append(value)
+            geomeans[system][workload] = flat_geomeans(data)
+            distributions[system][workload] = {s: quartiles(v) for s, v in values.items()}
+    return geomeans, distributions
+
+
+def build_routes():
+    """Return {path: (body bytes, etag)} for every endpoint."""
+    documents = {}
+    for source in SOURCES:
+        runtimes = runtimes_41(source)
+        geomeans, distributions = aggregates_42(source)
+        documents[f"/api/{source}/41/runtimes"] = runtimes
+        documents[f"/api/{source}/41/speedups"] = speedups_41(runtimes)
+        documents[f"/api/{source}/42/geomeans"] = geomeans
+        documents[f"/api/{source}/42/distributions"] = distributions
+    documents["/"] = {"endpoints": sorted(documents)}
+
+    routes = {}
+    for path, document in documents.items():
+        body = json.dumps(document, indent=2).encode()
+        routes[path] = (body, '"' + hashlib.sha1(body).hexdigest() + '"')
+    return routes
+
+
+class ResultsStore:
+    """Holds the precomputed routes and rebuilds them when the inputs change."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.signature = None
+        self.routes = {}
+        self.reload()
+
+    def reload(self):
+        signature = input_signature()
+        if signature == self.signature:
+            return False
+        routes = build_routes()
+        with self.lock:
+            self.routes, self.signature = routes, signature
+        return True
+
+    def get(self, path):
+        with self.lock:
+            return self.routes.get(path)
+
+    def watch(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                if self.reload():
+                    print(f"Reloaded results ({len(self.signature)} input files)")
+            except Exception as e:
+                print(f"Reload failed, keeping previous results: {e}")
+
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison of an If-None-Match header against an ETag, as for GET/HEAD."""
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+
+def make_handler(store):
+    class Handler(BaseHTTPRequestHandler):
+        def send_headers(self):
+            """Send the status and headers for the request path; returns the body to send, if any."""
+            route = store.get(self.path.split("?", 1)[0].rstrip("/") or "/")
+            if route is None:
+                self.send_error(404, "Unknown endpoint")
+                return None
+            body, etag = route
+            if etag_matches(self.headers.get("If-None-Match", ""), etag):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return None
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            return body
+
+        def do_GET(self):
+            body = self.send_headers()
+            if body is not None:
+                self.wfile.write(body)
+
+        def do_HEAD(self):
+            self.send_headers()
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve parsed benchmark results over HTTP.")
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Address to bind (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8042,
+        help="Port to listen on (default: 8042)"
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=2.0,
+        help="Seconds between checks for changed input files (default: 2)"
+    )
+    args = parser.parse_args()
+
+    store = ResultsStore()
+    print(f"Loaded {len(store.signature)} input files, {len(store.routes)} endpoints")
+    threading.Thread(target=store.watch, args=(args.poll_interval,), daemon=True).start()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(store))
+    print(f"Serving on http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Fit log-log scaling laws to the parsed 4.1 generator benchmarks.
+
+For every (language, group, variant) the runtimes at all available sizes are
+fitted with time = constant * size ** exponent. The report also gives the
+per-element cost (time / size), the local exponent between consecutive
+sizes, and the speedup over the language's baseline variant at each size
+together with its own log-log slope (how the speedup changes with n).
+Series whose exponent exceeds 1 + --tolerance are flagged as superlinear.
+
+Usage:
+    python scaling_fits.py --source precomputed
+    python scaling_fits.py --source fresh --tolerance 0.1
+"""
+
+import sys
+import json
+import math
+import argparse
+from pathlib import Path
+from collections import defaultdict
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.profiling import add_profiling_arguments, phase, start_profiling
+from common.stats import fit_power_law
+from compare_results import load_41_results
+
+# Variant that speedups are measured against, per language
+BASELINE_VARIANTS = {
+    "ocaml": "base",
+    "scala": "SC",
+}
+
+
+def group_series(cells):
+    """Turn {(language, group, variant, size): time} into {(language, group): {variant: {size: time}}}."""
+    series = defaultdict(lambda: defaultdict(dict))
+    for (language, group, variant, size), value in cells.items():
+        series[(language, group)][variant][size] = value
+    return series
+
+
+def local_exponents(sizes, times):
+    return [
+        math.log(t2 / t1) / math.log(n2 / n1)
+        for (n1, t1), (n2, t2) in zip(zip(sizes, times), zip(sizes[1:], times[1:]))
+    ]
+
+
+def analyze_series(variants, baseline, tolerance):
+    results = {}
+    base = variants.get(baseline, {})
+    for variant, timings in sorted(variants.items()):
+        sizes = sorted(timings)
+        times = [timings[n] for n in sizes]
+        fit = fit_power_law(sizes, times)
+        entry = {
+            "sizes": sizes,
+            "times": times,
+            "per_element": [t / n for n, t in zip(sizes, times)],
+            "local_exponents": local_exponents(sizes, times),
+            "fit": fit,
+            "superlinear": bool(fit and fit["exponent"] > 1 + tolerance),
+        }
+
+        if variant != baseline and base:
+            shared = [n for n in sizes if n in base]
+            speedups = [base[n] / timings[n] for n in shared]
+            speedup_fit = fit_power_law(shared, speedups)
+            entry["speedup"] = {
+                "sizes": shared,
+                "values": speedups,
+                "exponent": speedup_fit["exponent"] if speedup_fit else None,
+            }
+        results[variant] = entry
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit scaling laws to 4.1 benchmark results.")
+    parser.add_argument(
+        "--source",
+        choices=["precomputed", "fresh"],
+        required=True,
+        help="Data source: 'precomputed' or 'fresh'"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.05,
+        help="Exponent margin above 1 before a series is flagged as superlinear (default: 0.05)"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="Output file path (default: scaling/{source}.json)"
+    )
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    timer = start_profiling(f"scaling_fits_{args.source}", args)
+
+    with phase("deserialization"):
+        cells = load_41_results(args.source)
+    if not cells:
+        print(f"Error: No parsed 4.1 results found for source '{args.source}'")
+        return 1
+
+    report = {}
+    for (language, group), variants in sorted(group_series(cells).items()):
+        with phase("aggregation"):
+            results = analyze_series(variants, BASELINE_VARIANTS[language], args.tolerance)
+        report.setdefault(language, {})[group] = results
+
+        print(f"{language}/{group}:")
+        for variant, entry in results.items():
+            fit = entry["fit"]
+            if fit is None:
+                print(f"  {variant}: not enough sizes to fit")
+                continue
+            flag = "  SUPERLINEAR" if entry["superlinear"] else ""
+            speedup = ""
+            if entry.get("speedup") and entry["speedup"]["exponent"] is not None:
+                speedup = f", speedup ~ n^{entry['speedup']['exponent']:+.3f}"
+            print(f"  {variant}: t ~ {fit['constant']:.3g} * n^{fit['exponent']:.3f} "
+                  f"(R^2={fit['r_squared']:.4f}){speedup}{flag}")
+
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        output_dir = EVAL_DIR / "scaling"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / f"{args.source}.json"
+
+    with phase("serialization"):
+        with open(output_path, "w") as f:
+            json.dump(report, f, indent=2)
+    print(f"\nScaling report saved to {output_path}")
+
+    timer.finish(output_path.parent)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
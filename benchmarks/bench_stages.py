@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Time and memory-profile each pipeline stage on synthetic datasets.
+
+For every scale the dataset is generated on first use (see
+generate_synthetic_data.py), then the following stages are run on it:
+ETNA parse, clean and speedups per system, OCaml and Scala 4.1 parsing, and
+the f17 figure data preparation. Wall time comes from an untraced run and
+peak memory from a second run under tracemalloc.
+
+Results are written as JSON so later runs can be compared with --compare.
+
+Usage:
+    python bench_stages.py
+    python bench_stages.py --scales 1 10 --no-memory
+    python bench_stages.py --scales 1 --compare results/stages-20250101-120000.json
+"""
+
+import sys
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR / "parsers"))
+sys.path.insert(0, str(EVAL_DIR / "etna_data_processing"))
+sys.path.insert(0, str(EVAL_DIR / "figure_scripts"))
+
+from generate_synthetic_data import generate
+from parse_etna_data import parse_results
+from parse_results_ocaml import RESULT_FILES, parse_benchmark_file
+from parse_results_scala_csv import parse_results_csv
+from clean_under5ms_or_timeout import clean_results
+from run_etna_pipeline import compute_all_speedups
+
+
+def measure(func, *args, memory=True):
+    """Run func(*args) and return (result, seconds, peak_bytes or None)."""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return result, elapsed, peak
+
+
+def parse_ocaml_dir(input_dir):
+    return {group: parse_benchmark_file(input_dir / filename, group)[0]
+            for filename, group in RESULT_FILES.items()}
+
+
+def load_figure_prep():
+    """Return f17's geomean function, or None when its plotting deps are missing."""
+    try:
+        from f17 import BENCHMARK_FILES, compute_geomean_speedups
+    except ImportError as e:
+        print(f"  Skipping figure data prep: {e}")
+        return None
+
+    def prep(speedups_by_file):
+        return {
+            display_name: compute_geomean_speedups(speedups_by_file[filename], staged_key, staged_csr_key)[0]
+            for filename, display_name, staged_key, staged_csr_key in BENCHMARK_FILES
+            if filename in speedups_by_file
+        }
+    return prep
+
+
+def bench_scale(data_dir, memory=True):
+    stages = {}
+    figure_prep = load_figure_prep()
+    speedups_by_file = {}
+
+    def record(name, func, *args):
+        result, seconds, peak = measure(func, *args, memory=memory)
+        stages[name] = {"seconds": seconds, "peak_bytes": peak}
+        peak_str = f", peak {peak / 2 ** 20:.1f} MiB" if peak is not None else ""
+        print(f"  {name}: {seconds:.3f}s{peak_str}")
+        return result
+
+    for system in ["BST", "STLC"]:
+        system_dir = data_dir / "4.2_data" / f"{system.lower()}-experiments"
+        if not system_dir.exists():
+            continue
+        key = system.lower()
+        parsed = record(f"etna_parse_{key}", parse_results, system, system_dir)
+        cleaned, _ = record(f"etna_clean_{key}", clean_results, parsed)
+        speedups = record(f"etna_speedups_{key}", compute_all_speedups, cleaned)
+        for workload, data in speedups.items():
+            speedups_by_file[f"{key}_{workload}.json"] = data
+
+    record("ocaml_parse", parse_ocaml_dir, data_dir / "4.1_data_ocaml")
+    record("scala_parse", parse_results_csv, data_dir / "4.1_data_scala" / "results_scala.csv")
+
+    if figure_prep is not None:
+        record("figure_prep_f17", figure_prep, speedups_by_file)
+
+    return stages
+
+
+def print_comparison(current, previous):
+    print("\nComparison against previous run (current / previous wall time):")
+    for scale, stages in current["scales"].items():
+        old_stages = previous.get("scales", {}).get(scale)
+        if not old_stages:
+            continue
+        for name, entry in stages.items():
+            old = old_stages.get(name)
+            if not old or not old["seconds"]:
+                continue
+            ratio = entry["seconds"] / old["seconds"]
+            print(f"  x{scale} {name}: {ratio:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipeline stages on synthetic data.")
+    parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="+",
+        default=[1, 10, 100],
+        help="Dataset scales to run (default: 1 10 100)"
+    )
+    parser.add_argument(
+        "--data-root",
+        help="Directory holding x{scale} datasets (default: synthetic_data/)"
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Skip the tracemalloc pass"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="Output file path (default: benchmarks/results/stages-{timestamp}.json)"
+    )
+    parser.add_argument(
+        "--compare",
+        help="Previous results JSON to compare against"
+    )
+    args = parser.parse_args()
+
+    data_root = Path(args.data_root) if args.data_root else EVAL_DIR / "synthetic_data"
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "host": platform.node(),
+        "scales": {},
+    }
+
+    for scale in args.scales:
+        data_dir = data_root / f"x{scale}"
+        if not data_dir.exists():
+            print(f"Generating scale {scale} dataset in {data_dir}...")
+            generate(data_dir, scale)
+        print(f"Benchmarking scale {scale} ({data_dir})...")
+        report["scales"][str(scale)] = bench_scale(data_dir, memory=not args.no_memory)
+
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        output_dir = Path(__file__).parent / "results"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / f"stages-{datetime.now():%Y%m%d-%H%M%S}.json"
+
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {output_path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(report, json.load(f))
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
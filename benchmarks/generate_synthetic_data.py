@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic benchmark data in the same formats as the bundled results.
+
+At --scale 1 the output matches the size of the bundled data: 30 ETNA seeds per
+system, six Core_bench tables with four sizes each and one JMH CSV. Scale N
+multiplies the number of seeds and the number of 4.1 sizes by N.
+
+Output layout (under --output-dir):
+    4.2_data/bst-experiments/oc3-bst-<seed>/BST,<strategy>,<mutant>,<prop>.txt
+    4.2_data/stlc-experiments/oc3-stlc-<seed>/STLC,<strategy>,<mutant>,<prop>.txt
+    4.1_data_ocaml/results_*.txt
+    4.1_data_scala/results_scala.csv
+
+Usage:
+    python generate_synthetic_data.py --scale 1
+    python generate_synthetic_data.py --scale 10 --output-dir /tmp/synthetic_x10
+"""
+
+import sys
+import random
+import argparse
+from pathlib import Path
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.benchmarks import ETNA_FAMILIES, ETNA_TASKS, SCALA_GROUPS, STAGE_SUFFIXES, TIMEOUT, make_seeds
+
+# Typical speedup of each staged suffix over its base strategy
+STAGE_SPEEDUPS = dict(zip(STAGE_SUFFIXES, [1.0, 1.6, 2.2, 2.8]))
+
+# Core_bench file -> (group, benchmark name prefix)
+OCAML_TABLES = {
+    "results_bst.txt": ("bst_bespoke", "bst_bespoke_baseBespoke"),
+    "results_bsttype.txt": ("bst_type", "bst_type_baseType"),
+    "results_bstsingle.txt": ("bst_single", "bst_single_baseSingleBespoke"),
+    "results_stlc.txt": ("stlc_bespoke", "stlc_baseBespoke"),
+    "results_stlctype.txt": ("stlc_type", "stlc_baseType"),
+    "results_boollist.txt": ("boollist_bespoke", "boollist"),
+}
+
+OCAML_VARIANTS = [("", 1.0), ("_Staged_SR", 1.4), ("_Staged_CSR", 3.5)]
+BOOLLIST_VARIANTS = [("_base", 1.0), ("_staged_sr", 2.7), ("_staged_csr", 2.7)]
+
+
+def size_grid(scale):
+    """Return 4 * scale log-spaced sizes from 10 to 10000."""
+    count = 4 * scale
+    sizes = {int(round(10 ** (1 + 3 * i / (count - 1)))) for i in range(count)}
+    return sorted(sizes)
+
+
+def write_etna_system(rng, system, seeds, output_dir, timeout_rate=0.05):
+    """Write one oc3-<system>-<seed> directory per seed and return the file count."""
+    system_dir = output_dir / f"{system.lower()}-experiments"
+    tasks = ETNA_TASKS[system]
+
+    # Per-task difficulty is shared across seeds so that speedups are stable
+    difficulty = {
+        (mutant, prop): 10 ** rng.uniform(-3.8, 0.5)
+        for mutant, props in tasks.items()
+        for prop in props
+    }
+
+    count = 0
+    for seed in seeds:
+        seed_dir = system_dir / f"oc3-{system.lower()}-{seed}"
+        seed_dir.mkdir(parents=True, exist_ok=True)
+        for (mutant, prop), base_time in difficulty.items():
+            for family in ETNA_FAMILIES[system]:
+                for suffix, speedup in STAGE_SPEEDUPS.items():
+                    duration = base_time / speedup * rng.lognormvariate(0, 0.5)
+                    # Only slow tasks occasionally hang
+                    hangs = base_time >= 1.0 and rng.random() < timeout_rate
+                    if duration >= TIMEOUT or hangs:
+                        content = "[start]\n[exit timeout]\n"
+                    else:
+                        content = f"[start]\n[exit ok, {duration:.6f} duration {seed}]\n"
+                    path = seed_dir / f"{system},{family}{suffix},{mutant},{prop}.txt"
+                    path.write_text(content)
+                    count += 1
+    return count
+
+
+def format_ns(value):
+    whole, frac = f"{value:.2f}".split(".")
+    return f"{int(whole):_}.{frac}ns"
+
+
+def format_core_bench_table(rng, prefix, variants, sizes, quota=5):
+    """Return (text, row count) of a Core_bench box table with a `quota` second header."""
+    rows = []
+    for suffix, speedup in variants:
+        per_element = 10 ** rng.uniform(1.5, 2.5)
+        for size in sizes:
+            time_ns = per_element * size ** rng.uniform(1.0, 1.1) / speedup
+            rows.append((f"{prefix}{suffix}:n={size}", format_ns(time_ns), f"{time_ns / 2.5:_.2f}w"))
+
+    header = ("Name", "Time/Run", "mWd/Run")
+    widths = [max(len(r[i]) for r in rows + [header]) for i in range(3)]
+
+    def line(left, mid, right):
+        return left + mid.join("─" * (w + 2) for w in widths) + right + "\n"
+
+    def row(cells):
+        first = f" {cells[0]:<{widths[0]}} "
+        rest = "".join(f"│ {c:>{w}} " for c, w in zip(cells[1:], widths[1:]))
+        return f"│{first}{rest}│\n"
+
+    text = (f"Estimated testing time {len(rows) * quota:g}s ({len(rows)} benchmarks x {quota:g}s). "
+            "Change using '-quota'.\n")
+    text += line("┌", "┬", "┐") + row(header) + line("├", "┼", "┤")
+    text += "".join(row(r) for r in rows)
+    text += line("└", "┴", "┘")
+    return text, len(rows)
+
+
+def write_core_bench_table(rng, path, prefix, variants, sizes):
+    text, count = format_core_bench_table(rng, prefix, variants, sizes)
+    with path.open("w") as f:
+        f.write(text)
+    return count
+
+
+def write_ocaml_tables(rng, output_dir, sizes):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    count = 0
+    for filename, (group, prefix) in OCAML_TABLES.items():
+        variants = BOOLLIST_VARIANTS if group == "boollist_bespoke" else OCAML_VARIANTS
+        count += write_core_bench_table(rng, output_dir / filename, prefix, variants, sizes)
+    return count
+
+
+JMH_HEADER = '"Benchmark","Mode","Threads","Samples","Score","Score Error (99.9%)","Unit"\n'
+
+
+def jmh_lines(rng, group, sizes):
+    """Yield the avgt CSV rows of one Scala group, unstaged and staged."""
+    for suffix, speedup in [("", 1.0), ("Staged", 2.0)]:
+        per_element = 10 ** rng.uniform(1.5, 2.5)
+        for size in sizes:
+            score = per_element * size / speedup
+            error = score * rng.uniform(0.01, 0.1)
+            yield f'"benchmark.GenBm.generate{group}{suffix}{size}","avgt",1,5,{score:.6f},{error:.6f},"ns/op"\n'
+
+
+def write_jmh_csv(rng, output_dir, sizes):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with (output_dir / "results_scala.csv").open("w") as f:
+        f.write(JMH_HEADER)
+        for group in SCALA_GROUPS:
+            for line in jmh_lines(rng, group, sizes):
+                f.write(line)
+                count += 1
+    return count
+
+
+def generate(output_dir, scale=1, rng_seed=0, systems=("BST", "STLC")):
+    """Generate a full synthetic dataset and return a summary of what was written."""
+    rng = random.Random(rng_seed)
+    output_dir = Path(output_dir)
+    seeds = make_seeds(rng, 30 * scale)
+    sizes = size_grid(scale)
+
+    summary = {"scale": scale, "seeds": len(seeds), "sizes": len(sizes), "etna_files": {}}
+    for system in systems:
+        summary["etna_files"][system] = write_etna_system(rng, system, seeds, output_dir / "4.2_data")
+    summary["core_bench_rows"] = write_ocaml_tables(rng, output_dir / "4.1_data_ocaml", sizes)
+    summary["jmh_rows"] = write_jmh_csv(rng, output_dir / "4.1_data_scala", sizes)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic ETNA, Core_bench and JMH data.")
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=1,
+        help="Multiplier on seeds and sizes relative to the bundled data (default: 1)"
+    )
+    parser.add_argument(
+        "--output-dir",
+        help="Output directory (default: synthetic_data/x{scale})"
+    )
+    parser.add_argument(
+        "--rng-seed",
+        type=int,
+        default=0,
+        help="Random seed for reproducible datasets"
+    )
+    args = parser.parse_args()
+
+    if args.scale < 1:
+        print("Error: --scale must be at least 1")
+        return 1
+
+    output_dir = Path(args.output_dir) if args.output_dir else EVAL_DIR / "synthetic_data" / f"x{args.scale}"
+
+    print(f"Generating scale {args.scale} dataset in {output_dir}...")
+    summary = generate(output_dir, args.scale, args.rng_seed)
+
+    print(f"  {summary['seeds']} seeds, {summary['sizes']} sizes")
+    for system, count in summary["etna_files"].items():
+        print(f"  {system}: {count} trial files")
+    print(f"  Core_bench rows: {summary['core_bench_rows']}")
+    print(f"  JMH rows: {summary['jmh_rows']}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,97 @@
+"""
+Hierarchical aggregation of ETNA speedups.
+
+Speedup files hold {mutant: {property: {seed: {strategy: speedup}}}}. A flat
+geomean over every value lets mutants with many surviving properties (and
+properties with many surviving seeds) dominate, and cleaning shifts those
+weights silently. Here values are aggregated level by level instead:
+geomean over seeds per property, then over properties per mutant, then over
+mutants, with the weight of each group at every level set by the weighting:
+
+- flat:  the number of values under the group (same result as one flat geomean),
+- equal: 1, so every property of a mutant and every mutant counts the same,
+- sqrt:  the square root of the number of values, in between the two.
+
+Records are grouped in a single pass over the data.
+"""
+
+import math
+from collections import defaultdict
+
+LEVELS = ["seed", "property", "mutant"]
+
+WEIGHTINGS = {
+    "flat": lambda count: count,
+    "equal": lambda count: 1.0,
+    "sqrt": math.sqrt,
+}
+
+
+def group_logs(speedups, strategy):
+    """Return {mutant: {property: [log speedup per seed]}} for one strategy, skipping non-positive values."""
+    groups = defaultdict(lambda: defaultdict(list))
+    for mutant, properties in speedups.items():
+        for prop, seeds in properties.items():
+            for by_strategy in seeds.values():
+                value = by_strategy.get(strategy)
+                if value is not None and value > 0:
+                    groups[mutant][prop].append(math.log(value))
+    return groups
+
+
+def _weighted_mean(entries, weight):
+    """Weighted mean of (log mean, count) pairs."""
+    total = sum(weight(count) for _, count in entries)
+    return sum(weight(count) * mean for mean, count in entries) / total
+
+
+def hierarchical_geomean(speedups, strategy, weighting="flat"):
+    """
+    Aggregate one strategy seeds -> properties -> mutants.
+
+    Returns None when there are no values, else
+        {"geomean", "counts": {"mutants", "properties", "seeds"},
+         "mutants": {mutant: {"geomean", "properties", "seeds"}}}
+    where "seeds" counts the individual speedup values.
+    """
+    weight = WEIGHTINGS[weighting]
+    groups = group_logs(speedups, strategy)
+
+    mutants = {}
+    for mutant, properties in groups.items():
+        entries = [(sum(logs) / len(logs), len(logs)) for logs in properties.values()]
+        mutants[mutant] = (_weighted_mean(entries, weight), sum(count for _, count in entries), len(entries))
+    if not mutants:
+        return None
+
+    top = _weighted_mean([(mean, count) for mean, count, _ in mutants.values()], weight)
+    return {
+        "geomean": math.exp(top),
+        "counts": {
+            "mutants": len(mutants),
+            "properties": sum(n for _, _, n in mutants.values()),
+            "seeds": sum(count for _, count, _ in mutants.values()),
+        },
+        "mutants": {
+            mutant: {"geomean": math.exp(mean), "properties": n, "seeds": count}
+            for mutant, (mean, count, n) in sorted(mutants.items())
+        },
+    }
+
+
+def level_values(speedups, strategy, level="seed"):
+    """
+    Speedups of one strategy aggregated up to `level`: every value ("seed"),
+    one geomean per mutant/property task ("property") or one geomean per
+    mutant over its tasks' geomeans ("mutant").
+    """
+    groups = group_logs(speedups, strategy)
+    if level == "seed":
+        return [math.exp(x) for properties in groups.values() for logs in properties.values() for x in logs]
+    task_means = {
+        mutant: [sum(logs) / len(logs) for logs in properties.values()]
+        for mutant, properties in groups.items()
+    }
+    if level == "property":
+        return [math.exp(mean) for means in task_means.values() for mean in means]
+    return [math.exp(sum(means) / len(means)) for means in task_means.values()]
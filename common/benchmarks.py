@@ -0,0 +1,75 @@
+"""
+Canonical definitions of the benchmark sweeps.
+
+What the runners sweep by default and what the synthetic data generator
+imitates: the ETNA tasks, strategy families and staging suffixes of the
+bundled data, the trial timeout, and the Scala generator groups and sizes.
+The OCaml groups are parse_results_ocaml.RESULT_FILES.
+
+The runners tag every output directory with a sweep.json describing the run;
+the parsers carry it over to meta/ of the parsed results with
+copy_sweep_tag(), out of the top level that the loaders and plots read.
+"""
+
+import shutil
+from pathlib import Path
+
+# Per-trial ETNA timeout in seconds; trials recorded as `[exit timeout]` count as this
+TIMEOUT = 60.0
+
+# Mutant -> properties, mirroring the bundled ETNA data
+ETNA_TASKS = {
+    "BST": {
+        "insert_1": ["prop_DeleteInsert", "prop_InsertPost"],
+        "insert_2": ["prop_DeleteInsert", "prop_InsertDelete", "prop_InsertModel", "prop_InsertPost", "prop_InsertUnion"],
+        "insert_3": ["prop_InsertDelete", "prop_InsertInsert", "prop_InsertPost", "prop_UnionDeleteInsert"],
+        "delete_4": ["prop_DeleteDelete", "prop_DeletePost", "prop_DeleteUnion"],
+        "delete_5": ["prop_DeleteDelete", "prop_DeleteInsert", "prop_DeleteModel", "prop_DeletePost", "prop_DeleteUnion", "prop_UnionDeleteInsert"],
+        "union_6": ["prop_DeleteUnion", "prop_InsertUnion", "prop_UnionDeleteInsert", "prop_UnionModel", "prop_UnionPost", "prop_UnionUnionAssoc"],
+        "union_7": ["prop_DeleteUnion", "prop_InsertUnion", "prop_UnionPost", "prop_UnionUnionAssoc", "prop_UnionValid"],
+        "union_8": ["prop_DeleteUnion", "prop_InsertUnion", "prop_UnionDeleteInsert", "prop_UnionModel", "prop_UnionPost", "prop_UnionUnionAssoc"],
+    },
+    "STLC": {
+        mutant: ["prop_MultiPreserve", "prop_SinglePreserve"]
+        for mutant in [
+            "shift_abs_no_incr", "shift_var_all", "shift_var_leq", "shift_var_none",
+            "substTop_no_shift", "substTop_no_shift_back", "subst_abs_no_incr",
+            "subst_abs_no_shift", "subst_var_all", "subst_var_none",
+        ]
+    },
+}
+
+ETNA_FAMILIES = {
+    "BST": ["baseType", "baseBespoke", "baseBespokesingle"],
+    "STLC": ["baseType", "baseBespoke"],
+}
+
+# Suffixes of the staged strategies of each family, base first
+STAGE_SUFFIXES = ["", "staged", "stagedc", "stagedcsr"]
+
+SCALA_GROUPS = ["BoolListBespoke", "BstBespoke", "BstType", "Term"]
+
+# Generator sizes of the bundled 4.1 data
+GENERATOR_SIZES = [10, 100, 1000, 10000]
+
+
+def default_strategies(system):
+    return [family + suffix for family in ETNA_FAMILIES[system] for suffix in STAGE_SUFFIXES]
+
+
+def copy_sweep_tag(input_dir, parsed_dir, name="sweep.json"):
+    """Copy input_dir/sweep.json to parsed_dir/meta/<name>; returns the copy, or None without a tag."""
+    sweep_tag = Path(input_dir) / "sweep.json"
+    if not sweep_tag.exists():
+        return None
+    meta_dir = Path(parsed_dir) / "meta"
+    meta_dir.mkdir(parents=True, exist_ok=True)
+    return Path(shutil.copyfile(sweep_tag, meta_dir / name))
+
+
+def make_seeds(rng, count):
+    """`count` distinct random ETNA seeds, sorted."""
+    seeds = set()
+    while len(seeds) < count:
+        seeds.add(rng.randrange(1, 10 ** 10))
+    return sorted(seeds)
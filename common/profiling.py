@@ -0,0 +1,150 @@
+"""
+Timing and profiling instrumentation shared by the pipeline scripts.
+
+Scripts register the options with add_profiling_arguments() and create a
+timer with start_profiling() once arguments are parsed. Code anywhere in the
+pipeline marks phases with
+
+    with phase("file_io"):
+        ...
+
+which costs next to nothing unless --trace-timing or --profile was given.
+Phase names used across the scripts: directory_scan, file_io, regex_parsing,
+aggregation, deserialization, serialization, plotting.
+
+Reports are written to a timing/ subdirectory next to the script's outputs
+(so figure scripts that glob *.json in the output directory never see them):
+
+    <output_dir>/timing/<name>.json   wall time per phase, peak memory
+    <output_dir>/timing/<name>.prof   cProfile dump (--profile only)
+"""
+
+import sys
+import json
+import time
+import cProfile
+import platform
+import tracemalloc
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+
+_NULL_PHASE = nullcontext()
+_active_timer = None
+
+
+class _Phase:
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timer.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class PhaseTimer:
+    """Accumulates wall time per named phase and peak memory for one script run."""
+
+    def __init__(self, name, enabled=False, profile=False):
+        self.name = name
+        self.enabled = enabled or profile
+        self.profiler = cProfile.Profile() if profile else None
+        self.phases = {}
+        self.started_at = None
+        self.start_time = None
+
+    def start(self):
+        global _active_timer
+        if not self.enabled:
+            return self
+        _active_timer = self
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        tracemalloc.start()
+        self.start_time = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.enable()
+        return self
+
+    def add(self, name, seconds):
+        entry = self.phases.get(name)
+        if entry is None:
+            entry = self.phases[name] = {"seconds": 0.0, "calls": 0}
+        entry["seconds"] += seconds
+        entry["calls"] += 1
+
+    def phase(self, name):
+        return _Phase(self, name) if self.enabled else _NULL_PHASE
+
+    def finish(self, output_dir):
+        """Stop measuring and write the report; returns its path (or None when disabled)."""
+        global _active_timer
+        if not self.enabled or self.start_time is None:
+            return None
+
+        if self.profiler is not None:
+            self.profiler.disable()
+        total = time.perf_counter() - self.start_time
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if _active_timer is self:
+            _active_timer = None
+
+        timing_dir = Path(output_dir) / "timing"
+        timing_dir.mkdir(parents=True, exist_ok=True)
+
+        profile_path = None
+        if self.profiler is not None:
+            profile_path = timing_dir / f"{self.name}.prof"
+            self.profiler.dump_stats(profile_path)
+
+        report = {
+            "name": self.name,
+            "argv": sys.argv,
+            "started_at": self.started_at,
+            "host": platform.node(),
+            "python": platform.python_version(),
+            "total_seconds": total,
+            "peak_memory_bytes": peak,
+            "phases": self.phases,
+            "profile": str(profile_path) if profile_path else None,
+        }
+        report_path = timing_dir / f"{self.name}.json"
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+        print(f"Timing report saved to {report_path}")
+        if profile_path:
+            print(f"cProfile data saved to {profile_path}")
+        return report_path
+
+
+def phase(name):
+    """Context manager timing a phase of the currently running script, if any."""
+    if _active_timer is None:
+        return _NULL_PHASE
+    return _active_timer.phase(name)
+
+
+def add_profiling_arguments(parser):
+    parser.add_argument(
+        "--trace-timing",
+        action="store_true",
+        help="Record wall time per phase and peak memory to timing/<name>.json next to the outputs"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Like --trace-timing, and also dump a cProfile file"
+    )
+
+
+def start_profiling(name, args):
+    """Create and start a PhaseTimer configured from parsed arguments."""
+    return PhaseTimer(name, enabled=args.trace_timing, profile=args.profile).start()
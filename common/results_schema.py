@@ -0,0 +1,128 @@
+"""
+Normalized, cross-language schema for the 4.1 generator benchmarks.
+
+The OCaml and Scala parsers use different group and variant names
+(`bst_single/base_Staged_SR` vs `BstBespoke/ScAllegro`). Both parsers also
+write a long-format table, results_long.csv, with one row per measurement:
+
+    language, benchmark, group, variant, role, size, time_ns, error_ns
+
+`benchmark` is the display name shared by both languages, `role` is one of
+baseline / staged / staged+csr, and `error_ns` is empty when the harness
+reports no error estimate.
+"""
+
+import csv
+import json
+from pathlib import Path
+
+LONG_TABLE_NAME = "results_long.csv"
+
+LONG_TABLE_COLUMNS = ["language", "benchmark", "group", "variant", "role", "size", "time_ns", "error_ns"]
+
+ROLES = ["baseline", "staged", "staged+csr"]
+
+# Raw group name -> display benchmark name, per language
+BENCHMARK_NAMES = {
+    "ocaml": {
+        "boollist_bespoke": "Bool List",
+        "stlc_bespoke": "STLC",
+        "stlc_type": "STLC (Type-Derived)",
+        "bst_single": "BST (Single-Pass)",
+        "bst_bespoke": "BST (Repeated Insert)",
+        "bst_type": "BST (Type-Derived)",
+    },
+    "scala": {
+        "BoolListBespoke": "Bool List",
+        "BstBespoke": "BST (Single-Pass)",
+        "BstType": "BST (Repeated Insert)",
+        "Term": "STLC",
+    },
+}
+
+# Raw variant name -> role, per language
+VARIANT_ROLES = {
+    "ocaml": {
+        "base": "baseline",
+        "base_Staged_SR": "staged",
+        "base_Staged_CSR": "staged+csr",
+    },
+    "scala": {
+        "SC": "baseline",
+        "ScAllegro": "staged",
+    },
+}
+
+# Display names of the staged variants, used in cross-language reports
+STAGED_NAMES = {
+    "ocaml": "AllegrOCaml",
+    "scala": "ScAllegro",
+}
+
+
+def benchmark_name(language, group):
+    return BENCHMARK_NAMES[language].get(group, group)
+
+
+def long_rows(language, results, errors=None):
+    """
+    Flatten {group: {variant: {size: time}}} into long-table row dicts.
+
+    `errors` optionally mirrors `results` with per-measurement error estimates.
+    """
+    errors = errors or {}
+    rows = []
+    for group in sorted(results):
+        for variant in sorted(results[group]):
+            role = VARIANT_ROLES[language].get(variant)
+            for size in sorted(results[group][variant]):
+                error = errors.get(group, {}).get(variant, {}).get(size)
+                rows.append({
+                    "language": language,
+                    "benchmark": benchmark_name(language, group),
+                    "group": group,
+                    "variant": variant,
+                    "role": role or "",
+                    "size": size,
+                    "time_ns": results[group][variant][size],
+                    "error_ns": "" if error is None else error,
+                })
+    return rows
+
+
+def write_long_table(rows, output_dir):
+    path = Path(output_dir) / LONG_TABLE_NAME
+    with path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=LONG_TABLE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def read_long_table(path):
+    """Read a long table back, converting numeric columns (empty error -> None)."""
+    rows = []
+    with Path(path).open(newline="") as f:
+        for row in csv.DictReader(f):
+            row["size"] = int(row["size"])
+            row["time_ns"] = float(row["time_ns"])
+            row["error_ns"] = float(row["error_ns"]) if row["error_ns"] else None
+            rows.append(row)
+    return rows
+
+
+def load_unstable(source, language):
+    """
+    Return {(group, variant, size)} flagged unstable for `language` by
+    analysis/measurement_quality.py, or None when there is no quality report.
+    """
+    path = Path(__file__).parent.parent / "quality" / f"{source}.json"
+    if not path.exists():
+        return None
+    with path.open() as f:
+        report = json.load(f)
+    return {
+        (m["group"], m["variant"], m["size"])
+        for m in report["measurements"]
+        if m["language"] == language and m["status"] == "unstable"
+    }
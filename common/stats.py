@@ -0,0 +1,252 @@
+"""
+Small statistics helpers for the analysis scripts.
+
+Like the rest of common/, this is plain Python, so the parsers, processing,
+analysis and runner scripts need only an interpreter; numpy and matplotlib
+are needed by the figure scripts alone.
+"""
+
+import math
+from statistics import NormalDist, median
+from collections import defaultdict
+
+
+def geomean(values):
+    values = [v for v in values if v is not None and v > 0]
+    if not values:
+        return None
+    return math.exp(sum(math.log(v) for v in values) / len(values))
+
+
+def rank(values):
+    """Average ranks (1-based) with ties sharing the mean rank."""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        mean_rank = (i + j) / 2 + 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = mean_rank
+        i = j + 1
+    return ranks
+
+
+def mann_whitney_u(x, y):
+    """
+    Two-sided Mann-Whitney U test using the normal approximation with tie
+    and continuity correction.
+
+    Returns (u_x, p_value), where u_x counts pairs with x > y (ties as 0.5).
+    """
+    n1, n2 = len(x), len(y)
+    if n1 == 0 or n2 == 0:
+        return None, None
+
+    combined = list(x) + list(y)
+    ranks = rank(combined)
+    u_x = sum(ranks[:n1]) - n1 * (n1 + 1) / 2
+
+    n = n1 + n2
+    tie_counts = {}
+    for value in combined:
+        tie_counts[value] = tie_counts.get(value, 0) + 1
+    tie_term = sum(t ** 3 - t for t in tie_counts.values())
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))) if n > 1 else 0.0
+    if variance <= 0:
+        return u_x, 1.0
+
+    mean_u = n1 * n2 / 2
+    z = (abs(u_x - mean_u) - 0.5) / math.sqrt(variance)
+    p_value = math.erfc(max(z, 0.0) / math.sqrt(2))
+    return u_x, min(p_value, 1.0)
+
+
+def cliffs_delta(x, y, u_x=None):
+    """Cliff's delta: P(x > y) - P(x < y), in [-1, 1]."""
+    if not x or not y:
+        return None
+    if u_x is None:
+        u_x, _ = mann_whitney_u(x, y)
+    return 2 * u_x / (len(x) * len(y)) - 1
+
+
+def wilcoxon_signed_rank(differences):
+    """
+    Two-sided Wilcoxon signed-rank test of paired differences against zero.
+    Zero differences are dropped. Uses the exact null distribution for up to
+    25 pairs without ties, else the normal approximation with tie and
+    continuity correction.
+
+    Returns (w_plus, n, p_value), where w_plus is the rank sum of the
+    positive differences and n the number of non-zero differences.
+    """
+    nonzero = [d for d in differences if d != 0]
+    n = len(nonzero)
+    if n == 0:
+        return 0.0, 0, 1.0
+
+    ranks = rank([abs(d) for d in nonzero])
+    w_plus = sum(r for r, d in zip(ranks, nonzero) if d > 0)
+    total = n * (n + 1) / 2
+    tied = len(set(abs(d) for d in nonzero)) < n
+
+    if n <= 25 and not tied:
+        # counts[w] = number of sign assignments with positive rank sum w
+        counts = [1] + [0] * int(total)
+        for r in range(1, n + 1):
+            for w in range(int(total), r - 1, -1):
+                counts[w] += counts[w - r]
+        low = int(min(w_plus, total - w_plus))
+        p_value = 2 * sum(counts[:low + 1]) / 2 ** n
+        return w_plus, n, min(p_value, 1.0)
+
+    tie_counts = defaultdict(int)
+    for d in nonzero:
+        tie_counts[abs(d)] += 1
+    variance = n * (n + 1) * (2 * n + 1) / 24 - sum(t ** 3 - t for t in tie_counts.values()) / 48
+    if variance <= 0:
+        return w_plus, n, 1.0
+    z = (abs(w_plus - total / 2) - 0.5) / math.sqrt(variance)
+    return w_plus, n, min(math.erfc(max(z, 0.0) / math.sqrt(2)), 1.0)
+
+
+def rank_biserial(w_plus, n):
+    """Matched-pairs rank-biserial correlation: (W+ - W-) / (W+ + W-), in [-1, 1]."""
+    if n == 0:
+        return 0.0
+    total = n * (n + 1) / 2
+    return (2 * w_plus - total) / total
+
+
+def benjamini_hochberg(p_values):
+    """Return Benjamini-Hochberg adjusted q-values in the input order."""
+    m = len(p_values)
+    order = sorted(range(m), key=lambda i: p_values[i])
+    q_values = [0.0] * m
+    running_min = 1.0
+    for position in range(m - 1, -1, -1):
+        i = order[position]
+        running_min = min(running_min, p_values[i] * m / (position + 1))
+        q_values[i] = running_min
+    return q_values
+
+
+def median_ratio(candidate, reference):
+    ref = median(reference)
+    if ref == 0:
+        return None
+    return median(candidate) / ref
+
+
+def kaplan_meier(durations, observed):
+    """
+    Kaplan-Meier survival estimate.
+
+    `observed[i]` is False for right-censored durations. Returns
+    (event_times, survival) where survival[k] is S(t) just after event_times[k].
+    """
+    events = defaultdict(int)
+    removed = defaultdict(int)
+    for duration, seen in zip(durations, observed):
+        removed[duration] += 1
+        if seen:
+            events[duration] += 1
+
+    at_risk = len(durations)
+    surviving = 1.0
+    event_times, survival = [], []
+    for t in sorted(removed):
+        if events[t]:
+            surviving *= 1 - events[t] / at_risk
+            event_times.append(t)
+            survival.append(surviving)
+        at_risk -= removed[t]
+    return event_times, survival
+
+
+def restricted_mean(event_times, survival, tau):
+    """Area under a Kaplan-Meier step curve from 0 to tau (restricted mean survival time)."""
+    area, previous_t, previous_s = 0.0, 0.0, 1.0
+    for t, s in zip(event_times, survival):
+        if t >= tau:
+            break
+        area += (t - previous_t) * previous_s
+        previous_t, previous_s = t, s
+    return area + (tau - previous_t) * previous_s
+
+
+def survival_median(event_times, survival):
+    """First time the Kaplan-Meier curve drops to 0.5 or below, or None if it never does."""
+    for t, s in zip(event_times, survival):
+        if s <= 0.5:
+            return t
+    return None
+
+
+def fit_power_law(sizes, times):
+    """
+    Least-squares fit of log(time) = log(constant) + exponent * log(size).
+
+    Returns a dict with exponent, constant, r_squared and the log10 residual
+    at every size, or None when fewer than two distinct sizes are given.
+    """
+    points = [(math.log(n), math.log(t)) for n, t in zip(sizes, times) if n > 0 and t > 0]
+    if len({x for x, _ in points}) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    sxx = sum((x - mean_x) ** 2 for x, _ in points)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    exponent = sxy / sxx
+    intercept = mean_y - exponent * mean_x
+
+    residuals = [y - (intercept + exponent * x) for x, y in points]
+    ss_tot = sum((y - mean_y) ** 2 for _, y in points)
+    ss_res = sum(r ** 2 for r in residuals)
+    return {
+        "exponent": exponent,
+        "constant": math.exp(intercept),
+        "r_squared": 1 - ss_res / ss_tot if ss_tot else 1.0,
+        "residuals_log10": [r / math.log(10) for r in residuals],
+    }
+
+
+def t_quantile(p, df):
+    """
+    Quantile of Student's t distribution. Exact for df = 1 and 2, where the
+    quantile has a closed form; otherwise the Cornish-Fisher expansion around
+    the normal quantile (within 1% of exact for df >= 3).
+    """
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+    z = NormalDist().inv_cdf(p)
+    return (
+        z
+        + (z ** 3 + z) / (4 * df)
+        + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+        + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * df ** 3)
+        + (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z) / (92160 * df ** 4)
+    )
+
+
+def geomean_ci(values, confidence=0.95):
+    """
+    Geometric mean with a t-interval computed on the log scale.
+
+    Returns (geomean, low, high), or None when fewer than two positive values
+    are given.
+    """
+    logs = [math.log(v) for v in values if v is not None and v > 0]
+    n = len(logs)
+    if n < 2:
+        return None
+    mean = sum(logs) / n
+    sd = math.sqrt(sum((x - mean) ** 2 for x in logs) / (n - 1))
+    half = t_quantile(0.5 + confidence / 2, n - 1) * sd / math.sqrt(n)
+    return math.exp(mean), math.exp(mean - half), math.exp(mean + half)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Ablation breakdown of ETNA speedups: how much of the base -> stagedcsr
+speedup each staging step contributes.
+
+Every workload has four strategies, base -> staged -> stagedc -> stagedcsr.
+For each (mutant, property, seed) record that has a speedup for all four,
+the speedup of each step is the ratio of consecutive strategies' speedups,
+so the three step speedups multiply to the total exactly. Records missing
+any strategy (e.g. removed by cleaning) are dropped from every step, which
+keeps that identity; their number is reported.
+
+Steps and the total are aggregated like f17 (seeds -> properties ->
+mutants with --weighting, see common/aggregate.py), so the product of the
+step geomeans equals the total geomean. Intervals are t-intervals around
+that geomean from the spread of the per-seed geomeans, as in seed_power.py;
+each seed's geomean is aggregated with the same --weighting.
+"share" is a step's fraction of the total log speedup (negative when the
+step slows things down).
+
+Reads parsed_4.2_data/{source}/speedups/{system}_{workload}.json and writes
+parsed_4.2_data/{source}/ablation/{system}.json; f21.py plots it.
+
+Usage:
+    python ablation.py --source precomputed --system BST
+    python ablation.py --source precomputed --system STLC --weighting equal --confidence 0.9
+"""
+
+import sys
+import json
+import math
+import argparse
+import statistics
+from pathlib import Path
+from collections import defaultdict
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.aggregate import WEIGHTINGS, hierarchical_geomean
+from common.profiling import add_profiling_arguments, phase, start_profiling
+from common.stats import t_quantile
+from calculate_speedups import WORKLOAD_KEYS
+
+TOTAL = "total"
+
+
+def step_speedups(speedups, strategies):
+    """
+    Return ({mutant: {property: {seed: {step: ratio}}}}, dropped) for the
+    consecutive strategies, keeping only records with every strategy.
+    Steps are named after the strategy they reach; TOTAL is first -> last.
+    """
+    steps = defaultdict(lambda: defaultdict(dict))
+    dropped = 0
+    for mutant, properties in speedups.items():
+        for prop, seeds in properties.items():
+            for seed, by_strategy in seeds.items():
+                values = [by_strategy.get(strategy) for strategy in strategies]
+                if any(value is None or value <= 0 for value in values):
+                    dropped += 1
+                    continue
+                ratios = {to: values[i + 1] / values[i] for i, to in enumerate(strategies[1:])}
+                ratios[TOTAL] = values[-1] / values[0]
+                steps[mutant][prop][seed] = ratios
+    return steps, dropped
+
+
+def seed_log_geomeans(steps, step, weighting):
+    """Log of each seed's hierarchical geomean of one step, aggregated with the same weighting."""
+    by_seed = defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
+    for mutant, properties in steps.items():
+        for prop, seeds in properties.items():
+            for seed, ratios in seeds.items():
+                by_seed[seed][mutant][prop][seed] = ratios
+    return [math.log(hierarchical_geomean(tasks, step, weighting)["geomean"]) for tasks in by_seed.values()]
+
+
+def step_interval(steps, step, weighting, confidence):
+    result = hierarchical_geomean(steps, step, weighting)
+    per_seed = seed_log_geomeans(steps, step, weighting)
+    entry = {"geomean": result["geomean"], "low": None, "high": None, "seeds": len(per_seed)}
+    if len(per_seed) > 1:
+        half = t_quantile(0.5 + confidence / 2, len(per_seed) - 1) * statistics.stdev(per_seed) / math.sqrt(len(per_seed))
+        entry["low"] = result["geomean"] * math.exp(-half)
+        entry["high"] = result["geomean"] * math.exp(half)
+    return entry, result["counts"]
+
+
+def analyze_workload(speedups, workload, weighting, confidence):
+    """Return the ablation of one workload, or None when no record has all strategies."""
+    _, strategies = WORKLOAD_KEYS[workload]
+    steps, dropped = step_speedups(speedups, strategies)
+    if not steps:
+        return None
+
+    total, counts = step_interval(steps, TOTAL, weighting, confidence)
+    log_total = math.log(total["geomean"])
+    breakdown = []
+    for origin, strategy in zip(strategies, strategies[1:]):
+        entry, _ = step_interval(steps, strategy, weighting, confidence)
+        entry.update({
+            "from": origin,
+            "to": strategy,
+            "share": math.log(entry["geomean"]) / log_total if log_total else None,
+        })
+        breakdown.append(entry)
+    return {"counts": counts, "dropped": dropped, "steps": breakdown, "total": total}
+
+
+def format_interval(entry):
+    if entry["low"] is None:
+        return f"{entry['geomean']:.3f}X"
+    return f"{entry['geomean']:.3f}X [{entry['low']:.3f}, {entry['high']:.3f}]"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Break ETNA speedups down into staging steps.")
+    parser.add_argument(
+        "--source",
+        choices=["precomputed", "fresh"],
+        required=True,
+        help="Data source: 'precomputed' or 'fresh'"
+    )
+    parser.add_argument(
+        "--system",
+        choices=["BST", "STLC"],
+        required=True,
+        help="Benchmark system to analyze"
+    )
+    parser.add_argument(
+        "--weighting",
+        choices=list(WEIGHTINGS),
+        default="flat",
+        help="Weight of each property/mutant when aggregating (default: flat, as f17)"
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="Confidence level (default: 0.95)"
+    )
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    timer = start_profiling(f"ablation_{args.system.lower()}", args)
+
+    input_dir = EVAL_DIR / "parsed_4.2_data" / args.source / "speedups"
+    output_dir = EVAL_DIR / "parsed_4.2_data" / args.source / "ablation"
+    system = args.system.lower()
+
+    report = {"weighting": args.weighting, "confidence": args.confidence, "workloads": {}}
+    for workload in WORKLOAD_KEYS:
+        input_file = input_dir / f"{system}_{workload}.json"
+        if not input_file.exists():
+            continue
+        with phase("deserialization"):
+            with open(input_file) as f:
+                speedups = json.load(f)
+        with phase("aggregation"):
+            result = analyze_workload(speedups, workload, args.weighting, args.confidence)
+        if result is None:
+            continue
+        report["workloads"][workload] = result
+
+        c = result["counts"]
+        print(f"{args.system} {workload}: {c['mutants']} mutants, {c['properties']} properties, "
+              f"{c['seeds']} records ({result['dropped']} without every strategy dropped)")
+        for entry in result["steps"]:
+            share = f"{entry['share']:.0%}" if entry["share"] is not None else "-"
+            print(f"  {entry['from']} -> {entry['to']}: {format_interval(entry)}, {share} of total")
+        print(f"  total: {format_interval(result['total'])}")
+
+    if not report["workloads"]:
+        print(f"Error: No speedup files found in {input_dir}")
+        return 1
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_file = output_dir / f"{system}.json"
+    with phase("serialization"):
+        with open(output_file, "w") as f:
+            json.dump(report, f, indent=2)
+    print(f"Ablation saved to {output_file}")
+
+    timer.finish(output_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -8,6 +8,7 @@ Usage:
     python calculate_speedups.py --source precomputed --system STLC --workload bespokesingle
 """
 
+import sys
 import json
 import argparse
 from pathlib import Path
@@ -16,6 +17,10 @@ from collections import defaultdict
 # Base directory for eval data
 EVAL_DIR = Path(__file__).parent.parent
 
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.profiling import add_profiling_arguments, phase, start_profiling
+
 # Define the strategy keys per workload
 WORKLOAD_KEYS = {
     "type": (
@@ -85,7 +90,9 @@ def main():
         required=True,
         help="Workload group"
     )
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    timer = start_profiling(f"calculate_speedups_{args.system.lower()}_{args.workload}", args)
 
     # Determine input and output paths based on source
     input_dir = EVAL_DIR / "parsed_4.2_data" / args.source / "cleaned"
@@ -103,15 +110,19 @@ def main():
 
     print(f"Computing {args.workload} speedups for {args.system} from {input_file}...")
 
-    with open(input_file, "r") as file:
-        data = json.load(file)
+    with phase("deserialization"):
+        with open(input_file, "r") as file:
+            data = json.load(file)
 
-    result = compute_speedup(data, args.workload)
+    with phase("aggregation"):
+        result = compute_speedup(data, args.workload)
 
-    with open(output_file, "w") as f:
-        json.dump(result, f, indent=2)
+    with phase("serialization"):
+        with open(output_file, "w") as f:
+            json.dump(result, f, indent=2)
 
     print(f"Speedup results saved to {output_file}")
+    timer.finish(output_dir)
     return 0
 
 
@@ -8,6 +8,7 @@ Usage:
     python clean_under5ms_or_timeout.py --source fresh --system BST
 """
 
+import sys
 import json
 import argparse
 from pathlib import Path
@@ -15,11 +16,23 @@ from pathlib import Path
 # Base directory for eval data
 EVAL_DIR = Path(__file__).parent.parent
 
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.benchmarks import TIMEOUT
+from common.profiling import add_profiling_arguments, phase, start_profiling
 
-def clean_json(input_file, cleaned_output, removed_output):
-    with open(input_file, 'r') as f:
-        data = json.load(f)
 
+def clean_results(data, timeout=TIMEOUT):
+    """
+    Clean parsed ETNA results in memory.
+
+    `timeout` is the duration that marks a timed-out trial. Returns
+    (cleaned, removed); the input mapping is left untouched.
+    """
+    data = {
+        mutant: {prop: dict(values) for prop, values in properties.items()}
+        for mutant, properties in data.items()
+    }
     removed_data = {}
 
     strategy_prefixes = ["baseType", "baseBespoke", "baseBespokesingle"]
@@ -45,7 +58,7 @@ def clean_json(input_file, cleaned_output, removed_output):
                                 removed_data[mutant][prop][key_to_remove] = values[key_to_remove]
                                 del values[key_to_remove]
 
-            # Remove entries where all 4 variants are 60.0
+            # Remove entries where all 4 variants timed out
             to_remove = set()
             for seed in list(values.keys()):
                 if any(seed.startswith(prefix + "_") for prefix in strategy_prefixes):
@@ -73,7 +86,7 @@ def clean_json(input_file, cleaned_output, removed_output):
                     }
 
                     for variants in base_variants.values():
-                        if all(values.get(var, -1) == 60.0 for var in variants):
+                        if all(values.get(var, -1) == timeout for var in variants):
                             to_remove.update(variants)
 
             for key in to_remove:
@@ -81,11 +94,23 @@ def clean_json(input_file, cleaned_output, removed_output):
                     removed_data.setdefault(mutant, {}).setdefault(prop, {})[key] = values[key]
                     del values[key]
 
-    with open(cleaned_output, 'w') as f:
-        json.dump(data, f, indent=2)
+    return data, removed_data
+
+
+def clean_json(input_file, cleaned_output, removed_output):
+    with phase("deserialization"):
+        with open(input_file, 'r') as f:
+            data = json.load(f)
+
+    with phase("aggregation"):
+        data, removed_data = clean_results(data)
+
+    with phase("serialization"):
+        with open(cleaned_output, 'w') as f:
+            json.dump(data, f, indent=2)
 
-    with open(removed_output, 'w') as f:
-        json.dump(removed_data, f, indent=2)
+        with open(removed_output, 'w') as f:
+            json.dump(removed_data, f, indent=2)
 
 def main():
     parser = argparse.ArgumentParser(description="Clean ETNA benchmark results.")
@@ -101,7 +126,9 @@ def main():
         required=True,
         help="Benchmark system to clean"
     )
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    timer = start_profiling(f"clean_{args.system.lower()}", args)
 
     # Determine input and output paths based on source
     input_dir = EVAL_DIR / "parsed_4.2_data" / args.source / "parsed"
@@ -124,6 +151,7 @@ def main():
     print(f"Cleaned results saved to {cleaned_output}")
     print(f"Removed entries saved to {removed_output}")
 
+    timer.finish(output_dir)
     return 0
 
 
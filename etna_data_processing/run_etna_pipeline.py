@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Run the ETNA pipeline (parse -> clean -> speedups) for one system in a single process.
+
+Results are handed between stages in memory, so only the speedup files are
+written by default. Pass --write-intermediate to also write the parsed and
+cleaned JSON files that parse_etna_data.py and clean_under5ms_or_timeout.py
+would have produced.
+
+--sample gives a quick look at a large tree instead: seeds are processed in
+a random order, --batch-size at a time, and within each seed only a
+--task-fraction of every mutant's properties is read (stratified by mutant,
+all strategies of a chosen task). After every batch the speedups and f17
+geomeans are recomputed with confidence intervals over the per-seed
+geomeans, and the run stops as soon as every staged strategy's interval is
+within --target of its geomean. The estimates are written to
+parsed_4.2_data/{source}/sample/{system}.json; `f17.py --sample` plots them
+with error bars.
+
+Usage:
+    python run_etna_pipeline.py --source precomputed --system BST
+    python run_etna_pipeline.py --source precomputed --system STLC --write-intermediate
+    python run_etna_pipeline.py --source fresh --system BST
+    python run_etna_pipeline.py --source fresh --system BST --sample --target 0.1 --task-fraction 0.5
+"""
+
+import sys
+import json
+import math
+import time
+import random
+import argparse
+from pathlib import Path
+from collections import defaultdict
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+sys.path.insert(0, str(EVAL_DIR / "parsers"))
+
+from common.benchmarks import copy_sweep_tag
+from common.profiling import add_profiling_arguments, phase, start_profiling
+from parse_etna_data import find_seed_dirs, list_tasks, parse_results, scan_results, sort_results
+from clean_under5ms_or_timeout import clean_results
+from calculate_speedups import WORKLOAD_KEYS, compute_speedup
+from seed_power import converged, workload_intervals
+
+
+def compute_all_speedups(cleaned, workloads=None):
+    """
+    Compute speedups for every workload in one pass over the cleaned data.
+
+    Workloads whose baseline strategy never appears are left out.
+    """
+    speedups = {}
+    for workload in workloads or WORKLOAD_KEYS:
+        result = compute_speedup(cleaned, workload)
+        if result:
+            speedups[workload] = result
+    return speedups
+
+
+def run_pipeline(system_name, input_dir, workloads=None):
+    """
+    Parse, clean and compute speedups for one system without touching disk.
+
+    Returns a dict with 'parsed', 'cleaned', 'removed' and 'speedups'
+    (workload -> speedup data) entries.
+    """
+    parsed = parse_results(system_name, input_dir)
+    with phase("aggregation"):
+        cleaned, removed = clean_results(parsed)
+        speedups = compute_all_speedups(cleaned, workloads)
+    return {
+        "parsed": parsed,
+        "cleaned": cleaned,
+        "removed": removed,
+        "speedups": speedups,
+    }
+
+
+def sample_tasks(tasks, fraction, rng):
+    """Pick ceil(fraction * n) of each mutant's n properties, at least one per mutant."""
+    by_mutant = defaultdict(list)
+    for mutant, prop in sorted(tasks):
+        by_mutant[mutant].append(prop)
+    chosen = set()
+    for mutant, props in by_mutant.items():
+        count = max(1, math.ceil(fraction * len(props)))
+        chosen.update((mutant, prop) for prop in rng.sample(props, count))
+    return chosen
+
+
+def run_sampled(system_name, input_dir, target, confidence=0.95, batch_size=5,
+                task_fraction=1.0, rng_seed=0, workloads=None):
+    """
+    Process seeds in random batches until every staged strategy's geomean
+    speedup interval is within `target`. Returns a report dict with the
+    per-batch 'rounds' and the final 'estimates' ({workload: intervals}).
+    """
+    rng = random.Random(rng_seed)
+    seeds = sorted((seed for seed, _ in find_seed_dirs(system_name, input_dir)[0]), key=int)
+    rng.shuffle(seeds)
+
+    results = defaultdict(lambda: defaultdict(dict))
+    used, files_read, rounds = [], 0, []
+    start = time.perf_counter()
+    estimates, done = {}, False
+
+    for offset in range(0, len(seeds), batch_size):
+        batch = seeds[offset:offset + batch_size]
+        tasks = list_tasks(system_name, input_dir, set(batch))
+        chosen = {seed: sample_tasks(tasks.get(seed, set()), task_fraction, rng) for seed in batch}
+        batch_results, _, files = scan_results(
+            system_name, input_dir, set(batch),
+            keep=lambda seed, mutant, prop: (mutant, prop) in chosen[seed]
+        )
+        for mutant, properties in batch_results.items():
+            for prop, values in properties.items():
+                results[mutant][prop].update(values)
+        used += batch
+        files_read += len(files)
+
+        with phase("aggregation"):
+            cleaned, _ = clean_results(sort_results(results, used))
+            estimates = {}
+            for workload in workloads or WORKLOAD_KEYS:
+                intervals = workload_intervals(cleaned, workload, confidence)
+                if any(entry["seeds"] for entry in intervals.values()):
+                    estimates[workload] = intervals
+
+        elapsed = time.perf_counter() - start
+        done = bool(estimates) and all(converged(intervals, target) for intervals in estimates.values())
+        rounds.append({"seeds": len(used), "files": files_read, "elapsed": elapsed, "estimates": estimates})
+
+        print(f"{len(used)}/{len(seeds)} seeds, {files_read} files, {elapsed:.2f}s:")
+        for workload, intervals in estimates.items():
+            for strategy, entry in intervals.items():
+                if entry["relative_width"] is None:
+                    print(f"  {strategy}: not enough seeds yet")
+                    continue
+                print(f"  {strategy}: {entry['geomean']:.3f}X [{entry['low']:.3f}, {entry['high']:.3f}] "
+                      f"width {entry['relative_width']:.3f}")
+        if done:
+            break
+
+    return {
+        "target": target,
+        "confidence": confidence,
+        "task_fraction": task_fraction,
+        "seeds_total": len(seeds),
+        "seeds_used": len(used),
+        "converged": done,
+        "rounds": rounds,
+        "estimates": estimates,
+    }
+
+
+def write_json(path, data, indent=2):
+    with phase("serialization"):
+        with open(path, "w") as f:
+            json.dump(data, f, indent=indent)
+    print(f"Wrote {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the ETNA parse/clean/speedup pipeline in one process.")
+    parser.add_argument(
+        "--source",
+        choices=["precomputed", "fresh"],
+        required=True,
+        help="Data source: 'precomputed' or 'fresh'"
+    )
+    parser.add_argument(
+        "--system",
+        choices=["BST", "STLC"],
+        required=True,
+        help="Benchmark system to process"
+    )
+    parser.add_argument(
+        "--workload",
+        choices=list(WORKLOAD_KEYS),
+        action="append",
+        help="Workload group (repeatable, default: all with data)"
+    )
+    parser.add_argument(
+        "--write-intermediate",
+        action="store_true",
+        help="Also write the parsed and cleaned JSON files for inspection"
+    )
+    parser.add_argument(
+        "--sample",
+        action="store_true",
+        help="Quick look: process random seed batches until --target is met (see module docstring)"
+    )
+    parser.add_argument(
+        "--target",
+        type=float,
+        default=0.1,
+        help="With --sample, stop once every CI width / geomean is at most this (default: 0.1)"
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="With --sample, confidence level of the intervals (default: 0.95)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=5,
+        help="With --sample, seeds added per batch (default: 5)"
+    )
+    parser.add_argument(
+        "--task-fraction",
+        type=float,
+        default=1.0,
+        help="With --sample, fraction of each mutant's properties read per seed (default: 1.0)"
+    )
+    parser.add_argument(
+        "--rng-seed",
+        type=int,
+        default=0,
+        help="With --sample, seed of the random seed order and task choice (default: 0)"
+    )
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    timer = start_profiling(f"run_etna_pipeline_{args.system.lower()}", args)
+
+    system_subdir = f"{args.system.lower()}-experiments"
+    input_dir = EVAL_DIR / "4.2_data" / args.source / system_subdir
+    output_root = EVAL_DIR / "parsed_4.2_data" / args.source
+
+    if not input_dir.exists():
+        print(f"Error: Input directory not found: {input_dir}")
+        return 1
+
+    system = args.system.lower()
+
+    # Carry the scheduler's concurrency tag over, as parse_etna_data.py does
+    copy_sweep_tag(input_dir, output_root, f"{system}_sweep.json")
+
+    if args.sample:
+        print(f"Sampling {args.system} results from {input_dir}...")
+        report = run_sampled(args.system, input_dir, args.target, args.confidence, args.batch_size,
+                             args.task_fraction, args.rng_seed, args.workload)
+        if not report["estimates"]:
+            print("Error: No speedups could be computed from the sampled trials")
+            return 1
+        status = "reached" if report["converged"] else "not reached"
+        print(f"Target {args.target:g} {status} after {report['seeds_used']} of {report['seeds_total']} seeds")
+        (output_root / "sample").mkdir(parents=True, exist_ok=True)
+        write_json(output_root / "sample" / f"{system}.json", report)
+        timer.finish(output_root / "sample")
+        return 0
+
+    print(f"Running {args.system} pipeline on {input_dir}...")
+    results = run_pipeline(args.system, input_dir, args.workload)
+
+    if args.write_intermediate:
+        (output_root / "parsed").mkdir(parents=True, exist_ok=True)
+        (output_root / "cleaned").mkdir(parents=True, exist_ok=True)
+        write_json(output_root / "parsed" / f"{system}_results.json", results["parsed"])
+        write_json(output_root / "cleaned" / f"{system}_results_cleaned.json", results["cleaned"])
+        write_json(output_root / "cleaned" / f"{system}_results_removed.json", results["removed"])
+
+    speedup_dir = output_root / "speedups"
+    speedup_dir.mkdir(parents=True, exist_ok=True)
+    for workload, data in results["speedups"].items():
+        write_json(speedup_dir / f"{system}_{workload}.json", data)
+
+    print(f"Parsed {len(results['parsed'])} mutants, wrote {len(results['speedups'])} speedup files")
+    timer.finish(speedup_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Seed-count power analysis for ETNA speedups.
+
+The log speedup of a staged strategy on task t = (mutant, property) with
+seed k is modelled as
+
+    log s[t, k] = mu + mutant + property(mutant) + seed[k] + residual[t, k]
+
+where seed[k] is shared by all tasks run with seed k. Variance components
+are estimated by the method of moments from the per-seed speedups written
+by calculate_speedups.py, with negative estimates clipped to zero.
+
+The f17 geomean averages over a fixed set of tasks, so only the seed and
+residual components make it uncertain. For T tasks and k seeds its log
+variance is (var_seed + var_residual / T) / k, which is the variance of the
+per-seed geomean divided by k. For every workload and staged strategy the
+report gives the current interval and the smallest number of seeds whose
+t-interval has (high - low) / geomean <= --target.
+
+Reads parsed_4.2_data/{source}/speedups/{system}_{workload}.json and writes
+parsed_4.2_data/{source}/power/{system}.json.
+
+Usage:
+    python seed_power.py --source precomputed --system BST
+    python seed_power.py --source precomputed --system STLC --target 0.05
+"""
+
+import sys
+import json
+import math
+import argparse
+import statistics
+from pathlib import Path
+from collections import defaultdict
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.profiling import add_profiling_arguments, phase, start_profiling
+from common.stats import geomean, geomean_ci, t_quantile
+from calculate_speedups import WORKLOAD_KEYS, compute_speedup
+
+# Upper bound for the seeds-needed search
+MAX_SEEDS = 10000
+
+
+def seed_geomeans(speedups, strategy):
+    """Geomean speedup of one strategy over all tasks, per seed."""
+    per_seed = {}
+    for properties in speedups.values():
+        for seeds in properties.values():
+            for seed, by_strategy in seeds.items():
+                if strategy in by_strategy:
+                    per_seed.setdefault(seed, []).append(by_strategy[strategy])
+    return {seed: geomean(values) for seed, values in per_seed.items()}
+
+
+def workload_intervals(cleaned, workload, confidence):
+    """Return {strategy: {"geomean", "low", "high", "relative_width", "seeds"}} for the staged strategies."""
+    baseline_key, strategy_keys = WORKLOAD_KEYS[workload]
+    speedups = compute_speedup(cleaned, workload)
+    intervals = {}
+    for strategy in strategy_keys:
+        if strategy == baseline_key:
+            continue
+        per_seed = seed_geomeans(speedups, strategy)
+        ci = geomean_ci(list(per_seed.values()), confidence)
+        if ci is None:
+            intervals[strategy] = {"seeds": len(per_seed), "relative_width": None}
+            continue
+        point, low, high = ci
+        intervals[strategy] = {
+            "geomean": point,
+            "low": low,
+            "high": high,
+            "relative_width": (high - low) / point,
+            "seeds": len(per_seed),
+        }
+    return intervals
+
+
+def converged(intervals, target):
+    """True when every strategy has an interval no wider than target (relative to its geomean)."""
+    widths = [entry["relative_width"] for entry in intervals.values()]
+    return bool(widths) and all(w is not None and w <= target for w in widths)
+
+
+def _variance(values):
+    return statistics.variance(values) if len(values) > 1 else 0.0
+
+
+def variance_components(speedups, strategy):
+    """
+    Method-of-moments estimates of the mutant, property, seed and residual
+    variance of log speedups. Returns None with fewer than two seeds or tasks.
+    """
+    cells = {}
+    for mutant, properties in speedups.items():
+        for prop, seeds in properties.items():
+            for seed, by_strategy in seeds.items():
+                value = by_strategy.get(strategy)
+                if value is not None and value > 0:
+                    cells[(mutant, prop, seed)] = math.log(value)
+
+    task_values, seed_residuals = defaultdict(list), defaultdict(list)
+    for (mutant, prop, seed), y in cells.items():
+        task_values[(mutant, prop)].append(y)
+    task_means = {task: statistics.mean(values) for task, values in task_values.items()}
+    seeds = {seed for _, _, seed in cells}
+    if len(seeds) < 2 or len(task_means) < 2:
+        return None
+
+    # Seed effects from residuals around task means
+    for (mutant, prop, seed), y in cells.items():
+        seed_residuals[seed].append(y - task_means[(mutant, prop)])
+    seed_effects = {seed: statistics.mean(r) for seed, r in seed_residuals.items()}
+
+    n, tasks = len(cells), len(task_means)
+    residual_ss = sum(
+        (y - task_means[(mutant, prop)] - seed_effects[seed]) ** 2
+        for (mutant, prop, seed), y in cells.items()
+    )
+    var_residual = residual_ss / max(n - tasks - len(seeds) + 1, 1)
+
+    tasks_per_seed = n / len(seeds)
+    seeds_per_task = n / tasks
+    var_seed = max(_variance(list(seed_effects.values())) - var_residual / tasks_per_seed, 0.0)
+
+    by_mutant = defaultdict(list)
+    for (mutant, _), mean in task_means.items():
+        by_mutant[mutant].append(mean)
+    within = [_variance(means) for means in by_mutant.values() if len(means) > 1]
+    props_per_mutant = tasks / len(by_mutant)
+    var_property = max((statistics.mean(within) if within else 0.0) - var_residual / seeds_per_task, 0.0)
+    var_mutant = max(
+        _variance([statistics.mean(means) for means in by_mutant.values()])
+        - var_property / props_per_mutant
+        - var_residual / (props_per_mutant * seeds_per_task),
+        0.0,
+    )
+
+    return {
+        "mutant": var_mutant,
+        "property": var_property,
+        "seed": var_seed,
+        "residual": var_residual,
+        "tasks": tasks,
+        "seeds": len(seeds),
+    }
+
+
+def seeds_needed(sd, target, confidence=0.95):
+    """
+    Smallest k >= 2 for which a t-interval of k per-seed log geomeans with
+    standard deviation sd has (high - low) / geomean <= target.
+    """
+    half_width = math.asinh(target / 2)
+    for k in range(2, MAX_SEEDS + 1):
+        if t_quantile(0.5 + confidence / 2, k - 1) * sd / math.sqrt(k) <= half_width:
+            return k
+    return None
+
+
+def analyze_workload(speedups, workload, target, confidence):
+    baseline_key, strategy_keys = WORKLOAD_KEYS[workload]
+    results = {}
+    for strategy in strategy_keys:
+        if strategy == baseline_key:
+            continue
+        per_seed = seed_geomeans(speedups, strategy)
+        logs = [math.log(v) for v in per_seed.values() if v]
+        ci = geomean_ci(list(per_seed.values()), confidence)
+        if ci is None:
+            continue
+        point, low, high = ci
+        sd = statistics.stdev(logs)
+        components = variance_components(speedups, strategy)
+        results[strategy] = {
+            "seeds": len(logs),
+            "geomean": point,
+            "low": low,
+            "high": high,
+            "relative_width": (high - low) / point,
+            "per_seed_log_sd": sd,
+            "components": components,
+            "seeds_needed": seeds_needed(sd, target, confidence),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate how many ETNA seeds each workload needs.")
+    parser.add_argument(
+        "--source",
+        choices=["precomputed", "fresh"],
+        required=True,
+        help="Data source: 'precomputed' or 'fresh'"
+    )
+    parser.add_argument(
+        "--system",
+        choices=["BST", "STLC"],
+        required=True,
+        help="Benchmark system to analyze"
+    )
+    parser.add_argument(
+        "--target",
+        type=float,
+        default=0.1,
+        help="Target CI width relative to the geomean speedup (default: 0.1)"
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="Confidence level (default: 0.95)"
+    )
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    timer = start_profiling(f"seed_power_{args.system.lower()}", args)
+
+    input_dir = EVAL_DIR / "parsed_4.2_data" / args.source / "speedups"
+    output_dir = EVAL_DIR / "parsed_4.2_data" / args.source / "power"
+    system = args.system.lower()
+
+    report = {"target": args.target, "confidence": args.confidence, "workloads": {}}
+    for workload in WORKLOAD_KEYS:
+        input_file = input_dir / f"{system}_{workload}.json"
+        if not input_file.exists():
+            continue
+        with phase("deserialization"):
+            with open(input_file) as f:
+                speedups = json.load(f)
+        with phase("aggregation"):
+            results = analyze_workload(speedups, workload, args.target, args.confidence)
+        if not results:
+            continue
+        report["workloads"][workload] = results
+
+        print(f"{args.system} {workload}:")
+        for strategy, entry in results.items():
+            c = entry["components"] or {}
+            components = ", ".join(f"{k}={c[k]:.3f}" for k in ("mutant", "property", "seed", "residual") if k in c)
+            needed = entry["seeds_needed"] if entry["seeds_needed"] is not None else f">{MAX_SEEDS}"
+            print(f"  {strategy}: {entry['geomean']:.3f}X [{entry['low']:.3f}, {entry['high']:.3f}] "
+                  f"with {entry['seeds']} seeds, needs {needed} for width {args.target:g}")
+            if components:
+                print(f"    log-variance components: {components}")
+
+    if not report["workloads"]:
+        print(f"Error: No speedup files found in {input_dir}")
+        return 1
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_file = output_dir / f"{system}.json"
+    with phase("serialization"):
+        with open(output_file, "w") as f:
+            json.dump(report, f, indent=2)
+    print(f"Power analysis saved to {output_file}")
+
+    timer.finish(output_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Censoring-aware time-to-failure analysis of ETNA results.
+
+parse_etna_data.py records every `[exit timeout]` as a duration of exactly
+60.0 s, and calculate_speedups.py divides by it as if it were a real time.
+Here timeouts are treated as right-censored observations instead:
+
+- Kaplan-Meier time-to-failure curves per strategy, pooled over all
+  (mutant, property, seed) trials of a workload,
+- restricted mean time to failure (RMST) up to --tau and the ratio
+  RMST(base) / RMST(strategy) as a censoring-aware speedup,
+- the geometric mean over (mutant, property) tasks of per-task RMST ratios,
+- the naive per-seed geomean speedup and the number of per-seed ratios that
+  involve a timeout, for comparison with f17/f18.
+
+Output is written to parsed_4.2_data/{source}/survival/{system}_{workload}.json
+and plotted by figure_scripts/f19.py.
+
+Usage:
+    python survival_analysis.py --source precomputed --system BST
+    python survival_analysis.py --source precomputed --system STLC --workload type
+    python survival_analysis.py --source fresh --system BST --tau 30
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from collections import defaultdict
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.benchmarks import TIMEOUT
+from common.profiling import add_profiling_arguments, phase, start_profiling
+from common.stats import geomean, kaplan_meier, restricted_mean, survival_median
+from calculate_speedups import WORKLOAD_KEYS
+
+
+def collect_trials(data, strategy_keys):
+    """Return {(mutant, prop): {strategy: {seed: duration}}} for the given strategies."""
+    trials = defaultdict(lambda: defaultdict(dict))
+    for mutant, properties in data.items():
+        for prop, values in properties.items():
+            for key, value in values.items():
+                if value is None:
+                    continue
+                strategy, seed = key.rsplit("_", 1)
+                if strategy in strategy_keys:
+                    trials[(mutant, prop)][strategy][seed] = value
+    return trials
+
+
+def analyze_workload(data, workload, tau=TIMEOUT, timeout=TIMEOUT):
+    """Compute Kaplan-Meier curves and censoring-aware speedups for one workload."""
+    baseline_key, strategy_keys = WORKLOAD_KEYS[workload]
+    trials = collect_trials(data, strategy_keys)
+    if not any(baseline_key in by_strategy for by_strategy in trials.values()):
+        return None
+
+    def observed(duration):
+        return duration < timeout
+
+    pooled = defaultdict(list)
+    task_rmst = defaultdict(dict)
+    for task, by_strategy in trials.items():
+        for strategy, by_seed in by_strategy.items():
+            durations = list(by_seed.values())
+            pooled[strategy].extend(durations)
+            times, surv = kaplan_meier(durations, [observed(d) for d in durations])
+            task_rmst[task][strategy] = restricted_mean(times, surv, tau)
+
+    results = {}
+    base_rmst = None
+    for strategy in strategy_keys:
+        durations = pooled.get(strategy)
+        if not durations:
+            continue
+        flags = [observed(d) for d in durations]
+        times, surv = kaplan_meier(durations, flags)
+        rmst = restricted_mean(times, surv, tau)
+        if strategy == baseline_key:
+            base_rmst = rmst
+
+        task_ratios = [
+            rmsts[baseline_key] / rmsts[strategy]
+            for rmsts in task_rmst.values()
+            if baseline_key in rmsts and strategy in rmsts and rmsts[strategy] > 0
+        ]
+
+        naive, censored_pairs = [], 0
+        for by_strategy in trials.values():
+            base_by_seed = by_strategy.get(baseline_key, {})
+            for seed, duration in by_strategy.get(strategy, {}).items():
+                if seed in base_by_seed and duration > 0:
+                    naive.append(base_by_seed[seed] / duration)
+                    if not observed(duration) or not observed(base_by_seed[seed]):
+                        censored_pairs += 1
+
+        results[strategy] = {
+            "trials": len(durations),
+            "events": sum(flags),
+            "censored": len(durations) - sum(flags),
+            "km": {"times": times, "survival": surv},
+            "median_time": survival_median(times, surv),
+            "rmst": rmst,
+            "task_rmst_ratio_geomean": geomean(task_ratios),
+            "naive_geomean_speedup": geomean(naive),
+            "censored_pairs": censored_pairs,
+            "pairs": len(naive),
+        }
+
+    for entry in results.values():
+        entry["rmst_ratio"] = base_rmst / entry["rmst"] if base_rmst and entry["rmst"] else None
+
+    return {"workload": workload, "baseline": baseline_key, "tau": tau, "strategies": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Censoring-aware ETNA time-to-failure analysis.")
+    parser.add_argument(
+        "--source",
+        choices=["precomputed", "fresh"],
+        required=True,
+        help="Data source: 'precomputed' or 'fresh'"
+    )
+    parser.add_argument(
+        "--system",
+        choices=["BST", "STLC"],
+        required=True,
+        help="Benchmark system to process"
+    )
+    parser.add_argument(
+        "--workload",
+        choices=list(WORKLOAD_KEYS),
+        help="Workload group (default: all with data)"
+    )
+    parser.add_argument(
+        "--tau",
+        type=float,
+        default=TIMEOUT,
+        help=f"Horizon for the restricted mean, in seconds (default: {TIMEOUT:g})"
+    )
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    timer = start_profiling(f"survival_{args.system.lower()}", args)
+
+    input_file = EVAL_DIR / "parsed_4.2_data" / args.source / "cleaned" / f"{args.system.lower()}_results_cleaned.json"
+    output_dir = EVAL_DIR / "parsed_4.2_data" / args.source / "survival"
+
+    if not input_file.exists():
+        print(f"Error: Input file not found: {input_file}")
+        return 1
+
+    with phase("deserialization"):
+        with open(input_file) as f:
+            data = json.load(f)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workloads = [args.workload] if args.workload else list(WORKLOAD_KEYS)
+
+    for workload in workloads:
+        with phase("aggregation"):
+            result = analyze_workload(data, workload, args.tau)
+        if result is None:
+            continue
+
+        output_file = output_dir / f"{args.system.lower()}_{workload}.json"
+        with phase("serialization"):
+            with open(output_file, "w") as f:
+                json.dump(result, f, indent=2)
+
+        print(f"{args.system} {workload}:")
+        for strategy, entry in result["strategies"].items():
+            print(f"  {strategy}: RMST ratio {entry['rmst_ratio']:.3f}X, "
+                  f"task RMST geomean {entry['task_rmst_ratio_geomean']:.3f}X, "
+                  f"naive {entry['naive_geomean_speedup']:.3f}X "
+                  f"({entry['censored_pairs']}/{entry['pairs']} ratios involve a timeout)")
+        print(f"  Saved to {output_file}")
+
+    timer.finish(output_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Bug-finding rate curves and what-if timeout budgets for ETNA results.
+
+Solve rates: for every workload and strategy, the fraction of
+(mutant, property, seed) trials that found the bug within budget T, for a
+log-spaced sweep of T. Each strategy's durations are sorted once and every
+budget is answered with a binary search, so long sweeps stay cheap.
+
+What-if budgets: for each --budget lower than the timeout used in the run,
+every trial slower than the budget is re-labelled as a timeout at that
+budget, then the usual cleaning and speedup computation is re-run. No
+experiments need to be repeated.
+
+Reads parsed_4.2_data/{source}/parsed/{system}_results.json and writes
+parsed_4.2_data/{source}/budgets/{system}_solve_rates.json,
+parsed_4.2_data/{source}/budgets/{system}_whatif.json and, with
+--write-speedups, budgets/timeout_{T}/{system}_{workload}.json.
+
+Usage:
+    python timeout_budgets.py --source precomputed --system BST
+    python timeout_budgets.py --source precomputed --system STLC --budget 1 5 10 30
+    python timeout_budgets.py --source fresh --system BST --budget 10 --write-speedups
+"""
+
+import sys
+import json
+import math
+import bisect
+import argparse
+from pathlib import Path
+from collections import defaultdict
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.benchmarks import TIMEOUT
+from common.profiling import add_profiling_arguments, phase, start_profiling
+from common.stats import geomean
+from calculate_speedups import WORKLOAD_KEYS
+from clean_under5ms_or_timeout import clean_results
+from run_etna_pipeline import compute_all_speedups
+
+
+def budget_sweep(low=1e-3, high=TIMEOUT, points=25):
+    """Log-spaced budgets from low to high seconds, inclusive."""
+    step = (math.log(high) - math.log(low)) / (points - 1)
+    return [math.exp(math.log(low) + i * step) for i in range(points)]
+
+
+def solve_rates(data, budgets, timeout=TIMEOUT):
+    """
+    Return {workload: {strategy: {"trials": n, "solved": [fraction solved within each budget]}}}.
+
+    Timed-out trials never count as solved.
+    """
+    durations = defaultdict(list)
+    for properties in data.values():
+        for values in properties.values():
+            for key, value in values.items():
+                if value is None:
+                    continue
+                strategy, _ = key.rsplit("_", 1)
+                durations[strategy].append(value if value < timeout else math.inf)
+
+    rates = {}
+    for workload, (_, strategy_keys) in WORKLOAD_KEYS.items():
+        per_strategy = {}
+        for strategy in strategy_keys:
+            times = sorted(durations.get(strategy, []))
+            if not times:
+                continue
+            # bisect_right counts trials that finished within (<=) the budget
+            per_strategy[strategy] = {
+                "trials": len(times),
+                "solved": [bisect.bisect_right(times, budget) / len(times) for budget in budgets],
+            }
+        if per_strategy:
+            rates[workload] = per_strategy
+    return rates
+
+
+def apply_budget(data, budget):
+    """Return a copy of parsed results where every trial slower than `budget` becomes a timeout at `budget`."""
+    return {
+        mutant: {
+            prop: {
+                key: (value if value is None or value < budget else budget)
+                for key, value in values.items()
+            }
+            for prop, values in properties.items()
+        }
+        for mutant, properties in data.items()
+    }
+
+
+def flat_geomeans(speedups):
+    """Geomean of every per-seed speedup for each strategy (as in f17)."""
+    values = defaultdict(list)
+    for properties in speedups.values():
+        for seeds in properties.values():
+            for by_strategy in seeds.values():
+                for strategy, value in by_strategy.items():
+                    values[strategy].append(value)
+    return {strategy: geomean(vals) for strategy, vals in values.items()}
+
+
+def whatif(data, budget):
+    """Re-derive cleaned results and speedups as if the run had used `budget` as its timeout."""
+    cleaned, removed = clean_results(apply_budget(data, budget), timeout=budget)
+    speedups = compute_all_speedups(cleaned)
+    return cleaned, removed, speedups
+
+
+def format_budget(budget):
+    return f"{budget:g}s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ETNA solve-rate curves and what-if timeout budgets.")
+    parser.add_argument(
+        "--source",
+        choices=["precomputed", "fresh"],
+        required=True,
+        help="Data source: 'precomputed' or 'fresh'"
+    )
+    parser.add_argument(
+        "--system",
+        choices=["BST", "STLC"],
+        required=True,
+        help="Benchmark system to process"
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        nargs="+",
+        default=[1.0, 5.0, 10.0, 30.0, TIMEOUT],
+        help="What-if timeout budgets in seconds (default: 1 5 10 30 60)"
+    )
+    parser.add_argument(
+        "--sweep-points",
+        type=int,
+        default=25,
+        help="Number of log-spaced budgets for the solve-rate curves (default: 25)"
+    )
+    parser.add_argument(
+        "--write-speedups",
+        action="store_true",
+        help="Also write per-budget speedup files"
+    )
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    timer = start_profiling(f"timeout_budgets_{args.system.lower()}", args)
+
+    input_file = EVAL_DIR / "parsed_4.2_data" / args.source / "parsed" / f"{args.system.lower()}_results.json"
+    output_dir = EVAL_DIR / "parsed_4.2_data" / args.source / "budgets"
+
+    if not input_file.exists():
+        print(f"Error: Input file not found: {input_file}")
+        return 1
+
+    too_long = [b for b in args.budget if b > TIMEOUT]
+    if too_long:
+        print(f"Error: Budgets above the {TIMEOUT:g}s run timeout cannot be derived: {too_long}")
+        return 1
+
+    with phase("deserialization"):
+        with open(input_file) as f:
+            data = json.load(f)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    system = args.system.lower()
+
+    with phase("aggregation"):
+        budgets = budget_sweep(points=args.sweep_points)
+        rates = solve_rates(data, budgets)
+    with phase("serialization"):
+        with open(output_dir / f"{system}_solve_rates.json", "w") as f:
+            json.dump({"budgets": budgets, "workloads": rates}, f, indent=2)
+    print(f"Solve-rate curves saved to {output_dir / f'{system}_solve_rates.json'}")
+
+    summary = {}
+    for budget in sorted(args.budget):
+        with phase("aggregation"):
+            cleaned, removed, speedups = whatif(data, budget)
+            label = format_budget(budget)
+            summary[label] = {
+                "budget": budget,
+                "workloads": {workload: flat_geomeans(result) for workload, result in speedups.items()},
+            }
+
+        print(f"Budget {label}:")
+        for workload, geomeans in summary[label]["workloads"].items():
+            staged = ", ".join(f"{k}={v:.3f}X" for k, v in geomeans.items() if k != WORKLOAD_KEYS[workload][0])
+            print(f"  {workload}: {staged}")
+
+        if args.write_speedups:
+            budget_dir = output_dir / f"timeout_{budget:g}"
+            budget_dir.mkdir(parents=True, exist_ok=True)
+            with phase("serialization"):
+                for workload, result in speedups.items():
+                    with open(budget_dir / f"{system}_{workload}.json", "w") as f:
+                        json.dump(result, f, indent=2)
+
+    with phase("serialization"):
+        with open(output_dir / f"{system}_whatif.json", "w") as f:
+            json.dump(summary, f, indent=2)
+    print(f"What-if summary saved to {output_dir / f'{system}_whatif.json'}")
+
+    timer.finish(output_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -11,6 +11,7 @@ Usage:
 import os
 import json
 import argparse
+import sys
 from pathlib import Path
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
@@ -20,8 +21,17 @@ from matplotlib.ticker import ScalarFormatter
 # Base directory for eval data
 EVAL_DIR = Path(__file__).parent.parent
 
+sys.path.insert(0, str(EVAL_DIR))
 
-def load_parsed_data_from_directory(directory):
+from common.profiling import add_profiling_arguments, phase, start_profiling
+from common.results_schema import benchmark_name, load_unstable
+from common.stats import fit_power_law
+
+# Label every size on the x axis only when there are few of them
+MAX_LABELLED_SIZES = 6
+
+
+def load_parsed_data_from_directory(directory, exclude=None):
     combined_data = {}
 
     for filename in os.listdir(directory):
@@ -37,21 +47,16 @@ def load_parsed_data_from_directory(directory):
 
                     for variant, timings in results.items():
                         label = format_variant_label(variant)
-                        combined_data[title][label] = {int(k): v for k, v in timings.items()}
+                        combined_data[title][label] = {
+                            int(k): v for k, v in timings.items()
+                            if not exclude or (benchmark, variant, int(k)) not in exclude
+                        }
 
     return combined_data
 
 
 def format_title(raw_name):
-    title_map = {
-        "boollist_bespoke": "Bool List",
-        "stlc_bespoke": "STLC",
-        "stlc_type": "STLC (Type-Derived)",
-        "bst_single": "BST (Single-Pass)",
-        "bst_bespoke": "BST (Repeated Insert)",
-        "bst_type": "BST (Type-Derived)",
-    }
-    return title_map.get(raw_name.lower(), raw_name)
+    return benchmark_name("ocaml", raw_name.lower())
 
 
 def format_variant_label(raw_label):
@@ -77,7 +82,19 @@ def main():
         "-o", "--output",
         help="Output file path (default: figures/{source}/fig14.png)"
     )
+    parser.add_argument(
+        "--fit",
+        action="store_true",
+        help="Draw measured points with fitted log-log scaling lines"
+    )
+    parser.add_argument(
+        "--exclude-unstable",
+        action="store_true",
+        help="Leave out measurements flagged by analysis/measurement_quality.py"
+    )
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    timer = start_profiling("f14", args)
 
     # Determine input directory based on source
     data_dir = EVAL_DIR / "parsed_4.1_data_ocaml" / args.source
@@ -95,7 +112,16 @@ def main():
         print("Run the parser first: python parsers/parse_results_ocaml.py --source", args.source)
         return 1
 
-    parsed_data = load_parsed_data_from_directory(data_dir)
+    exclude = None
+    if args.exclude_unstable:
+        exclude = load_unstable(args.source, "ocaml")
+        if exclude is None:
+            print("Warning: No quality report found, run analysis/measurement_quality.py --source", args.source)
+        else:
+            print(f"Excluding {len(exclude)} unstable measurements")
+
+    with phase("deserialization"):
+        parsed_data = load_parsed_data_from_directory(data_dir, exclude)
 
     if not parsed_data:
         print(f"Error: No data found in {data_dir}")
@@ -114,7 +140,6 @@ def main():
     # Filter to only include benchmarks we have data for
     plot_order = [p for p in plot_order if p in parsed_data]
 
-    n_values = [10, 100, 1000, 10000]
     styles = [
         ("s", "#c90076", ":"),    # BQ
         ("^", "#D55E00", "-."),   # AllegrOCaml + CSplitMix
@@ -126,39 +151,51 @@ def main():
     n_cols = 3
     n_rows = (n_plots + n_cols - 1) // n_cols
 
-    fig, axes = plt.subplots(n_rows, n_cols, figsize=(7, 5.5), sharey=True)
-    axes = axes.flatten() if n_plots > 1 else [axes]
-
-    def plot_data(ax, data, title):
-        for (method, values), (marker, color, linestyle) in zip(data.items(), styles):
-            y_vals = [values.get(n, None) for n in n_values]
-            if None not in y_vals:
-                ax.plot(n_values, y_vals, marker=marker, linestyle=linestyle,
-                        linewidth=1.5, color=color, label=method)
-        ax.set_title(title, fontsize=10)
-        ax.set_yscale("log")
-        ax.set_xscale("log")
-        ax.set_xticks(n_values)
-        ax.get_xaxis().set_major_formatter(ScalarFormatter())
-        ax.tick_params(axis="both", which="major", labelsize=8)
-
-    for i, (ax, dataset) in enumerate(zip(axes, plot_order)):
-        plot_data(ax, parsed_data[dataset], dataset)
-
-    # Hide unused axes
-    for i in range(len(plot_order), len(axes)):
-        axes[i].set_visible(False)
-
-    handles, labels = axes[0].get_legend_handles_labels()
-    fig.legend(handles, labels, loc="upper center", ncol=3, fontsize=9, frameon=False)
-
-    fig.tight_layout(rect=[0.02, 0.05, 1, 0.91])
-    fig.supylabel('Run time (ns)', y=0.466, x=0.018, fontsize=10)
-    fig.supxlabel('Size', y=0.04, fontsize=10)
-
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    with phase("plotting"):
+        fig, axes = plt.subplots(n_rows, n_cols, figsize=(7, 5.5), sharey=True)
+        axes = axes.flatten() if n_plots > 1 else [axes]
+
+        def plot_data(ax, data, title):
+            n_values = sorted({n for values in data.values() for n in values})
+            for (method, values), (marker, color, linestyle) in zip(data.items(), styles):
+                sizes = sorted(values)
+                if not sizes:
+                    continue
+                y_vals = [values[n] for n in sizes]
+                fit = fit_power_law(sizes, y_vals) if args.fit else None
+                if fit:
+                    ax.plot(sizes, y_vals, marker=marker, linestyle="none", color=color, label=method)
+                    ax.plot(sizes, [fit["constant"] * n ** fit["exponent"] for n in sizes],
+                            linestyle=linestyle, linewidth=1.5, color=color)
+                else:
+                    ax.plot(sizes, y_vals, marker=marker, linestyle=linestyle,
+                            linewidth=1.5, color=color, label=method)
+            ax.set_title(title, fontsize=10)
+            ax.set_yscale("log")
+            ax.set_xscale("log")
+            if len(n_values) <= MAX_LABELLED_SIZES:
+                ax.set_xticks(n_values)
+                ax.get_xaxis().set_major_formatter(ScalarFormatter())
+            ax.tick_params(axis="both", which="major", labelsize=8)
+
+        for i, (ax, dataset) in enumerate(zip(axes, plot_order)):
+            plot_data(ax, parsed_data[dataset], dataset)
+
+        # Hide unused axes
+        for i in range(len(plot_order), len(axes)):
+            axes[i].set_visible(False)
+
+        handles, labels = axes[0].get_legend_handles_labels()
+        fig.legend(handles, labels, loc="upper center", ncol=3, fontsize=9, frameon=False)
+
+        fig.tight_layout(rect=[0.02, 0.05, 1, 0.91])
+        fig.supylabel('Run time (ns)', y=0.466, x=0.018, fontsize=10)
+        fig.supxlabel('Size', y=0.04, fontsize=10)
+
+        plt.savefig(output_path, dpi=150, bbox_inches='tight')
     print(f"Saved figure to {output_path}")
 
+    timer.finish(output_path.parent)
     return 0
 
 
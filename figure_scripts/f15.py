@@ -1,71 +1,84 @@
 #!/usr/bin/env python3
 """
 Plot OCaml speedup analysis (Figure 15).
-Static data showing speedup from AllegrOCaml and CSplitMix.
+Speedup from AllegrOCaml against monadic binds and from CSplitMix against
+random draws, per generator group. Counters come from
+parsers/parse_counters.py and speedups from the parsed 4.1 OCaml results.
 
 Usage:
     python f15.py --source precomputed
-    python f15.py --source fresh
+    python f15.py --source fresh --size 1000 --fit
 """
 
 import argparse
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
-import pandas as pd
+import sys
 from pathlib import Path
 
 # Base directory for eval data
 EVAL_DIR = Path(__file__).parent.parent
 
-data2 = {
-    "Name": ["BST (RI)", "STLC", "Bool List", "BST (SP)"],
-    "RandCalls": [353, 211, 100, 271],
-    "Speedup": [4.4824, 1.0923, 1.000339, 4.2746]
-}
+sys.path.insert(0, str(EVAL_DIR))
+sys.path.insert(0, str(EVAL_DIR / "analysis"))
 
-df1 = pd.DataFrame(data2)
+from common.profiling import add_profiling_arguments, phase, start_profiling
+from counter_regression import counter_points, fit_speedups
 
-data1 = {
-    "Name": ["BST (RI)", "STLC", "Bool List", "BST (SP)"],
-    "Binds": [2, 670, 300, 188],
-    "Speedup": [1.18, 5.24, 2.77, 2.22]
+SHORT_NAMES = {
+    "bst_bespoke": "BST (RI)",
+    "bst_single": "BST (SP)",
+    "stlc_bespoke": "STLC",
+    "boollist_bespoke": "Bool List",
 }
-df2 = pd.DataFrame(data1)
-
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5), sharey=True, constrained_layout=False)
-
-ax1.grid(True, linestyle='--', linewidth=0.5, alpha=0.7)
-ax1.scatter(df2["Binds"], df2["Speedup"], s=80, color="#1f77b4", edgecolor="black", zorder=3)
-
-for _, row in df2.iterrows():
-    ax1.text(row["Binds"] + 10, row["Speedup"] + 0.1, row["Name"], fontsize=9, va='center')
-
-ax1.set_xlabel("Binds", fontsize=12)
-ax1.set_ylabel("Speedup from AllegrOCaml", fontsize=12)
-ax1.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"{x:.0f}×"))
-ax1.margins(x=0.1, y=0.2)
-
-ax2.grid(True, linestyle='--', linewidth=0.5, alpha=0.7)
-ax2.scatter(df1["RandCalls"], df1["Speedup"], s=80, color="#1f77b4", edgecolor="black", zorder=3)
-
-for _, row in df1.iterrows():
-    ax2.text(row["RandCalls"] + 10, row["Speedup"] + 0.1, row["Name"], fontsize=9, va='center')
-
-ax2.set_xlabel("Samples", fontsize=12)
-ax2.set_ylabel("Speedup from CSplitMix (over AllegrOCaml)", fontsize=12)
-ax2.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"{x:.0f}×"))
-ax2.margins(x=0.5, y=0.5)
-
-ax1.set_yticks(range(0, 7))
-ax2.set_yticks(range(0, 7))
 
-for ax in (ax1, ax2):
-    for label in ax.get_yticklabels():
-        label.set_horizontalalignment('left')
-        label.set_x(-0.05)
 
-plt.subplots_adjust(left=0.08, right=0.98, wspace=0.3)
+def plot(points, output_path, fit_lines=False):
+    fits = fit_speedups(points) if fit_lines else {}
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5), sharey=True, constrained_layout=False)
+
+    panels = [
+        (ax1, "binds", "allegrocaml", "Binds", "Speedup from AllegrOCaml", (0.1, 0.2)),
+        (ax2, "draws", "csplitmix", "Samples", "Speedup from CSplitMix (over AllegrOCaml)", (0.5, 0.5)),
+    ]
+    for ax, counter, speedup, xlabel, ylabel, margins in panels:
+        rows = [p for p in points if p[speedup] is not None]
+        ax.grid(True, linestyle='--', linewidth=0.5, alpha=0.7)
+        ax.scatter([p[counter] for p in rows], [p[speedup] for p in rows],
+                   s=80, color="#1f77b4", edgecolor="black", zorder=3)
+
+        for p in rows:
+            ax.text(p[counter] + 10, p[speedup] + 0.1, SHORT_NAMES.get(p["group"], p["group"]),
+                    fontsize=9, va='center')
+
+        fit = fits.get(speedup)
+        if fit:
+            xs = sorted(p[counter] for p in rows)
+            step = (xs[-1] - xs[0]) / 50 or 1
+            line_x = [xs[0] + i * step for i in range(51)]
+            ax.plot(line_x, [fit["constant"] * x ** fit["exponent"] for x in line_x],
+                    color="#7f7f7f", linestyle="--", linewidth=1, zorder=2,
+                    label=f"∝ {counter}^{fit['exponent']:.2f} (R²={fit['r_squared']:.2f})")
+            ax.legend(fontsize=8, loc="upper left", frameon=False)
+
+        ax.set_xlabel(xlabel, fontsize=12)
+        ax.set_ylabel(ylabel, fontsize=12)
+        ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"{x:.0f}×"))
+        ax.margins(x=margins[0], y=margins[1])
+
+    top = max([6] + [int(p[k]) + 1 for p in points for k in ("allegrocaml", "csplitmix") if p[k]])
+    ax1.set_yticks(range(0, top + 1))
+    ax2.set_yticks(range(0, top + 1))
+
+    for ax in (ax1, ax2):
+        for label in ax.get_yticklabels():
+            label.set_horizontalalignment('left')
+            label.set_x(-0.05)
+
+    plt.subplots_adjust(left=0.08, right=0.98, wspace=0.3)
+    plt.savefig(output_path, dpi=150, bbox_inches='tight')
 
 
 def main():
@@ -82,7 +95,19 @@ def main():
         "-o", "--output",
         help="Output file path (default: figures/{source}/fig15.png)"
     )
+    parser.add_argument(
+        "--size",
+        type=int,
+        help="Use speedups at this size instead of the geomean over all sizes"
+    )
+    parser.add_argument(
+        "--fit",
+        action="store_true",
+        help="Draw the log-log regression of speedup against counts"
+    )
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    timer = start_profiling("f15", args)
 
     # Determine output path
     if args.output:
@@ -92,8 +117,22 @@ def main():
         output_dir.mkdir(parents=True, exist_ok=True)
         output_path = output_dir / "fig15.png"
 
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    with phase("deserialization"):
+        points = counter_points(args.source, args.size)
+
+    if not points:
+        print(f"Error: No counters found for source '{args.source}'")
+        print("Run the parsers first: python parsers/parse_counters.py --source", args.source)
+        return 1
+
+    for p in points:
+        print(f"{p['group']}: binds={p['binds']} -> {p['allegrocaml'] or float('nan'):.2f}X, "
+              f"draws={p['draws']} -> {p['csplitmix'] or float('nan'):.2f}X")
+
+    with phase("plotting"):
+        plot(points, output_path, fit_lines=args.fit)
     print(f"Saved figure to {output_path}")
+    timer.finish(output_path.parent)
     return 0
 
 
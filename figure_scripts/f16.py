@@ -11,6 +11,7 @@ Usage:
 import os
 import json
 import argparse
+import sys
 from pathlib import Path
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
@@ -20,17 +21,21 @@ from matplotlib.ticker import ScalarFormatter
 # Base directory for eval data
 EVAL_DIR = Path(__file__).parent.parent
 
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.profiling import add_profiling_arguments, phase, start_profiling
+from common.results_schema import benchmark_name, load_unstable
+from common.stats import fit_power_law
+
+# Label every size on the x axis only when there are few of them
+MAX_LABELLED_SIZES = 6
+
 
 def normalize_title(name):
-    return {
-        "BoolListBespoke": "Bool List",
-        "BstBespoke": "BST (Single-Pass)",
-        "BstType": "BST (Repeated Insert)",
-        "Term": "STLC"
-    }.get(name, name)
+    return benchmark_name("scala", name)
 
 
-def load_data_from_directory(directory):
+def load_data_from_directory(directory, exclude=None):
     merged = {}
 
     for file in os.listdir(directory):
@@ -47,20 +52,22 @@ def load_data_from_directory(directory):
             for variant, entries in variants.items():
                 if variant not in merged[title]:
                     merged[title][variant] = {}
-                merged[title][variant].update({int(k): v for k, v in entries.items()})
+                merged[title][variant].update({
+                    int(k): v for k, v in entries.items()
+                    if not exclude or (raw_title, variant, int(k)) not in exclude
+                })
 
     print("Loaded benchmarks:", list(merged.keys()))
     return merged
 
 
-def plot(parsed_data, output_path):
+def plot(parsed_data, output_path, fit_lines=False):
     # Order: Bool List, BST Single Pass, STLC
     benchmark_order = ["Bool List", "BST (Single-Pass)", "STLC"]
     # Filter to only include benchmarks we have data for
     benchmark_order = [b for b in benchmark_order if b in parsed_data]
 
     variant_order = ["SC", "ScAllegro"]
-    n_values = [10, 100, 1000, 10000]
 
     styles = {
         "SC": ("s", "#de3423", ":"),
@@ -73,20 +80,29 @@ def plot(parsed_data, output_path):
         axes = [axes]
 
     def plot_data(ax, data, title):
+        n_values = sorted({n for values in data.values() for n in values})
         for variant in variant_order:
             if variant not in data:
                 print(f"Missing variant {variant} in {title}")
                 continue
             values = data[variant]
             marker, color, linestyle = styles[variant]
-            y_vals = [values.get(n) for n in n_values]
-            ax.plot(n_values, y_vals, marker=marker, linestyle=linestyle,
-                    linewidth=1.5, color=color, label=variant)
+            sizes = sorted(values)
+            y_vals = [values[n] for n in sizes]
+            fit = fit_power_law(sizes, y_vals) if fit_lines else None
+            if fit:
+                ax.plot(sizes, y_vals, marker=marker, linestyle="none", color=color, label=variant)
+                ax.plot(sizes, [fit["constant"] * n ** fit["exponent"] for n in sizes],
+                        linestyle=linestyle, linewidth=1.5, color=color)
+            else:
+                ax.plot(sizes, y_vals, marker=marker, linestyle=linestyle,
+                        linewidth=1.5, color=color, label=variant)
         ax.set_title(title, fontsize=10)
         ax.set_yscale("log")
         ax.set_xscale("log")
-        ax.set_xticks(n_values)
-        ax.get_xaxis().set_major_formatter(ScalarFormatter())
+        if len(n_values) <= MAX_LABELLED_SIZES:
+            ax.set_xticks(n_values)
+            ax.get_xaxis().set_major_formatter(ScalarFormatter())
         ax.tick_params(axis="both", which="major", labelsize=8)
         ax.set_box_aspect(1)
 
@@ -122,7 +138,19 @@ def main():
         "-o", "--output",
         help="Output file path (default: figures/{source}/fig16.png)"
     )
+    parser.add_argument(
+        "--fit",
+        action="store_true",
+        help="Draw measured points with fitted log-log scaling lines"
+    )
+    parser.add_argument(
+        "--exclude-unstable",
+        action="store_true",
+        help="Leave out measurements flagged by analysis/measurement_quality.py"
+    )
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    timer = start_profiling("f16", args)
 
     # Determine input directory based on source
     data_dir = EVAL_DIR / "parsed_4.1_data_scala" / args.source
@@ -140,13 +168,24 @@ def main():
         print("Run the parser first: python parsers/parse_results_scala_csv.py --source", args.source)
         return 1
 
-    parsed_data = load_data_from_directory(data_dir)
+    exclude = None
+    if args.exclude_unstable:
+        exclude = load_unstable(args.source, "scala")
+        if exclude is None:
+            print("Warning: No quality report found, run analysis/measurement_quality.py --source", args.source)
+        else:
+            print(f"Excluding {len(exclude)} unstable measurements")
+
+    with phase("deserialization"):
+        parsed_data = load_data_from_directory(data_dir, exclude)
 
     if not parsed_data:
         print(f"Error: No data found in {data_dir}")
         return 1
 
-    plot(parsed_data, output_path)
+    with phase("plotting"):
+        plot(parsed_data, output_path, fit_lines=args.fit)
+    timer.finish(output_path.parent)
     return 0
 
 
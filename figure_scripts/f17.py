@@ -3,16 +3,26 @@
 Plot AllegrOCaml speedup bar charts from ETNA benchmark results.
 Figure 17: Geometric average of all speedups for each strategy and benchmark.
 
+Speedups are aggregated seeds -> properties -> mutants (common/aggregate.py).
+The default --weighting flat weighs every value equally, as one geomean over
+all of them; equal gives every property of a mutant and every mutant the same
+weight, sqrt is in between.
+
+--sample plots the quick-look estimates of `run_etna_pipeline.py --sample`
+instead, with their confidence intervals as error bars.
+
 Usage:
     python f17.py --source precomputed
     python f17.py --source fresh -o fig17.png
+    python f17.py --source precomputed --weighting equal
+    python f17.py --source fresh --sample
 """
 
 import json
 import argparse
+import sys
 from pathlib import Path
 import numpy as np
-from scipy.stats import gmean
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
@@ -20,6 +30,11 @@ import matplotlib.pyplot as plt
 # Base directory for eval data
 EVAL_DIR = Path(__file__).parent.parent
 
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.aggregate import WEIGHTINGS, hierarchical_geomean
+from common.profiling import add_profiling_arguments, phase, start_profiling
+
 # Mapping from JSON files to display names and speedup keys
 BENCHMARK_FILES = [
     ("bst_bespoke.json", "BST (Repeated Insert)", "baseBespokestaged", "baseBespokestagedcsr"),
@@ -30,26 +45,40 @@ BENCHMARK_FILES = [
 ]
 
 
-def compute_geomean_speedups(data, staged_key, staged_csr_key):
-    """Compute geometric mean speedup across all mutants/properties/seeds."""
-    staged_speedups = []
-    staged_csr_speedups = []
-
-    for mutant_data in data.values():
-        for prop_data in mutant_data.values():
-            for seed_data in prop_data.values():
-                if staged_key in seed_data:
-                    staged_speedups.append(seed_data[staged_key])
-                if staged_csr_key in seed_data:
-                    staged_csr_speedups.append(seed_data[staged_csr_key])
-
-    gm_staged = gmean(staged_speedups) if staged_speedups else 0
-    gm_csr = gmean(staged_csr_speedups) if staged_csr_speedups else 0
-
-    return {
-        "AllegrOCaml": gm_staged,
-        "AllegrOCaml + CSM": gm_csr
-    }
+def compute_geomean_speedups(data, staged_key, staged_csr_key, weighting="flat"):
+    """
+    Compute the geometric mean speedup over mutants/properties/seeds.
+
+    Returns ({label: geomean}, {label: counts}); counts hold the number of
+    mutants, properties and seed values behind each geomean.
+    """
+    speedups, counts = {}, {}
+    for label, key in (("AllegrOCaml", staged_key), ("AllegrOCaml + CSM", staged_csr_key)):
+        result = hierarchical_geomean(data, key, weighting)
+        speedups[label] = result["geomean"] if result else 0
+        counts[label] = result["counts"] if result else {"mutants": 0, "properties": 0, "seeds": 0}
+    return speedups, counts
+
+
+def load_sample_estimates(sample_dir, filename, staged_key, staged_csr_key):
+    """
+    Return ({label: geomean}, {label: (low, high)}) from the quick-look report
+    covering `filename` (e.g. bst_bespoke.json), or None when it has none.
+    """
+    system, workload = filename[:-len(".json")].split("_", 1)
+    path = sample_dir / f"{system}.json"
+    if not path.exists():
+        return None
+    with open(path) as f:
+        intervals = json.load(f)["estimates"].get(workload)
+    if not intervals:
+        return None
+    speedups, bounds = {}, {}
+    for label, key in (("AllegrOCaml", staged_key), ("AllegrOCaml + CSM", staged_csr_key)):
+        entry = intervals.get(key, {})
+        speedups[label] = entry.get("geomean", 0)
+        bounds[label] = (entry.get("low", speedups[label]), entry.get("high", speedups[label]))
+    return speedups, bounds
 
 
 def main():
@@ -64,7 +93,20 @@ def main():
         "-o", "--output",
         help="Output file path (default: figures/{source}/fig17.png)"
     )
+    parser.add_argument(
+        "--weighting",
+        choices=list(WEIGHTINGS),
+        default="flat",
+        help="Weight of each property/mutant when aggregating (default: flat)"
+    )
+    parser.add_argument(
+        "--sample",
+        action="store_true",
+        help="Plot the quick-look estimates from run_etna_pipeline.py --sample with error bars"
+    )
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    timer = start_profiling("f17", args)
 
     # Determine input directory based on source
     data_dir = EVAL_DIR / "parsed_4.2_data" / args.source / "speedups"
@@ -77,25 +119,42 @@ def main():
         output_dir.mkdir(parents=True, exist_ok=True)
         output_path = output_dir / "fig17.png"
 
-    if not data_dir.exists():
+    if not data_dir.exists() and not args.sample:
         print(f"Error: Data directory not found: {data_dir}")
         print("Run the ETNA pipeline first to generate speedup data.")
         return 1
 
     # Load data and compute speedups
     datasets = {}
+    intervals = {}
     for filename, display_name, staged_key, staged_csr_key in BENCHMARK_FILES:
+        if args.sample:
+            estimates = load_sample_estimates(data_dir.parent / "sample", filename, staged_key, staged_csr_key)
+            if estimates is None:
+                print(f"Warning: No quick-look estimates for {display_name}, skipping")
+                continue
+            datasets[display_name], intervals[display_name] = estimates
+            print(f"{display_name}: " + ", ".join(
+                f"{label}={value:.4f}X [{intervals[display_name][label][0]:.4f}, {intervals[display_name][label][1]:.4f}]"
+                for label, value in datasets[display_name].items()
+            ))
+            continue
+
         file_path = data_dir / filename
         if not file_path.exists():
             print(f"Warning: {file_path} not found, skipping {display_name}")
             continue
 
-        with open(file_path) as f:
-            data = json.load(f)
+        with phase("deserialization"):
+            with open(file_path) as f:
+                data = json.load(f)
 
-        speedups = compute_geomean_speedups(data, staged_key, staged_csr_key)
+        with phase("aggregation"):
+            speedups, counts = compute_geomean_speedups(data, staged_key, staged_csr_key, args.weighting)
         datasets[display_name] = speedups
         print(f"{display_name}: AllegrOCaml={speedups['AllegrOCaml']:.4f}X, AllegrOCaml + CSM={speedups['AllegrOCaml + CSM']:.4f}X")
+        for label, c in counts.items():
+            print(f"  {label}: {c['mutants']} mutants, {c['properties']} properties, {c['seeds']} values")
 
     if not datasets:
         print("Error: No data loaded")
@@ -104,45 +163,54 @@ def main():
     # Plot
     colors = ["#0072B2", "#D55E00"]  # AllegrOCaml (blue) and AllegrOCaml + CSM (orange)
 
-    fig, axes = plt.subplots(1, len(datasets), figsize=(12, 3.5), sharey=True)
+    with phase("plotting"):
+        fig, axes = plt.subplots(1, len(datasets), figsize=(12, 3.5), sharey=True)
 
-    if len(datasets) == 1:
-        axes = [axes]
+        if len(datasets) == 1:
+            axes = [axes]
 
-    max_value = max(max(data.values()) for data in datasets.values())
-    y_limit = np.ceil(max_value) * 1.1
+        max_value = max(max(data.values()) for data in datasets.values())
+        if intervals:
+            max_value = max(max(high for _, high in bounds.values()) for bounds in intervals.values())
+        y_limit = np.ceil(max_value) * 1.1
 
-    for ax, (title, data) in zip(axes, datasets.items()):
-        labels = list(data.keys())
-        values = list(data.values())
+        for ax, (title, data) in zip(axes, datasets.items()):
+            labels = list(data.keys())
+            values = list(data.values())
 
-        bars = ax.bar(labels, values, color=colors)
+            yerr = None
+            if title in intervals:
+                bounds = [intervals[title][label] for label in labels]
+                yerr = [[v - low for v, (low, _) in zip(values, bounds)],
+                        [high - v for v, (_, high) in zip(values, bounds)]]
+            bars = ax.bar(labels, values, color=colors, yerr=yerr, capsize=3)
 
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width() / 2, height + (y_limit * 0.02), f'{height:.2f}X',
-                    ha='center', va='bottom', fontsize=7)
+            for bar in bars:
+                height = bar.get_height()
+                ax.text(bar.get_x() + bar.get_width() / 2, height + (y_limit * 0.02), f'{height:.2f}X',
+                        ha='center', va='bottom', fontsize=7)
 
-        ax.set_title(title, fontsize=10)
-        ax.set_xticks(range(len(labels)))
-        ax.set_xticklabels(labels, rotation=45, ha="right", fontsize=8)
-        ax.set_ylim(0, y_limit)
+            ax.set_title(title, fontsize=10)
+            ax.set_xticks(range(len(labels)))
+            ax.set_xticklabels(labels, rotation=45, ha="right", fontsize=8)
+            ax.set_ylim(0, y_limit)
 
-        ax.tick_params(axis="y", labelsize=7)
+            ax.tick_params(axis="y", labelsize=7)
 
-    def format_y_ticks(x, _):
-        return f"{int(x)}X"
+        def format_y_ticks(x, _):
+            return f"{int(x)}X"
 
-    y_ticks = np.arange(0, y_limit, step=1)
-    axes[0].set_yticks(y_ticks)
-    axes[0].yaxis.set_major_formatter(plt.FuncFormatter(format_y_ticks))
+        y_ticks = np.arange(0, y_limit, step=1)
+        axes[0].set_yticks(y_ticks)
+        axes[0].yaxis.set_major_formatter(plt.FuncFormatter(format_y_ticks))
 
-    fig.supylabel('Speedup', y=0.6, x=0.01, fontsize=9)
-    plt.tight_layout()
+        fig.supylabel('Speedup', y=0.6, x=0.01, fontsize=9)
+        plt.tight_layout()
 
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+        plt.savefig(output_path, dpi=150, bbox_inches='tight')
     print(f"Saved figure to {output_path}")
 
+    timer.finish(output_path.parent)
     return 0
 
 
@@ -3,14 +3,20 @@
 Plot speedup distribution from ETNA benchmark results.
 Figure 18: Box plots showing speedup across different workloads.
 
+By default every per-seed speedup is one point. --level property plots one
+geomean per mutant/property task, --level mutant one per mutant (see
+common/aggregate.py), so that mutants with many properties do not dominate.
+
 Usage:
     python f18.py --source precomputed -o fig18.png
     python f18.py --source fresh -o fig18.png
+    python f18.py --source precomputed --level mutant
 """
 
 import json
 import os
 import argparse
+import sys
 from pathlib import Path
 import numpy as np
 import matplotlib
@@ -23,6 +29,11 @@ sns.set_context("notebook")
 # Base directory for eval data
 EVAL_DIR = Path(__file__).parent.parent
 
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.aggregate import LEVELS, group_logs, level_values
+from common.profiling import add_profiling_arguments, phase, start_profiling
+
 
 def main():
     parser = argparse.ArgumentParser(description="Plot speedup results (Figure 18).")
@@ -36,7 +47,15 @@ def main():
         "-o", "--output",
         help="Output file path (default: figures/{source}/fig18.png)"
     )
+    parser.add_argument(
+        "--level",
+        choices=LEVELS,
+        default="seed",
+        help="Aggregate speedups up to this level before plotting (default: seed)"
+    )
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    timer = start_profiling("f18", args)
 
     # Determine input directory based on source
     data_dir = EVAL_DIR / "parsed_4.2_data" / args.source / "speedups"
@@ -101,45 +120,50 @@ def main():
         print(f"Loading data from: {file_path}")
 
         try:
-            with open(file_path, "r") as f:
-                data = json.load(f)
+            with phase("deserialization"):
+                with open(file_path, "r") as f:
+                    data = json.load(f)
         except Exception as e:
             print(f"Error loading {file_path}: {e}")
             continue
 
         values = {name: [] for name in category_order}
 
-        for condition in data.values():
-            for property_data in condition.values():
-                for seed_data in property_data.values():
-                    for old_name, new_name in category_mapping.items():
-                        if old_name in seed_data:
-                            values[new_name].append(seed_data[old_name])
+        counts = {}
+        with phase("aggregation"):
+            for old_name, new_name in category_mapping.items():
+                groups = group_logs(data, old_name)
+                if not groups:
+                    continue
+                values[new_name] += level_values(data, old_name, args.level)
+                counts[new_name] = (len(groups), sum(len(props) for props in groups.values()))
 
         for category, vals in values.items():
-            print(f"  {category}: {len(vals)} values")
+            mutants, properties = counts.get(category, (0, 0))
+            print(f"  {category}: {len(vals)} values ({mutants} mutants, {properties} properties)")
 
         if all(len(vals) == 0 for vals in values.values()):
             print(f"Skipping {file_path}: No valid data found.")
             continue
 
-        sns.boxplot(
-            data=[values[cat] for cat in category_order],
-            palette=custom_palette,
-            showfliers=False,
-            ax=ax
-        )
-
-        for i, cat in enumerate(category_order):
-            if idx < len(swarm_enabled) and swarm_enabled[idx][cat]:
-                sns.swarmplot(
-                    x=[i] * len(values[cat]),
-                    y=values[cat],
-                    color="black",
-                    size=1.6,
-                    alpha=0.6,
-                    ax=ax
-                )
+        with phase("plotting"):
+            sns.boxplot(
+                data=[values[cat] for cat in category_order],
+                palette=custom_palette,
+                showfliers=False,
+                ax=ax
+            )
+
+            for i, cat in enumerate(category_order):
+                if idx < len(swarm_enabled) and swarm_enabled[idx][cat]:
+                    sns.swarmplot(
+                        x=[i] * len(values[cat]),
+                        y=values[cat],
+                        color="black",
+                        size=1.6,
+                        alpha=0.6,
+                        ax=ax
+                    )
 
         ax.axhline(y=1, color="gray", linestyle="dotted", linewidth=1)
         ax.set_xticks(range(len(category_order)))
@@ -158,9 +182,11 @@ def main():
     plt.tight_layout(rect=[0.01, 0.01, 1, 1])
     fig.supylabel('Speedup', x=0.000001, fontsize=16)
 
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    with phase("plotting"):
+        plt.savefig(output_path, dpi=150, bbox_inches='tight')
     print(f"Saved figure to {output_path}")
 
+    timer.finish(output_path.parent)
     return 0
 
 
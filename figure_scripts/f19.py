@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Plot censoring-aware time-to-failure curves from ETNA benchmark results.
+Figure 19: Kaplan-Meier curves per strategy, with timeouts treated as censored.
+
+Requires the output of etna_data_processing/survival_analysis.py.
+
+Usage:
+    python f19.py --source precomputed
+    python f19.py --source fresh -o fig19.png
+"""
+
+import json
+import argparse
+import sys
+from pathlib import Path
+import matplotlib
+matplotlib.use('Agg')  # Use non-interactive backend
+import matplotlib.pyplot as plt
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.profiling import add_profiling_arguments, phase, start_profiling
+
+# Mapping from JSON files to display names and strategy keys (base, staged, staged + CSM)
+BENCHMARK_FILES = [
+    ("bst_bespoke.json", "BST (Repeated Insert)", "baseBespoke", "baseBespokestaged", "baseBespokestagedcsr"),
+    ("bst_bespokesingle.json", "BST (Single-Pass)", "baseBespokesingle", "baseBespokesinglestaged", "baseBespokesinglestagedcsr"),
+    ("bst_type.json", "BST (Type-Derived)", "baseType", "baseTypestaged", "baseTypestagedcsr"),
+    ("stlc_bespoke.json", "STLC", "baseBespoke", "baseBespokestaged", "baseBespokestagedcsr"),
+    ("stlc_type.json", "STLC (Type-Derived)", "baseType", "baseTypestaged", "baseTypestagedcsr"),
+]
+
+SERIES = [
+    ("Base", "#c90076", ":"),
+    ("AllegrOCaml", "#0072B2", "--"),
+    ("AllegrOCaml + CSM", "#D55E00", "-."),
+]
+
+
+def step_points(entry, tau):
+    """Turn a Kaplan-Meier curve into x/y arrays for a post-step plot starting at S=1."""
+    times = [t for t in entry["km"]["times"] if t < tau]
+    survival = entry["km"]["survival"][:len(times)]
+    x = [min(times[0], 1e-4) if times else 1e-4] + times + [tau]
+    y = [1.0] + survival + [survival[-1] if survival else 1.0]
+    return x, y
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plot ETNA time-to-failure curves (Figure 19).")
+    parser.add_argument(
+        "--source",
+        choices=["precomputed", "fresh"],
+        required=True,
+        help="Data source: 'precomputed' or 'fresh'"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="Output file path (default: figures/{source}/fig19.png)"
+    )
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    timer = start_profiling("f19", args)
+
+    # Determine input directory based on source
+    data_dir = EVAL_DIR / "parsed_4.2_data" / args.source / "survival"
+
+    # Determine output path
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        output_dir = EVAL_DIR / "figures" / args.source
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / "fig19.png"
+
+    if not data_dir.exists():
+        print(f"Error: Data directory not found: {data_dir}")
+        print("Run the survival analysis first: python etna_data_processing/survival_analysis.py --source", args.source)
+        return 1
+
+    datasets = []
+    for filename, display_name, *strategy_keys in BENCHMARK_FILES:
+        file_path = data_dir / filename
+        if not file_path.exists():
+            print(f"Warning: {file_path} not found, skipping {display_name}")
+            continue
+        with phase("deserialization"):
+            with open(file_path) as f:
+                datasets.append((display_name, strategy_keys, json.load(f)))
+
+    if not datasets:
+        print("Error: No data loaded")
+        return 1
+
+    with phase("plotting"):
+        fig, axes = plt.subplots(1, len(datasets), figsize=(2.6 * len(datasets), 2.8), sharey=True)
+        if len(datasets) == 1:
+            axes = [axes]
+
+        for ax, (title, strategy_keys, data) in zip(axes, datasets):
+            tau = data["tau"]
+            for key, (label, color, linestyle) in zip(strategy_keys, SERIES):
+                entry = data["strategies"].get(key)
+                if entry is None:
+                    continue
+                x, y = step_points(entry, tau)
+                if key != strategy_keys[0]:
+                    label = f"{label} ({entry['rmst_ratio']:.2f}X)"
+                ax.step(x, y, where="post", color=color, linestyle=linestyle, linewidth=1.5, label=label)
+                print(f"{title}: {key} RMST ratio {entry['rmst_ratio']:.4f}X, {entry['censored']} censored")
+
+            ax.set_title(title, fontsize=10)
+            ax.set_xscale("log")
+            ax.set_xlim(right=tau)
+            ax.set_ylim(0, 1.02)
+            ax.tick_params(axis="both", which="major", labelsize=8)
+            ax.legend(fontsize=6, loc="lower left", frameon=False)
+
+        fig.supylabel('Fraction of trials unsolved', x=0.01, fontsize=9)
+        fig.supxlabel('Time to failure (s)', fontsize=9)
+        plt.tight_layout()
+
+        plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    print(f"Saved figure to {output_path}")
+
+    timer.finish(output_path.parent)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Plot Scala generator throughput against JMH thread count.
+Figure 20: ops/s vs threads for SC and ScAllegro, one panel per benchmark.
+
+Requires a JMH run in thrpt mode (e.g. `-bm thrpt -t 1,2,4,8`) parsed by
+parsers/parse_results_scala_csv.py, which writes scaling/throughput.json.
+Thin lines show perfect linear scaling from each variant's one-thread
+throughput. @Params that vary in the run appear as separate variants
+(e.g. SC[impl=a]).
+
+Usage:
+    python f20.py --source fresh
+    python f20.py --source fresh --size 1000 -o fig20.png
+"""
+
+import json
+import argparse
+import sys
+from pathlib import Path
+import matplotlib
+matplotlib.use('Agg')  # Use non-interactive backend
+import matplotlib.pyplot as plt
+from matplotlib.ticker import ScalarFormatter
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.profiling import add_profiling_arguments, phase, start_profiling
+from common.results_schema import benchmark_name
+
+VARIANT_ORDER = ["SC", "ScAllegro"]
+
+STYLES = {
+    "SC": ("s", "#de3423", ":"),
+    "ScAllegro": ("o", "#23b6de", "--"),
+}
+
+
+def base_variant(label):
+    """'SC[impl=a]' -> 'SC' (see parse_results_scala_csv.read_jmh_rows)."""
+    return label.split("[")[0]
+
+
+def variant_key(label):
+    base = base_variant(label)
+    return VARIANT_ORDER.index(base) if base in VARIANT_ORDER else len(VARIANT_ORDER), label
+
+
+def load_throughput(data_dir, size=None):
+    """
+    Return {title: {variant: {threads: (ops/s, error)}}} at `size`, or at each
+    benchmark's largest size when size is None.
+    """
+    with open(data_dir / "scaling" / "throughput.json") as f:
+        data = json.load(f)
+
+    series = {}
+    for group, variants in data["scores"].items():
+        sizes = {int(n) for by_size in variants.values() for n in by_size}
+        chosen = size if size is not None else max(sizes)
+        if chosen not in sizes:
+            print(f"No size {chosen} for {group}, skipping")
+            continue
+        title = f"{benchmark_name('scala', group)} (n={chosen})"
+        series[title] = {}
+        for variant, by_size in variants.items():
+            scores = by_size.get(str(chosen), {})
+            errors = data["errors"].get(group, {}).get(variant, {}).get(str(chosen), {})
+            series[title][variant] = {int(t): (v, errors.get(t)) for t, v in scores.items()}
+    return series
+
+
+def plot(series, output_path):
+    titles = sorted(series)
+    fig, axes = plt.subplots(1, len(titles), figsize=(2.4 * len(titles), 2.5))
+    if len(titles) == 1:
+        axes = [axes]
+
+    for ax, title in zip(axes, titles):
+        threads = sorted({t for values in series[title].values() for t in values})
+        for variant in VARIANT_ORDER:
+            if not any(base_variant(label) == variant for label in series[title]):
+                print(f"Missing variant {variant} in {title}")
+        for variant in sorted(series[title], key=variant_key):
+            values = series[title][variant]
+            if not values:
+                continue
+            marker, color, linestyle = STYLES.get(base_variant(variant), ("^", None, "-."))
+            if variant != base_variant(variant):
+                color = None  # automatic colors tell @Param values apart
+            xs = sorted(values)
+            ys = [values[t][0] for t in xs]
+            errors = [values[t][1] or 0 for t in xs]
+            lines = ax.errorbar(xs, ys, yerr=errors, marker=marker, linestyle=linestyle, linewidth=1.5,
+                                color=color, capsize=2, label=variant)
+            color = lines[0].get_color()
+            if 1 in values:
+                ax.plot(xs, [values[1][0] * t for t in xs], linestyle="-", linewidth=0.6,
+                        color=color, alpha=0.4)
+                print(f"{title} {variant}: {ys[-1] / values[1][0]:.2f}x at {xs[-1]} threads "
+                      f"({ys[-1] / (values[1][0] * xs[-1]):.0%} parallel efficiency)")
+        ax.set_title(title, fontsize=9)
+        ax.set_xscale("log", base=2)
+        ax.set_yscale("log")
+        ax.set_xticks(threads)
+        ax.get_xaxis().set_major_formatter(ScalarFormatter())
+        ax.tick_params(axis="both", which="major", labelsize=8)
+        ax.set_box_aspect(1)
+
+    handles, labels = axes[0].get_legend_handles_labels()
+    fig.legend(handles, labels, loc="upper center", ncol=min(len(labels), 4), fontsize=9, frameon=False)
+
+    fig.tight_layout(rect=[0.02, 0.05, 1, 0.9])
+    fig.supylabel('Throughput (ops/s)', y=0.45, x=0.02, fontsize=10)
+    fig.supxlabel('Threads', fontsize=10)
+
+    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    print(f"Saved figure to {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plot Scala throughput scaling (Figure 20).")
+    parser.add_argument(
+        "--source",
+        choices=["precomputed", "fresh"],
+        required=True,
+        help="Data source: 'precomputed' or 'fresh'"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="Output file path (default: figures/{source}/fig20.png)"
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        help="Generator size to plot (default: each benchmark's largest)"
+    )
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    timer = start_profiling("f20", args)
+
+    data_dir = EVAL_DIR / "parsed_4.1_data_scala" / args.source
+
+    # Determine output path
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        output_dir = EVAL_DIR / "figures" / args.source
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / "fig20.png"
+
+    if not (data_dir / "scaling" / "throughput.json").exists():
+        print(f"Error: No throughput data found in {data_dir / 'scaling'}")
+        print("Run JMH in thrpt mode and parse it: python parsers/parse_results_scala_csv.py --source", args.source)
+        return 1
+
+    with phase("deserialization"):
+        series = load_throughput(data_dir, args.size)
+
+    if not series:
+        print("Error: No data loaded")
+        return 1
+
+    with phase("plotting"):
+        plot(series, output_path)
+    timer.finish(output_path.parent)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Plot the ablation breakdown of ETNA speedups.
+Figure 21: per workload, the geomean speedup of each staging step
+(base -> staged -> stagedc -> stagedcsr) and of the total, with confidence
+intervals and each step's share of the total log speedup.
+
+Requires etna_data_processing/ablation.py to have been run for each system.
+
+Usage:
+    python f21.py --source precomputed
+    python f21.py --source fresh -o fig21.png
+"""
+
+import json
+import argparse
+import sys
+from pathlib import Path
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.ticker import FuncFormatter
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.profiling import add_profiling_arguments, phase, start_profiling
+
+# (system file, workload) -> panel title, in f17's order
+WORKLOADS = [
+    ("bst", "bespoke", "BST (Repeated Insert)"),
+    ("bst", "bespokesingle", "BST (Single-Pass)"),
+    ("bst", "type", "BST (Type-Derived)"),
+    ("stlc", "bespoke", "STLC"),
+    ("stlc", "bespokesingle", "STLC (Single-Pass)"),
+    ("stlc", "type", "STLC (Type-Derived)"),
+]
+
+STEP_LABELS = ["staged", "stagedc", "stagedcsr", "total"]
+COLORS = ["#0072B2", "#009E73", "#D55E00", "#555555"]
+
+
+def load_ablation(data_dir):
+    """Return [(title, [step entries..., total entry])] for every workload with data."""
+    reports = {}
+    for path in sorted(data_dir.glob("*.json")):
+        with open(path) as f:
+            reports[path.stem] = json.load(f)["workloads"]
+
+    panels = []
+    for system, workload, title in WORKLOADS:
+        result = reports.get(system, {}).get(workload)
+        if result:
+            panels.append((title, result["steps"] + [dict(result["total"], share=1.0)]))
+    return panels
+
+
+def plot(panels, output_path):
+    fig, axes = plt.subplots(1, len(panels), figsize=(2.6 * len(panels), 3.2), sharey=True)
+    if len(panels) == 1:
+        axes = [axes]
+
+    for ax, (title, entries) in zip(axes, panels):
+        xs = range(len(entries))
+        values = [entry["geomean"] for entry in entries]
+        yerr = [[v - (entry["low"] or v) for v, entry in zip(values, entries)],
+                [(entry["high"] or v) - v for v, entry in zip(values, entries)]]
+        bars = ax.bar(xs, values, color=COLORS[:len(entries)], yerr=yerr, capsize=3)
+
+        for bar, entry in zip(bars, entries[:-1]):
+            share = f"\n{entry['share']:.0%}" if entry.get("share") is not None else ""
+            ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() * 1.08, f"{entry['geomean']:.2f}X{share}",
+                    ha='center', va='bottom', fontsize=6)
+        total = bars[-1]
+        ax.text(total.get_x() + total.get_width() / 2, total.get_height() * 1.08, f"{values[-1]:.2f}X",
+                ha='center', va='bottom', fontsize=6)
+        print(f"{title}: " + " x ".join(f"{v:.3f}" for v in values[:-1]) + f" = {values[-1]:.3f}X")
+
+        ax.axhline(y=1, color="gray", linestyle="dotted", linewidth=1)
+        ax.set_yscale("log")
+        ax.set_title(title, fontsize=9)
+        ax.set_xticks(list(xs))
+        ax.set_xticklabels(STEP_LABELS[:len(entries)], rotation=45, ha="right", fontsize=8)
+        ax.tick_params(axis="y", labelsize=7)
+
+    axes[0].yaxis.set_major_formatter(FuncFormatter(lambda y, _: f"{y:g}X"))
+    axes[0].yaxis.set_minor_formatter(FuncFormatter(lambda y, _: ""))
+    top = max(entry["high"] or entry["geomean"] for _, entries in panels for entry in entries)
+    axes[0].set_ylim(0.8, top * 1.6)
+
+    fig.supylabel('Speedup of step', y=0.6, x=0.01, fontsize=9)
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    print(f"Saved figure to {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plot the ETNA staging ablation (Figure 21).")
+    parser.add_argument(
+        "--source",
+        choices=["precomputed", "fresh"],
+        required=True,
+        help="Data source: 'precomputed' or 'fresh'"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="Output file path (default: figures/{source}/fig21.png)"
+    )
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    timer = start_profiling("f21", args)
+
+    data_dir = EVAL_DIR / "parsed_4.2_data" / args.source / "ablation"
+
+    # Determine output path
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        output_dir = EVAL_DIR / "figures" / args.source
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / "fig21.png"
+
+    if not data_dir.exists():
+        print(f"Error: Data directory not found: {data_dir}")
+        print("Run etna_data_processing/ablation.py for each system first.")
+        return 1
+
+    with phase("deserialization"):
+        panels = load_ablation(data_dir)
+
+    if not panels:
+        print("Error: No data loaded")
+        return 1
+
+    with phase("plotting"):
+        plot(panels, output_path)
+    timer.finish(output_path.parent)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Packed archives for ETNA seed directories.
+
+`pack` turns oc3-<system>-<seed>/ into a single oc3-<system>-<seed>.pack file
+next to it. The layout is
+
+    header   b"ETNAPACK", version (u32), index offset (u64), index length (u64)
+    blobs    the raw trial files, back to back
+    index    JSON: {"system", "seed", "entries": [{"path", "system", "strategy",
+             "mutant", "prop", "offset", "length"}, ...]}
+
+Packs are append-only. `pack --append` adds files that are new since the last
+pack by writing their blobs and a fresh index after the old one and then
+repointing the header. parse_etna_data.py reads .pack files in place of seed
+directories, with one open and one read per seed. `unpack` restores the
+original directory byte for byte.
+
+Usage:
+    python etna_pack.py pack 4.2_data/fresh/bst-experiments
+    python etna_pack.py pack --remove 4.2_data/fresh/bst-experiments/oc3-bst-42
+    python etna_pack.py unpack 4.2_data/fresh/bst-experiments/oc3-bst-42.pack
+    python etna_pack.py list 4.2_data/fresh/bst-experiments/oc3-bst-42.pack
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+import struct
+import argparse
+from pathlib import Path
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.profiling import add_profiling_arguments, phase, start_profiling
+
+MAGIC = b"ETNAPACK"
+VERSION = 1
+HEADER = struct.Struct(">8sIQQ")
+
+SEED_DIR_PATTERN = re.compile(r"oc3-([a-z]+)-(\d+)$")
+
+
+def trial_fields(filename):
+    """(system, strategy, mutant, prop) from '<SYSTEM>,<strategy>,<mutant>,<prop>.txt', or Nones."""
+    parts = filename.split(",")
+    prop_match = re.search(r"(prop_[^\.]+)\.txt", parts[-1])
+    if len(parts) >= 3 and prop_match:
+        return parts[0], parts[1], parts[2], prop_match.group(1)
+    return None, None, None, None
+
+
+class PackReader:
+    """Random access to the files of one .pack archive, read fully into memory."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self.data = f.read()
+        magic, version, index_offset, index_length = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path}: not an ETNA pack (version {VERSION})")
+        self.index = json.loads(self.data[index_offset:index_offset + index_length])
+
+    @property
+    def entries(self):
+        return self.index["entries"]
+
+    def read_bytes(self, entry):
+        return self.data[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def read(self, entry):
+        return self.read_bytes(entry).decode()
+
+
+def _write_index(f, index, end):
+    """Write the index at `end` and point the header at it."""
+    payload = json.dumps(index, separators=(",", ":")).encode()
+    f.seek(end)
+    f.write(payload)
+    f.truncate()
+    f.seek(0)
+    f.write(HEADER.pack(MAGIC, VERSION, end, len(payload)))
+
+
+def _blob_entry(path, offset, length):
+    system, strategy, mutant, prop = trial_fields(Path(path).name)
+    return {"path": path, "system": system, "strategy": strategy, "mutant": mutant,
+            "prop": prop, "offset": offset, "length": length}
+
+
+def pack_dir(seed_dir, pack_path=None, append=False):
+    """
+    Pack every file under seed_dir. With append=True and an existing pack,
+    only files not yet in the pack are added. Returns (pack_path, files added).
+    """
+    seed_dir = Path(seed_dir)
+    match = SEED_DIR_PATTERN.match(seed_dir.name)
+    if not match:
+        raise ValueError(f"{seed_dir}: not an oc3-<system>-<seed> directory")
+    pack_path = Path(pack_path) if pack_path else seed_dir.with_name(seed_dir.name + ".pack")
+
+    files = sorted(
+        os.path.relpath(os.path.join(root, name), seed_dir)
+        for root, _, names in os.walk(seed_dir)
+        for name in names
+    )
+
+    if append and pack_path.exists():
+        index = PackReader(pack_path).index
+        known = {entry["path"] for entry in index["entries"]}
+        mode = "r+b"
+    else:
+        index = {"system": match.group(1).upper(), "seed": match.group(2), "entries": []}
+        known = set()
+        mode = "w+b"
+
+    new_files = [path for path in files if path not in known]
+    with pack_path.open(mode) as f:
+        if mode == "w+b":
+            f.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+            end = HEADER.size
+        else:
+            # New blobs go after the old index, which stays behind as dead bytes
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+        for path in new_files:
+            blob = (seed_dir / path).read_bytes()
+            f.seek(end)
+            f.write(blob)
+            index["entries"].append(_blob_entry(path, end, len(blob)))
+            end += len(blob)
+        _write_index(f, index, end)
+
+    return pack_path, len(new_files)
+
+
+def unpack(pack_path, output_dir=None):
+    """Restore a pack into oc3-<system>-<seed>/ (next to it by default). Returns the directory."""
+    reader = PackReader(pack_path)
+    pack_path = Path(pack_path)
+    output_dir = Path(output_dir) if output_dir else pack_path.with_suffix("")
+    for entry in reader.entries:
+        target = output_dir / entry["path"]
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(reader.read_bytes(entry))
+    return output_dir
+
+
+def verify(pack_path, seed_dir):
+    """True when every file in seed_dir is in the pack with identical contents."""
+    reader = PackReader(pack_path)
+    packed = {entry["path"]: entry for entry in reader.entries}
+    for root, _, names in os.walk(seed_dir):
+        for name in names:
+            path = os.path.relpath(os.path.join(root, name), seed_dir)
+            if path not in packed or reader.read_bytes(packed[path]) != Path(root, name).read_bytes():
+                return False
+    return True
+
+
+def seed_dirs_under(path):
+    """The path itself if it is a seed directory, else its oc3-* subdirectories."""
+    path = Path(path)
+    if SEED_DIR_PATTERN.match(path.name):
+        return [path]
+    return sorted(p for p in path.iterdir() if p.is_dir() and SEED_DIR_PATTERN.match(p.name))
+
+
+def cmd_pack(args):
+    timer = start_profiling("etna_pack", args)
+    seed_dirs = [d for path in args.paths for d in seed_dirs_under(path)]
+    if not seed_dirs:
+        print("Error: No oc3-<system>-<seed> directories found")
+        return 1
+
+    total = 0
+    for seed_dir in seed_dirs:
+        with phase("file_io"):
+            pack_path, added = pack_dir(seed_dir, append=args.append)
+        total += added
+        if args.remove:
+            with phase("file_io"):
+                matches = verify(pack_path, seed_dir)
+            if not matches:
+                print(f"Error: {pack_path} does not match {seed_dir}, not removing it")
+                return 1
+            shutil.rmtree(seed_dir)
+        print(f"Packed {added} files into {pack_path}{' (directory removed)' if args.remove else ''}")
+
+    print(f"Packed {total} files from {len(seed_dirs)} seed directories")
+    timer.finish(seed_dirs[0].parent)
+    return 0
+
+
+def cmd_unpack(args):
+    timer = start_profiling("etna_unpack", args)
+    for pack_path in args.packs:
+        with phase("file_io"):
+            output_dir = unpack(pack_path, args.output_dir and Path(args.output_dir) / Path(pack_path).stem)
+        print(f"Unpacked {pack_path} into {output_dir}")
+    timer.finish(output_dir.parent)
+    return 0
+
+
+def cmd_list(args):
+    reader = PackReader(args.pack)
+    print(f"{reader.index['system']} seed {reader.index['seed']}: {len(reader.entries)} files")
+    for entry in reader.entries:
+        print(f"  {entry['offset']:>10} {entry['length']:>6}  {entry['path']}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack and unpack ETNA seed directories.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pack = subparsers.add_parser("pack", help="Pack seed directories into .pack files")
+    pack.add_argument("paths", nargs="+", help="Seed directories or experiments directories holding them")
+    pack.add_argument(
+        "--append",
+        action="store_true",
+        help="Add only files missing from an existing pack"
+    )
+    pack.add_argument(
+        "--remove",
+        action="store_true",
+        help="Delete each seed directory once its pack has been verified"
+    )
+    add_profiling_arguments(pack)
+    pack.set_defaults(func=cmd_pack)
+
+    unpack_parser = subparsers.add_parser("unpack", help="Restore seed directories from .pack files")
+    unpack_parser.add_argument("packs", nargs="+", help="Pack files")
+    unpack_parser.add_argument(
+        "--output-dir",
+        help="Directory to restore into (default: next to each pack)"
+    )
+    add_profiling_arguments(unpack_parser)
+    unpack_parser.set_defaults(func=cmd_unpack)
+
+    list_parser = subparsers.add_parser("list", help="Show the index of a pack")
+    list_parser.add_argument("pack", help="Pack file")
+    list_parser.set_defaults(func=cmd_list)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Self-describing partial ETNA results for sweeps split across machines.
+
+`export` parses one machine's experiments tree into a partial result: the raw
+records plus the seeds, strategies, mutants, properties and trial files it
+covers, and a SHA-256 checksum of the records. `merge` combines any number of
+partials, verifies their checksums, reports (mutant, prop, strategy, seed)
+cells that appear in more than one partial or in none, and writes the same
+{system}_results.json that parse_etna_data.py would produce from the combined
+tree.
+
+Usage:
+    python etna_partials.py export --system BST --input-dir 4.2_data/fresh/bst-experiments -o machine1.json
+    python etna_partials.py merge --source fresh machine1.json machine2.json
+    python etna_partials.py merge --strict -o bst_results.json machine*.json
+"""
+
+import sys
+import json
+import socket
+import hashlib
+import argparse
+from pathlib import Path
+from collections import defaultdict
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.profiling import add_profiling_arguments, phase, start_profiling
+from parse_etna_data import STRATEGY_ORDER, scan_results, sort_results
+
+PARTIAL_VERSION = 1
+
+# Number of overlapping / missing cells listed before truncating the report
+MAX_LISTED = 10
+
+
+def records_checksum(system_name, records):
+    """SHA-256 over a canonical JSON encoding of the system and its records."""
+    payload = json.dumps({"system": system_name, "records": records}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def export_partial(system_name, input_dir):
+    """Parse an experiments tree into a partial result dict."""
+    results, seeds, files = scan_results(system_name, input_dir)
+    records = {
+        mutant: {prop: dict(sorted(values.items())) for prop, values in sorted(properties.items())}
+        for mutant, properties in sorted(results.items())
+    }
+    strategies = {key.rsplit("_", 1)[0] for properties in records.values()
+                  for values in properties.values() for key in values}
+    return {
+        "version": PARTIAL_VERSION,
+        "system": system_name,
+        "host": socket.gethostname(),
+        "input_dir": str(input_dir),
+        "seeds": sorted(seeds, key=int),
+        "strategies": [s for s in STRATEGY_ORDER if s in strategies],
+        "mutants": sorted(records),
+        "properties": sorted({prop for properties in records.values() for prop in properties}),
+        "files": sorted(files),
+        "cells": sum(len(values) for properties in records.values() for values in properties.values()),
+        "checksum": records_checksum(system_name, records),
+        "records": records,
+    }
+
+
+def load_partial(path):
+    """Load a partial and verify its checksum; raises ValueError if it does not match."""
+    with open(path) as f:
+        partial = json.load(f)
+    if partial.get("version") != PARTIAL_VERSION:
+        raise ValueError(f"{path}: unsupported partial version {partial.get('version')}")
+    if records_checksum(partial["system"], partial["records"]) != partial["checksum"]:
+        raise ValueError(f"{path}: checksum mismatch, the partial was modified or truncated")
+    return partial
+
+
+def merge_partials(partials):
+    """
+    Combine partials into one set of raw records.
+
+    Returns (records, seeds, overlaps, missing): overlaps maps each cell
+    (mutant, prop, strategy, seed) found in more than one partial to the list
+    of (partial index, duration); missing lists cells that are absent from all
+    partials although their mutant/property, strategy and seed were covered.
+    """
+    systems = {p["system"] for p in partials}
+    if len(systems) != 1:
+        raise ValueError(f"Partials cover different systems: {sorted(systems)}")
+
+    records = defaultdict(lambda: defaultdict(dict))
+    sources = defaultdict(list)
+    seeds, strategies = set(), set()
+    for index, partial in enumerate(partials):
+        seeds.update(partial["seeds"])
+        strategies.update(partial["strategies"])
+        for mutant, properties in partial["records"].items():
+            for prop, values in properties.items():
+                for key, duration in values.items():
+                    sources[(mutant, prop, key)].append((index, duration))
+                    records[mutant][prop][key] = duration
+
+    overlaps = {}
+    for (mutant, prop, key), found in sources.items():
+        if len(found) > 1:
+            strategy, seed = key.rsplit("_", 1)
+            overlaps[(mutant, prop, strategy, seed)] = found
+
+    missing = []
+    for mutant, properties in sorted(records.items()):
+        for prop, values in sorted(properties.items()):
+            for strategy in STRATEGY_ORDER:
+                if strategy not in strategies:
+                    continue
+                for seed in sorted(seeds, key=int):
+                    if f"{strategy}_{seed}" not in values:
+                        missing.append((mutant, prop, strategy, seed))
+
+    return records, sorted(seeds, key=int), overlaps, missing
+
+
+def cmd_export(args):
+    timer = start_profiling(f"etna_partials_export_{args.system.lower()}", args)
+    input_dir = Path(args.input_dir) if args.input_dir else \
+        EVAL_DIR / "4.2_data" / args.source / f"{args.system.lower()}-experiments"
+    if not input_dir.exists():
+        print(f"Error: Input directory not found: {input_dir}")
+        return 1
+
+    partial = export_partial(args.system, input_dir)
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with phase("serialization"):
+        with open(output_path, "w") as f:
+            json.dump(partial, f, indent=2)
+
+    print(f"Exported {partial['cells']} cells from {len(partial['files'])} files "
+          f"({len(partial['seeds'])} seeds, {len(partial['strategies'])} strategies) to {output_path}")
+    print(f"Checksum: {partial['checksum']}")
+    timer.finish(output_path.parent)
+    return 0
+
+
+def cmd_merge(args):
+    timer = start_profiling("etna_partials_merge", args)
+    try:
+        with phase("deserialization"):
+            partials = [load_partial(path) for path in args.partials]
+        with phase("aggregation"):
+            records, seeds, overlaps, missing = merge_partials(partials)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    system_name = partials[0]["system"]
+    print(f"Merging {len(partials)} {system_name} partials covering {len(seeds)} seeds")
+
+    conflicts = {cell: found for cell, found in overlaps.items() if len({d for _, d in found}) > 1}
+    if overlaps:
+        print(f"{len(overlaps)} overlapping cells ({len(conflicts)} with conflicting durations):")
+        for cell, found in list(overlaps.items())[:MAX_LISTED]:
+            where = ", ".join(f"{args.partials[i]}={d}" for i, d in found)
+            print(f"  {','.join(cell)}: {where}")
+    if missing:
+        print(f"{len(missing)} missing cells:")
+        for cell in missing[:MAX_LISTED]:
+            print(f"  {','.join(cell)}")
+
+    if conflicts or (overlaps and not args.allow_overlap):
+        print("Error: Overlapping cells found (pass --allow-overlap to accept identical duplicates)")
+        return 1
+    if missing and args.strict:
+        print("Error: Missing cells found (--strict)")
+        return 1
+
+    with phase("aggregation"):
+        merged = sort_results(records, seeds)
+
+    if args.output:
+        output_file = Path(args.output)
+    else:
+        output_file = EVAL_DIR / "parsed_4.2_data" / args.source / "parsed" / f"{system_name.lower()}_results.json"
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with phase("serialization"):
+        with open(output_file, "w") as f:
+            json.dump(merged, f, indent=2)
+
+    print(f"Results saved to {output_file}")
+    print(f"Parsed {len(merged)} mutants")
+    timer.finish(output_file.parent)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export and merge partial ETNA results.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export = subparsers.add_parser("export", help="Parse an experiments tree into a partial result")
+    export.add_argument(
+        "--system",
+        choices=["BST", "STLC"],
+        required=True,
+        help="Benchmark system to parse"
+    )
+    export.add_argument(
+        "--source",
+        choices=["precomputed", "fresh"],
+        default="fresh",
+        help="Data source used when --input-dir is not given (default: fresh)"
+    )
+    export.add_argument(
+        "--input-dir",
+        help="Experiments directory (default: 4.2_data/{source}/{system}-experiments)"
+    )
+    export.add_argument(
+        "-o", "--output",
+        required=True,
+        help="Output partial file"
+    )
+    add_profiling_arguments(export)
+    export.set_defaults(func=cmd_export)
+
+    merge = subparsers.add_parser("merge", help="Merge partial results into a parsed results file")
+    merge.add_argument("partials", nargs="+", help="Partial result files")
+    merge.add_argument(
+        "--source",
+        choices=["precomputed", "fresh"],
+        default="fresh",
+        help="Data source to write to when -o is not given (default: fresh)"
+    )
+    merge.add_argument(
+        "-o", "--output",
+        help="Output file path (default: parsed_4.2_data/{source}/parsed/{system}_results.json)"
+    )
+    merge.add_argument(
+        "--allow-overlap",
+        action="store_true",
+        help="Accept cells present in several partials when their durations agree"
+    )
+    merge.add_argument(
+        "--strict",
+        action="store_true",
+        help="Fail if any covered cell is missing from every partial"
+    )
+    add_profiling_arguments(merge)
+    merge.set_defaults(func=cmd_merge)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Parser for counter dumps from instrumented OCaml generator runs.
+
+Each benchmark group reports how many monadic binds and random draws one
+generation performs. Counters are read from 4.1_data_ocaml/{source}/counters.txt
+and/or counters.csv:
+
+    # counters.txt: <group>[:n=<size>] binds=<int> draws=<int>
+    bst_bespoke:n=100 binds=2 draws=353
+    stlc_bespoke binds=670 draws=211
+
+    # counters.csv
+    group,size,binds,draws
+    bst_bespoke,100,2,353
+    stlc_bespoke,,670,211
+
+An entry without a size applies to every size of that group. The output,
+{group: {size or "all": {"binds": n, "draws": n}}}, is written to
+parsed_4.1_data_ocaml/{source}/counters/counters.json and used by f15.py and
+analysis/counter_regression.py.
+
+Usage:
+    python parse_counters.py --source precomputed
+    python parse_counters.py --source fresh
+"""
+
+import re
+import sys
+import csv
+import json
+import argparse
+from pathlib import Path
+from collections import defaultdict
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.profiling import add_profiling_arguments, phase, start_profiling
+
+ALL_SIZES = "all"
+
+COUNTERS = ["binds", "draws"]
+
+
+def parse_counters_text(lines):
+    """Parse 'group[:n=size] binds=N draws=N' lines; blank lines and # comments are ignored."""
+    result = defaultdict(dict)
+    for line in lines:
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        name, *fields = line.split()
+        match = re.match(r'([A-Za-z0-9_]+)(?::n=(\d+))?$', name)
+        if not match:
+            print(f"Skipping malformed counter line: {line}")
+            continue
+        group, size = match.group(1), match.group(2)
+        values = dict(field.split('=', 1) for field in fields if '=' in field)
+        try:
+            result[group][int(size) if size else ALL_SIZES] = {key: int(values[key]) for key in COUNTERS}
+        except (KeyError, ValueError):
+            print(f"Skipping counter line without integer binds/draws: {line}")
+    return result
+
+
+def parse_counters_csv(lines):
+    """Parse a 'group,size,binds,draws' CSV; an empty size applies to all sizes."""
+    result = defaultdict(dict)
+    for row in csv.DictReader(lines):
+        size = row.get('size', '').strip()
+        try:
+            result[row['group']][int(size) if size else ALL_SIZES] = {key: int(row[key]) for key in COUNTERS}
+        except (KeyError, ValueError):
+            print(f"Skipping malformed counter row: {row}")
+    return result
+
+
+def parse_counter_files(input_dir):
+    """Read counters.txt and counters.csv from input_dir; CSV entries win on conflicts."""
+    counters = defaultdict(dict)
+    for filename, parse in (('counters.txt', parse_counters_text), ('counters.csv', parse_counters_csv)):
+        path = Path(input_dir) / filename
+        if not path.exists():
+            continue
+        with phase("file_io"):
+            with path.open() as f:
+                lines = f.readlines()
+        with phase("regex_parsing"):
+            for group, by_size in parse(lines).items():
+                counters[group].update(by_size)
+    return counters
+
+
+def counters_at(counters, group, size=None):
+    """Counters of `group` at `size`, falling back to the size-independent entry."""
+    by_size = counters.get(group, {})
+    if size is not None and str(size) in by_size:
+        return by_size[str(size)]
+    return by_size.get(ALL_SIZES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse generator counter dumps into JSON format.")
+    parser.add_argument(
+        "--source",
+        choices=["precomputed", "fresh"],
+        required=True,
+        help="Data source: 'precomputed' or 'fresh'"
+    )
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    timer = start_profiling("parse_counters", args)
+
+    input_dir = EVAL_DIR / "4.1_data_ocaml" / args.source
+    output_dir = EVAL_DIR / "parsed_4.1_data_ocaml" / args.source / "counters"
+
+    counters = parse_counter_files(input_dir)
+    if not counters:
+        print(f"Error: No counters.txt or counters.csv found in {input_dir}")
+        return 1
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_file = output_dir / "counters.json"
+    with phase("serialization"):
+        with output_file.open('w') as f:
+            json.dump({
+                group: {str(size): values for size, values in by_size.items()}
+                for group, by_size in sorted(counters.items())
+            }, f, indent=4)
+
+    print(f"Parsed counters for {len(counters)} groups")
+    for group in sorted(counters):
+        print(f"  - {group}: {len(counters[group])} entries")
+    print(f"Wrote {output_file}")
+    timer.finish(output_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -2,6 +2,9 @@
 """
 Parser for ETNA benchmark results (BST and STLC mutation testing).
 
+The sweep.json tag that runners/etna_scheduler.py leaves in the experiments
+directory is copied to parsed_4.2_data/{source}/meta/{system}_sweep.json.
+
 Usage:
     python parse_etna_data.py --source precomputed --system BST
     python parse_etna_data.py --source precomputed --system STLC
@@ -10,6 +13,7 @@ Usage:
 
 import os
 import re
+import sys
 import json
 import argparse
 from pathlib import Path
@@ -18,68 +22,188 @@ from collections import defaultdict
 # Base directory for eval data
 EVAL_DIR = Path(__file__).parent.parent
 
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.benchmarks import TIMEOUT, copy_sweep_tag
+from common.profiling import add_profiling_arguments, phase, start_profiling
+from etna_pack import PackReader
+
+
+STRATEGY_ORDER = [
+    "baseType", "baseTypestaged", "baseTypestagedc", "baseTypestagedcsr",
+    "baseBespoke", "baseBespokestaged", "baseBespokestagedc", "baseBespokestagedcsr",
+    "baseBespokesingle", "baseBespokesinglestaged", "baseBespokesinglestagedc", "baseBespokesinglestagedcsr"
+]
+
 
 def parse_results(system_name, base_dir):
-    strategy_order = [
-        "baseType", "baseTypestaged", "baseTypestagedc", "baseTypestagedcsr",
-        "baseBespoke", "baseBespokestaged", "baseBespokestagedc", "baseBespokestagedcsr",
-        "baseBespokesingle", "baseBespokesinglestaged", "baseBespokesinglestagedc", "baseBespokesinglestagedcsr"
-    ]
+    results, seeds, _ = scan_results(system_name, base_dir)
+    with phase("aggregation"):
+        return sort_results(results, seeds)
+
 
+def find_seed_dirs(system_name, base_dir):
+    """
+    Return ([(seed, path)], packs) for the seeds under base_dir, where packs
+    maps the seeds stored as .pack archives to their path.
+
+    Seeds may be stored as oc3-<system>-<seed>/ directories or as
+    oc3-<system>-<seed>.pack archives (see etna_pack.py); a pack takes the
+    place of a directory with the same seed.
+    """
     seed_dirs = []
-    for item in os.listdir(base_dir):
-        if os.path.isdir(os.path.join(base_dir, item)) and item.startswith(f"oc3-{system_name.lower()}-"):
-            seed_match = re.search(rf"oc3-{system_name.lower()}-(\d+)", item)
-            if seed_match:
-                seed = seed_match.group(1)
-                seed_dirs.append((seed, os.path.join(base_dir, item)))
+    packs = {}
+    with phase("directory_scan"):
+        for item in os.listdir(base_dir):
+            if not item.startswith(f"oc3-{system_name.lower()}-"):
+                continue
+            path = os.path.join(base_dir, item)
+            if os.path.isdir(path):
+                seed_match = re.search(rf"oc3-{system_name.lower()}-(\d+)", item)
+                if seed_match:
+                    seed = seed_match.group(1)
+                    seed_dirs.append((seed, path))
+            else:
+                pack_match = re.fullmatch(rf"oc3-{system_name.lower()}-(\d+)\.pack", item)
+                if pack_match:
+                    packs[pack_match.group(1)] = path
+
+        seed_dirs = [(seed, path) for seed, path in seed_dirs if seed not in packs]
+        seed_dirs += [(seed, path) for seed, path in packs.items()]
+    return seed_dirs, packs
+
+
+def list_tasks(system_name, base_dir, seeds=None):
+    """
+    Return {seed: {(mutant, prop)}} from the trial file names under base_dir,
+    without reading any trial, optionally only for the given seeds.
+    """
+    seed_dirs, packs = find_seed_dirs(system_name, base_dir)
+    tasks = {}
+    with phase("directory_scan"):
+        for seed, seed_dir in seed_dirs:
+            if seeds is not None and seed not in seeds:
+                continue
+            if seed in packs:
+                names = [os.path.basename(entry["path"]) for entry in PackReader(seed_dir).entries]
+            else:
+                names = [file for _, _, files in os.walk(seed_dir) for file in files]
+            keys = (_trial_key(system_name, name) for name in names)
+            tasks[seed] = {(mutant, prop) for strategy, mutant, prop in keys if strategy is not None}
+    return tasks
+
+
+def scan_results(system_name, base_dir, seeds=None, keep=None):
+    """
+    Read every trial file under base_dir (see find_seed_dirs for the layout).
+
+    `seeds` restricts the scan to those seeds, and `keep(seed, mutant, prop)`
+    to the tasks it accepts; skipped files are not read.
+
+    Returns (results, seeds, files): the raw {mutant: {prop: {strategy_seed: duration}}}
+    records without placeholders, the seeds of all seed directories scanned, and the
+    paths (relative to base_dir) of the files that produced a record.
+    """
+    seed_dirs, packs = find_seed_dirs(system_name, base_dir)
+    if seeds is not None:
+        seed_dirs = [(seed, path) for seed, path in seed_dirs if seed in seeds]
 
     results = defaultdict(lambda: defaultdict(lambda: {}))
+    files_read = []
+
+    def record(seed, file, relpath, read):
+        strategy, mutant, property_name = _trial_key(system_name, file)
+        if strategy is None or (keep is not None and not keep(seed, mutant, property_name)):
+            return
+        try:
+            with phase("file_io"):
+                content = read()
+
+            with phase("regex_parsing"):
+                duration = parse_trial(content)
+
+            if duration is not None:
+                strategy_seed = f"{strategy}_{seed}"
+                results[mutant][property_name][strategy_seed] = duration
+                files_read.append(relpath)
+
+        except Exception as e:
+            print(f"Error processing file {file}: {e}")
 
     for seed, seed_dir in seed_dirs:
-        for root, _, files in os.walk(seed_dir):
+        if seed in packs:
+            with phase("file_io"):
+                reader = PackReader(seed_dir)
+            dirname = os.path.basename(seed_dir)[:-len(".pack")]
+            for entry in reader.entries:
+                record(seed, os.path.basename(entry["path"]), os.path.join(dirname, entry["path"]),
+                       lambda entry=entry: reader.read(entry))
+            continue
+
+        with phase("directory_scan"):
+            walked = list(os.walk(seed_dir))
+        for root, _, files in walked:
             for file in files:
-                parts = file.split(",")
-                if len(parts) >= 3 and parts[0] == system_name:
-                    strategy = parts[1]
-                    mutant = parts[2]
-
-                    prop_match = re.search(r"prop_([^\.]+)\.txt", parts[-1])
-                    if prop_match:
-                        property_name = f"prop_{prop_match.group(1)}"
-
-                        try:
-                            with open(os.path.join(root, file), 'r') as f:
-                                content = f.read()
-
-                                if "[exit timeout]" in content:
-                                    duration = 60.0
-                                else:
-                                    duration_match = re.search(r"duration (\d+)|(\d+\.\d+) duration", content)
-                                    if duration_match:
-                                        duration = duration_match.group(1) or duration_match.group(2)
-                                        if not duration:
-                                            alt_match = re.search(r"\[exit ok, (\d+\.\d+) duration", content)
-                                            if alt_match:
-                                                duration = alt_match.group(1)
-                                        duration = float(duration) if duration else None
-                                    else:
-                                        duration = None
-
-                                if duration is not None:
-                                    strategy_seed = f"{strategy}_{seed}"
-                                    results[mutant][property_name][strategy_seed] = duration
-
-                        except Exception as e:
-                            print(f"Error processing file {file}: {e}")
+                path = os.path.join(root, file)
+                record(seed, file, os.path.relpath(path, base_dir), lambda path=path: _read_file(path))
+
+    return results, [seed for seed, _ in seed_dirs], files_read
+
+
+def _trial_key(system_name, file):
+    """(strategy, mutant, property) for a trial file of system_name, else Nones."""
+    parts = file.split(",")
+    if len(parts) >= 3 and parts[0] == system_name:
+        prop_match = re.search(r"prop_([^\.]+)\.txt", parts[-1])
+        if prop_match:
+            return parts[1], parts[2], f"prop_{prop_match.group(1)}"
+    return None, None, None
+
 
+def _read_file(path):
+    with open(path, 'r') as f:
+        return f.read()
+
+
+def trial_status(content):
+    """
+    Return (status, duration) for one trial's output: ('timeout', None) for
+    an `[exit timeout]` line, ('ok', seconds) for a recorded duration and
+    (None, None) when the output holds no result.
+    """
+    if "[exit timeout]" in content:
+        return "timeout", None
+    duration_match = re.search(r"duration (\d+)|(\d+\.\d+) duration", content)
+    if not duration_match:
+        return None, None
+    duration = duration_match.group(1) or duration_match.group(2)
+    if not duration:
+        alt_match = re.search(r"\[exit ok, (\d+\.\d+) duration", content)
+        if alt_match:
+            duration = alt_match.group(1)
+    if not duration:
+        return None, None
+    return "ok", float(duration)
+
+
+def parse_trial(content):
+    """Return the duration recorded in one trial file, TIMEOUT (60.0) for a timeout, or None."""
+    status, duration = trial_status(content)
+    return TIMEOUT if status == "timeout" else duration
+
+
+def sort_results(results, seeds):
+    """
+    Order raw records by mutant, property, STRATEGY_ORDER and numeric seed,
+    filling every (strategy, seed) combination that has no record with None.
+    """
     sorted_results = {}
     for mutant in sorted(results.keys()):
         sorted_results[mutant] = {}
         for prop in sorted(results[mutant].keys()):
             sorted_results[mutant][prop] = {}
-            for strategy in strategy_order:
-                for seed, _ in sorted(seed_dirs, key=lambda x: int(x[0])):
+            for strategy in STRATEGY_ORDER:
+                for seed in sorted(seeds, key=int):
                     strategy_seed = f"{strategy}_{seed}"
                     if strategy_seed in results[mutant][prop]:
                         sorted_results[mutant][prop][strategy_seed] = results[mutant][prop][strategy_seed]
@@ -102,7 +226,9 @@ def main():
         required=True,
         help="Benchmark system to parse"
     )
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    timer = start_profiling(f"parse_etna_data_{args.system.lower()}", args)
 
     # Determine input and output paths based on source
     # Data is organized in system-specific subdirectories
@@ -120,12 +246,17 @@ def main():
     parsed_results = parse_results(args.system, input_dir)
 
     output_file = output_dir / f"{args.system.lower()}_results.json"
-    with open(output_file, "w") as f:
-        json.dump(parsed_results, f, indent=2)
+    with phase("serialization"):
+        with open(output_file, "w") as f:
+            json.dump(parsed_results, f, indent=2)
 
     print(f"Results saved to {output_file}")
     print(f"Parsed {len(parsed_results)} mutants")
 
+    # Carry the scheduler's concurrency tag over to the parsed results
+    copy_sweep_tag(input_dir, output_dir.parent, f"{args.system.lower()}_sweep.json")
+
+    timer.finish(output_dir)
     return 0
 
 
@@ -1,22 +1,40 @@
 #!/usr/bin/env python3
 """
 Parser for OCaml benchmark output files.
-Generates JSON files for f14.py plotting and a separate compilation times file.
+Generates JSON files for f14.py plotting, a separate compilation times file and
+a normalized long-format table (see common/results_schema.py).
+
+Each group is read from results_<name>.sexp (Core_bench -sexp analysis
+results), results_<name>.csv (Name and Time/Run columns) or the
+results_<name>.txt box table, whichever is found first. --variant parses
+an environment variant of a runners/generator_sweep.py run instead; the
+run's sweep.json is copied to meta/sweep.json of the parsed results.
 
 Usage:
     python parse_results_ocaml.py --source precomputed
     python parse_results_ocaml.py --source fresh
+    python parse_results_ocaml.py --source fresh --format table
+    python parse_results_ocaml.py --source fresh --check
+    python parse_results_ocaml.py --source fresh --variant minor-1M
 """
 
 import argparse
+import csv
 import json
 import re
+import sys
 from pathlib import Path
 from collections import defaultdict
 
 # Base directory for eval data
 EVAL_DIR = Path(__file__).parent.parent
 
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.benchmarks import copy_sweep_tag
+from common.profiling import add_profiling_arguments, phase, start_profiling
+from common.results_schema import long_rows, write_long_table
+
 # Mapping of result files to benchmark groups
 RESULT_FILES = {
     'results_bst.txt': 'bst_bespoke',
@@ -28,15 +46,37 @@ RESULT_FILES = {
 }
 
 
+# Core_bench time units in nanoseconds
+TIME_UNITS = {
+    'ns': 1.0,
+    'us': 1e3,
+    'µs': 1e3,
+    'ms': 1e6,
+    's': 1e9,
+}
+
+# Input formats, in the order `--format auto` prefers them
+INPUT_FORMATS = ['sexp', 'csv', 'table']
+FORMAT_SUFFIXES = {'sexp': '.sexp', 'csv': '.csv', 'table': '.txt'}
+
+
 def parse_time_ns(s):
-    """Convert a time string like '1_234.56ns' to a float."""
+    """
+    Convert a Core_bench time string to nanoseconds.
+
+    Accepts ns/us/µs/ms/s suffixes, '_' digit separators and scientific
+    notation ('1_234.56ns', '3.2us', '1.5e3ns'); a bare number is taken as ns.
+    """
     if not s or s.strip() == '':
         return None
-    s = s.replace('_', '').replace('ns', '').strip()
+    match = re.fullmatch(r'([-+]?[\d_]*\.?[\d_]+(?:[eE][-+]?\d+)?)\s*(ns|us|µs|ms|s)?', s.strip())
+    if not match:
+        return None
     try:
-        return float(s)
+        value = float(match.group(1).replace('_', ''))
     except ValueError:
         return None
+    return value * TIME_UNITS[match.group(2) or 'ns']
 
 
 def parse_benchmark_name(name, expected_group):
@@ -161,16 +201,96 @@ def parse_compilation_times(lines):
     return times
 
 
+def parse_quota(lines):
+    """
+    Return the per-benchmark Core_bench quota in seconds from the
+    'Estimated testing time 1m (12 benchmarks x 5s)' header, or None.
+    """
+    units = {'ms': 1e-3, 's': 1.0, 'm': 60.0}
+    for line in lines:
+        match = re.search(r'benchmarks x ([\d.]+)(ms|s|m)\)', line)
+        if match:
+            return float(match.group(1)) * units[match.group(2)]
+    return None
+
+
+def parse_table_ci(lines, expected_group):
+    """
+    Return {variant: {size: relative_error}} from a Core_bench '95ci' column
+    (printed with -ci-absolute), e.g. '-0.36% +0.40%' -> 0.004.
+    Empty when the table has no such column.
+    """
+    result = defaultdict(dict)
+    ci_index = None
+
+    for line in lines:
+        if not line.startswith('│ '):
+            continue
+
+        parts = [col.strip() for col in line.strip('│ \n').split('│')]
+        if parts[0] == 'Name':
+            ci_index = next((i for i, col in enumerate(parts) if '95ci' in col), None)
+            continue
+        if ci_index is None or ci_index >= len(parts):
+            continue
+
+        group, variant, size = parse_benchmark_name(parts[0], expected_group)
+        if group != expected_group or variant is None:
+            continue
+
+        match = re.match(r'([+-]?[\d.]+)%\s+([+-]?[\d.]+)%', parts[ci_index])
+        if match:
+            result[variant][size] = max(abs(float(match.group(1))), abs(float(match.group(2)))) / 100
+
+    return dict(result)
+
+
 def parse_benchmark_file(file_path, expected_group):
-    """Parse a single benchmark results file."""
+    """
+    Parse a single benchmark results file.
+
+    The format follows the suffix: .txt box tables, .csv or .sexp (see
+    _parse_csv_lines and _parse_sexp_text). Compilation times are only
+    present in .txt files.
+    """
     if not file_path.exists():
         print(f"Warning: File not found: {file_path}")
         return {}, {}
     
-    with file_path.open() as f:
-        lines = f.readlines()
-    
-    # Parse benchmark data
+    with phase("file_io"):
+        with file_path.open() as f:
+            lines = f.readlines()
+
+    with phase("regex_parsing"):
+        if file_path.suffix == '.sexp':
+            result = _parse_sexp_text(''.join(lines), expected_group)
+        elif file_path.suffix == '.csv':
+            result = _parse_csv_lines(lines, expected_group)
+        else:
+            result = _parse_table_lines(lines, expected_group)
+
+        # Parse compilation times
+        compilation_times = parse_compilation_times(lines)
+
+    return dict(result), compilation_times
+
+
+def find_result_file(input_dir, filename, input_format='auto'):
+    """
+    Return the path of a group's results in the requested format, or for
+    'auto' the first of .sexp, .csv and .txt that exists.
+    """
+    stem = Path(filename).stem
+    formats = INPUT_FORMATS if input_format == 'auto' else [input_format]
+    for fmt in formats:
+        path = input_dir / (stem + FORMAT_SUFFIXES[fmt])
+        if path.exists():
+            return path
+    return input_dir / (stem + FORMAT_SUFFIXES[formats[-1]])
+
+
+def _parse_table_lines(lines, expected_group):
+    """Parse Core_bench box-table rows into {variant: {size: time_ns}}."""
     result = defaultdict(dict)
     
     for line in lines:
@@ -187,24 +307,132 @@ def parse_benchmark_file(file_path, expected_group):
         if name == 'Name' or 'Time' in name:
             continue
         
-        group, variant, size = parse_benchmark_name(name, expected_group)
-        if not group or not variant or size is None:
+        # Only results from the expected group are kept
+        _add_result(result, name, parse_time_ns(time_str), expected_group)
+
+    return result
+
+
+def _add_result(result, name, time_val, expected_group):
+    group, variant, size = parse_benchmark_name(name, expected_group)
+    if group != expected_group or not variant or size is None or time_val is None:
+        return
+    result[variant][size] = time_val
+
+
+def _parse_csv_lines(lines, expected_group):
+    """
+    Parse CSV results with a 'Name' column and a 'Time/Run' column (a time
+    string with unit) or a 'time_ns' column into {variant: {size: time_ns}}.
+    """
+    result = defaultdict(dict)
+    for row in csv.DictReader(lines):
+        name = (row.get('Name') or row.get('name') or '').strip()
+        if 'time_ns' in row:
+            time_val = parse_time_ns(row['time_ns'])
+        else:
+            time_val = parse_time_ns(row.get('Time/Run', ''))
+        _add_result(result, name, time_val, expected_group)
+    return result
+
+
+def _read_sexp(text):
+    """Read every top-level s-expression in text into nested lists of strings."""
+    tokens = re.findall(r'\(|\)|"(?:[^"\\]|\\.)*"|[^\s()"]+', text)
+    stack = [[]]
+    for token in tokens:
+        if token == '(':
+            stack.append([])
+        elif token == ')':
+            if len(stack) == 1:
+                raise ValueError("Unbalanced ')' in sexp input")
+            done = stack.pop()
+            stack[-1].append(done)
+        elif token.startswith('"'):
+            stack[-1].append(token[1:-1].encode().decode('unicode_escape'))
+        else:
+            stack[-1].append(token)
+    if len(stack) != 1:
+        raise ValueError("Unbalanced '(' in sexp input")
+    return stack[0]
+
+
+def _sexp_record(sexp):
+    """Turn a ((key value) ...) list into a dict, or None if it is not a record."""
+    if not isinstance(sexp, list) or not sexp:
+        return None
+    if not all(isinstance(f, list) and f and isinstance(f[0], str) for f in sexp):
+        return None
+    return {f[0]: (f[1] if len(f) == 2 else f[1:]) for f in sexp}
+
+
+def _sexp_time_per_run(record):
+    """
+    Nanoseconds per run from a Core_bench analysis result: the estimate of
+    the 'Runs' coefficient of the regression whose responder is the time.
+    """
+    results = record.get('results')
+    regressions = results if isinstance(results, list) else []
+    for regression in regressions:
+        fields = _sexp_record(regression) or {}
+        if str(fields.get('responder', '')).lower() not in ('time', 'nanos'):
             continue
-        
-        # Only keep results from the expected group
-        if group != expected_group:
+        for coefficient in fields.get('coefficients') or []:
+            coeff = _sexp_record(coefficient) or {}
+            if coeff.get('predictor') == 'Runs' and isinstance(coeff.get('estimate'), str):
+                return parse_time_ns(coeff['estimate'])
+    return None
+
+
+def _parse_sexp_text(text, expected_group):
+    """
+    Parse Core_bench analysis results printed with -sexp into
+    {variant: {size: time_ns}}. Every record with a 'name' field and a
+    time regression is used, wherever it is nested.
+    """
+    result = defaultdict(dict)
+
+    def walk(sexp):
+        record = _sexp_record(sexp)
+        if record and isinstance(record.get('name'), str):
+            _add_result(result, record['name'], _sexp_time_per_run(record), expected_group)
+            return
+        if isinstance(sexp, list):
+            for child in sexp:
+                walk(child)
+
+    walk(_read_sexp(text))
+    return result
+
+
+def check_formats(input_dir, tolerance=1e-3):
+    """
+    Parse every available format of each group and compare the results.
+    Returns 0 when all formats agree within the relative tolerance, else 1.
+    """
+    mismatches = 0
+    for filename, group in RESULT_FILES.items():
+        parsed = {}
+        for fmt in INPUT_FORMATS:
+            path = find_result_file(input_dir, filename, fmt)
+            if path.exists():
+                parsed[fmt] = parse_benchmark_file(path, group)[0]
+        if len(parsed) < 2:
+            print(f"{group}: only {', '.join(parsed) or 'no'} format available")
             continue
-        
-        time_val = parse_time_ns(time_str)
-        if time_val is not None:
-            if variant not in result:
-                result[variant] = {}
-            result[variant][size] = time_val
-    
-    # Parse compilation times
-    compilation_times = parse_compilation_times(lines)
-    
-    return dict(result), compilation_times
+
+        (ref_fmt, ref), *others = parsed.items()
+        for fmt, data in others:
+            cells = {(v, n) for v in ref for n in ref[v]} | {(v, n) for v in data for n in data[v]}
+            for variant, size in sorted(cells):
+                a, b = ref.get(variant, {}).get(size), data.get(variant, {}).get(size)
+                if a is None or b is None or abs(a - b) > tolerance * max(abs(a), abs(b)):
+                    print(f"{group}: {variant} n={size}: {ref_fmt}={a} {fmt}={b}")
+                    mismatches += 1
+        print(f"{group}: {', '.join(parsed)} checked")
+
+    print(f"{mismatches} disagreements")
+    return 1 if mismatches else 0
 
 
 def main():
@@ -217,23 +445,52 @@ def main():
         required=True,
         help="Data source: 'precomputed' or 'fresh'"
     )
+    parser.add_argument(
+        "--variant",
+        help="Parse variants/<name> of the source written by runners/generator_sweep.py"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["auto"] + INPUT_FORMATS,
+        default="auto",
+        help="Input format: Core_bench -sexp output, CSV or box tables (default: auto, first found of sexp/csv/table)"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Parse every available format of each group and report disagreements"
+    )
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    timer = start_profiling("parse_results_ocaml", args)
 
     # Determine input and output paths based on source
     input_dir = EVAL_DIR / "4.1_data_ocaml" / args.source
     output_dir = EVAL_DIR / "parsed_4.1_data_ocaml" / args.source
+    if args.variant:
+        input_dir = input_dir / "variants" / args.variant
+        output_dir = output_dir / "variants" / args.variant
     
     output_dir.mkdir(parents=True, exist_ok=True)
     
     all_results = {}
     all_compilation_times = {}
     
+    if args.check:
+        return check_formats(input_dir)
+
     # Parse each benchmark file
     for filename, group in RESULT_FILES.items():
-        input_path = input_dir / filename
-        print(f"Processing {filename}...")
+        input_path = find_result_file(input_dir, filename, args.format)
+        print(f"Processing {input_path.name}...")
         
         group_data, comp_times = parse_benchmark_file(input_path, group)
+
+        # Compilation times are only printed alongside the box tables
+        table_path = input_dir / filename
+        if input_path != table_path and table_path.exists():
+            with table_path.open() as f:
+                comp_times = parse_compilation_times(f.readlines())
         
         if group_data:
             all_results[group] = group_data
@@ -251,8 +508,9 @@ def main():
             }
             
             output_file = output_dir / f"{group}.json"
-            with output_file.open('w') as f:
-                json.dump(json_data, f, indent=4)
+            with phase("serialization"):
+                with output_file.open('w') as f:
+                    json.dump(json_data, f, indent=4)
             print(f"  Wrote {output_file}")
     
     # Write compilation times
@@ -265,10 +523,21 @@ def main():
                 f.write(f"{name}: {time_ms:.3f} ms\n")
         print(f"Wrote {comp_file}")
     
+    # Normalized long-format table shared with the Scala parser
+    # (Core_bench reports no error estimate in the box table)
+    if all_results:
+        with phase("serialization"):
+            long_file = write_long_table(long_rows("ocaml", all_results), output_dir)
+        print(f"Wrote {long_file}")
+
+    # Configuration of a generator_sweep.py run
+    copy_sweep_tag(input_dir, output_dir)
+
     print(f"\nParsed {len(all_results)} benchmark groups from {args.source} data")
     for group in sorted(all_results.keys()):
         print(f"  - {group}: {len(all_results[group])} variants")
-    
+
+    timer.finish(output_dir)
     return 0
 
 
@@ -1,27 +1,55 @@
 #!/usr/bin/env python3
 """
 Parser for results_scala.csv benchmark output (JMH CSV format).
-Generates JSON files for plotting, compatible with f16-style plots.
+Generates JSON files for plotting, compatible with f16-style plots, and a
+normalized long-format table (see common/results_schema.py).
+
+The Mode, Threads, Unit and `Param: *` columns are read, so runs with
+`-bm thrpt -t 1,2,4,8` and @Param sizes (e.g. `generateBstBespoke` with a
+`Param: size` column) parse as well as the avgt runs with the size in the
+method name. The f16 JSON and long table hold single-thread ns/op: avgt
+scores, or 1 / throughput for cells that were only run in thrpt mode.
+Throughput at every thread count is written to scaling/throughput.json
+(ops/s) for f20.py. --variant parses an environment variant of a
+runners/generator_sweep.py run instead; the run's sweep.json is copied to
+meta/sweep.json of the parsed results.
 
 Usage:
     python parse_results_scala_csv.py --source precomputed
     python parse_results_scala_csv.py --source fresh
+    python parse_results_scala_csv.py --source fresh --variant minor-1M
 """
 
 import argparse
 import csv
 import json
 import re
+import sys
 from pathlib import Path
 from collections import defaultdict
 
 # Base directory for eval data
 EVAL_DIR = Path(__file__).parent.parent
 
+sys.path.insert(0, str(EVAL_DIR))
+
+from common.benchmarks import copy_sweep_tag
+from common.profiling import add_profiling_arguments, phase, start_profiling
+from common.results_schema import long_rows, write_long_table
+
+
+# Conversion of JMH units to ns/op (avgt, ss, sample) and ops/s (thrpt)
+TIME_UNITS = {"ns/op": 1.0, "us/op": 1e3, "ms/op": 1e6, "s/op": 1e9}
+RATE_UNITS = {"ops/ns": 1e9, "ops/us": 1e6, "ops/ms": 1e3, "ops/s": 1.0, "ops/min": 1 / 60}
+
+# @Param names that hold the generator size
+SIZE_PARAMS = ["size", "n", "Size", "N"]
+
 
 def parse_benchmark_name(benchmark):
     """
     Parse benchmark names from CSV and return (group, variant, size).
+    The size is None when the name has no trailing number (@Param runs).
 
     Examples:
         'benchmark.GenBm.generateBoolListBespoke10' -> ('BoolListBespoke', 'SC', 10)
@@ -29,14 +57,15 @@ def parse_benchmark_name(benchmark):
         'benchmark.GenBm.generateBstBespoke100' -> ('BstBespoke', 'SC', 100)
         'benchmark.GenBm.generateBstType10' -> ('BstType', 'SC', 10)
         'benchmark.GenBm.generateTerm10' -> ('Term', 'SC', 10)
+        'benchmark.GenBm.generateBstBespokeStaged' -> ('BstBespoke', 'ScAllegro', None)
     """
     # Extract the method name part
-    match = re.match(r'benchmark\.GenBm\.generate(.+?)(\d+)$', benchmark)
+    match = re.match(r'benchmark\.GenBm\.generate(.+?)(\d+)?$', benchmark)
     if not match:
         return None, None, None
 
     name_part = match.group(1)
-    size = int(match.group(2))
+    size = int(match.group(2)) if match.group(2) else None
 
     # Check if it's a staged variant
     is_staged = name_part.endswith('Staged')
@@ -53,6 +82,140 @@ def parse_benchmark_name(benchmark):
     return group, variant, size
 
 
+def read_jmh_rows(input_path):
+    """
+    Read a JMH CSV file into a list of row dicts with keys group, variant,
+    size, mode, threads, unit, params, score, error (the 'Score Error (99.9%)'
+    column) and samples. Scores are in the row's unit. The size comes from the
+    method name or else a size @Param; the other @Params are kept in params.
+    @Params that take more than one value in the file are also folded into
+    the variant label (e.g. 'SC[impl=a]'), so that their cells stay apart.
+    Unknown benchmarks are reported and skipped.
+    """
+    rows = []
+
+    with phase("file_io"):
+        with Path(input_path).open() as f:
+            raw_rows = list(csv.DictReader(f))
+
+    with phase("regex_parsing"):
+        for row in raw_rows:
+            benchmark = row['Benchmark']
+
+            group, variant, size = parse_benchmark_name(benchmark)
+            params = {
+                key[len('Param: '):]: value
+                for key, value in row.items()
+                if key and key.startswith('Param: ') and value not in (None, '')
+            }
+            for name in SIZE_PARAMS:
+                if size is None and name in params:
+                    size = int(params.pop(name))
+            if not group or not variant or size is None:
+                print(f"Skipping unknown benchmark: {benchmark}")
+                continue
+
+            rows.append({
+                'group': group,
+                'variant': variant,
+                'size': size,
+                'mode': row.get('Mode', 'avgt'),
+                'threads': int(row.get('Threads') or 1),
+                'unit': row.get('Unit', 'ns/op'),
+                'params': params,
+                'score': float(row['Score']),
+                'error': _parse_float(row.get('Score Error (99.9%)')),
+                'samples': _parse_float(row.get('Samples')),
+            })
+
+    values = defaultdict(set)
+    for row in rows:
+        for name, value in row['params'].items():
+            values[name].add(value)
+    varying = sorted(name for name, seen in values.items()
+                     if len(seen) > 1 or any(name not in row['params'] for row in rows))
+    if varying:
+        print(f"Keeping @Param {', '.join(varying)} apart in the variant labels")
+        for row in rows:
+            label = ",".join(f"{name}={row['params'][name]}" for name in varying if name in row['params'])
+            if label:
+                row['variant'] = f"{row['variant']}[{label}]"
+
+    return rows
+
+
+def latency_rows(rows):
+    """
+    Single-thread rows with score and error converted to ns/op. Time modes
+    are converted by unit; thrpt rows become 1 / throughput, and are only
+    used for cells that have no time-mode row.
+    """
+    timed, inverted = {}, {}
+    for row in rows:
+        if row['threads'] != 1:
+            continue
+        key = (row['group'], row['variant'], row['size'])
+        if row['unit'] in TIME_UNITS:
+            scale = TIME_UNITS[row['unit']]
+            timed[key] = dict(row, unit='ns/op', score=row['score'] * scale,
+                              error=row['error'] * scale if row['error'] is not None else None)
+        elif row['unit'] in RATE_UNITS and row['score'] > 0:
+            ops_per_s = row['score'] * RATE_UNITS[row['unit']]
+            relative = row['error'] / row['score'] if row['error'] is not None else None
+            score = 1e9 / ops_per_s
+            inverted[key] = dict(row, unit='ns/op', score=score,
+                                 error=score * relative if relative is not None else None)
+    return list({**inverted, **timed}.values())
+
+
+def throughput_table(rows):
+    """
+    Return ({group: {variant: {size: {threads: ops/s}}}}, errors of the same
+    shape) from the thrpt rows.
+    """
+    result = defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
+    errors = defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
+    for row in rows:
+        if row['unit'] not in RATE_UNITS:
+            continue
+        scale = RATE_UNITS[row['unit']]
+        result[row['group']][row['variant']][row['size']][row['threads']] = row['score'] * scale
+        errors[row['group']][row['variant']][row['size']][row['threads']] = (
+            row['error'] * scale if row['error'] is not None else None
+        )
+    return result, errors
+
+
+def parse_results_csv(input_path, with_errors=False, rows=None):
+    """
+    Parse a JMH CSV file into {group: {variant: {size: ns/op}}}, using
+    single-thread rows (see latency_rows).
+
+    With with_errors=True, return (scores, errors) where errors has the same
+    shape and holds the 'Score Error (99.9%)' column (None when missing).
+    Pass rows already returned by read_jmh_rows to skip reading the file.
+    """
+    result = defaultdict(lambda: defaultdict(dict))
+    errors = defaultdict(lambda: defaultdict(dict))
+
+    if rows is None:
+        rows = read_jmh_rows(input_path)
+    for row in latency_rows(rows):
+        result[row['group']][row['variant']][row['size']] = row['score']
+        errors[row['group']][row['variant']][row['size']] = row['error']
+
+    if with_errors:
+        return result, errors
+    return result
+
+
+def _parse_float(s):
+    try:
+        return float(s)
+    except (TypeError, ValueError):
+        return None
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Parse Scala benchmark results (CSV) into JSON format."
@@ -63,11 +226,20 @@ def main():
         required=True,
         help="Data source: 'precomputed' or 'fresh'"
     )
+    parser.add_argument(
+        "--variant",
+        help="Parse variants/<name> of the source written by runners/generator_sweep.py"
+    )
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    timer = start_profiling("parse_results_scala_csv", args)
 
     # Determine input and output paths based on source
     input_dir = EVAL_DIR / "4.1_data_scala" / args.source
     output_dir = EVAL_DIR / "parsed_4.1_data_scala" / args.source
+    if args.variant:
+        input_dir = input_dir / "variants" / args.variant
+        output_dir = output_dir / "variants" / args.variant
 
     input_path = input_dir / "results_scala.csv"
 
@@ -76,20 +248,8 @@ def main():
         return 1
 
     # Parse CSV
-    result = defaultdict(lambda: defaultdict(dict))
-
-    with input_path.open() as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            benchmark = row['Benchmark']
-            score = float(row['Score'])
-
-            group, variant, size = parse_benchmark_name(benchmark)
-            if not group or not variant or size is None:
-                print(f"Skipping unknown benchmark: {benchmark}")
-                continue
-
-            result[group][variant][size] = score
+    rows = read_jmh_rows(input_path)
+    result, errors = parse_results_csv(input_path, with_errors=True, rows=rows)
 
     # Write JSON files for each benchmark group
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -106,14 +266,35 @@ def main():
         }
 
         output_file = output_dir / f"{group}.json"
-        with output_file.open('w') as f:
-            json.dump(json_data, f, indent=4)
+        with phase("serialization"):
+            with output_file.open('w') as f:
+                json.dump(json_data, f, indent=4)
         print(f"Wrote {output_file}")
 
+    # Normalized long-format table shared with the OCaml parser
+    with phase("serialization"):
+        long_file = write_long_table(long_rows("scala", result, errors), output_dir)
+    print(f"Wrote {long_file}")
+
+    # Throughput per thread count, kept out of the top level read by f16
+    throughput, throughput_errors = throughput_table(rows)
+    if throughput:
+        scaling_dir = output_dir / "scaling"
+        scaling_dir.mkdir(exist_ok=True)
+        scaling_file = scaling_dir / "throughput.json"
+        with phase("serialization"):
+            with scaling_file.open('w') as f:
+                json.dump({"unit": "ops/s", "scores": throughput, "errors": throughput_errors}, f, indent=4)
+        print(f"Wrote {scaling_file}")
+
+    # Configuration of a generator_sweep.py run
+    copy_sweep_tag(input_dir, output_dir)
+
     print(f"\nParsed {len(result)} benchmark groups from {args.source} data")
     for group in sorted(result.keys()):
         print(f"  - {group}: {len(result[group])} variants")
 
+    timer.finish(output_dir)
     return 0
 
 
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Adaptive seed allocation for ETNA sweeps.
+
+Instead of running a fixed number of seeds for every workload, seeds are
+added in batches. After each batch the results collected so far are parsed,
+cleaned and turned into speedups exactly as in run_etna_pipeline.py. For
+every staged strategy of a workload the per-seed geomean speedup (over all
+mutant/property tasks) gives a confidence interval for the overall speedup.
+A workload keeps receiving seeds only while some strategy's interval is
+wider than --target, relative to its point estimate, and it has not yet
+reached --max-seeds.
+
+Trials are run with etna_scheduler.py, so an interrupted sweep can be resumed
+by re-running the same command. Seeds are drawn deterministically from
+--rng-seed, and finished trials are skipped. The log of every batch and the
+trial time saved compared with running --max-seeds everywhere is written to
+<output-dir>/adaptive_sweep.json.
+
+Usage:
+    python adaptive_sweep.py --stub --system BST --output-dir /tmp/etna_fresh
+    python adaptive_sweep.py --command "./run_trial.sh {system} {strategy} {mutant} {prop} {seed}" --target 0.1
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+from pathlib import Path
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+sys.path.insert(0, str(EVAL_DIR / "parsers"))
+sys.path.insert(0, str(EVAL_DIR / "etna_data_processing"))
+
+from common.benchmarks import ETNA_TASKS, TIMEOUT, default_strategies, make_seeds
+from parse_etna_data import scan_results, sort_results
+from clean_under5ms_or_timeout import clean_results
+from calculate_speedups import WORKLOAD_KEYS
+from seed_power import converged, workload_intervals
+from etna_scheduler import STUB_COMMAND, build_trials, load_estimates, run_sweep
+
+
+def system_workloads(system):
+    """Workloads whose strategies are all part of the system's sweep."""
+    strategies = set(default_strategies(system))
+    return [w for w, (_, keys) in WORKLOAD_KEYS.items() if set(keys) <= strategies]
+
+
+def trial_seconds(results, strategies, timeout):
+    """
+    Total trial time of the given strategies, per seed. Timeouts are recorded
+    as TIMEOUT by parse_etna_data.py but cost the sweep's own `timeout`.
+    """
+    per_seed = {}
+    for properties in results.values():
+        for values in properties.values():
+            for key, value in values.items():
+                strategy, seed = key.rsplit("_", 1)
+                if strategy in strategies:
+                    per_seed[seed] = per_seed.get(seed, 0.0) + (timeout if value == TIMEOUT else value)
+    return per_seed
+
+
+def run_adaptive(system, args, template, seed_pool, estimates):
+    """Run batches for one system until every workload converges or runs out of seeds."""
+    experiments_dir = Path(args.output_dir) / f"{system.lower()}-experiments"
+    workloads = system_workloads(system)
+    allocated = {workload: 0 for workload in workloads}
+    active = set(workloads)
+    batches = []
+
+    while active:
+        for workload in sorted(active):
+            batch = args.initial_seeds if allocated[workload] == 0 else args.batch_size
+            allocated[workload] = min(allocated[workload] + batch, args.max_seeds)
+
+        for workload in sorted(active):
+            spec = {
+                "systems": [system],
+                "strategies": {system: WORKLOAD_KEYS[workload][1]},
+                "tasks": {system: ETNA_TASKS[system]},
+                "seeds": seed_pool[:allocated[workload]],
+            }
+            print(f"{system} {workload}: running seeds 1-{allocated[workload]}")
+            run_sweep(build_trials(spec), template, args.output_dir, args.workers, args.timeout, estimates)
+
+        results, seeds, _ = scan_results(system, experiments_dir)
+        # Timeouts are recorded as TIMEOUT whatever --timeout is
+        cleaned, _ = clean_results(sort_results(results, seeds))
+
+        entry = {"system": system, "workloads": {}}
+        for workload in sorted(active):
+            intervals = workload_intervals(cleaned, workload, args.confidence)
+            done = converged(intervals, args.target)
+            entry["workloads"][workload] = {"seeds": allocated[workload], "converged": done, "intervals": intervals}
+
+            widths = ", ".join(
+                f"{s}={v['relative_width']:.3f}" if v["relative_width"] is not None else f"{s}=n/a"
+                for s, v in intervals.items()
+            )
+            print(f"  {workload} ({allocated[workload]} seeds): relative CI width {widths}"
+                  f"{'  converged' if done else ''}")
+            if done or allocated[workload] >= args.max_seeds:
+                active.discard(workload)
+        batches.append(entry)
+
+    savings = {}
+    for workload in workloads:
+        per_seed = trial_seconds(results, set(WORKLOAD_KEYS[workload][1]), args.timeout)
+        # Ignore seeds in the tree that this sweep did not allocate
+        used = {str(seed) for seed in seed_pool[:allocated[workload]]}
+        per_seed = {seed: t for seed, t in per_seed.items() if seed in used}
+        spent = sum(per_seed.values())
+        mean_per_seed = spent / len(per_seed) if per_seed else 0.0
+        fixed = mean_per_seed * args.max_seeds
+        savings[workload] = {
+            "seeds": allocated[workload],
+            "trial_seconds": spent,
+            "fixed_trial_seconds": fixed,
+            "saved_seconds": fixed - spent,
+        }
+        print(f"{system} {workload}: {allocated[workload]}/{args.max_seeds} seeds, "
+              f"{spent:.1f}s of trial time, {fixed - spent:.1f}s saved vs a fixed {args.max_seeds} seeds")
+
+    return {"batches": batches, "savings": savings}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an ETNA sweep with adaptive seed allocation.")
+    parser.add_argument(
+        "--system",
+        choices=["BST", "STLC"],
+        action="append",
+        help="System to run (may be repeated; default: both)"
+    )
+    command = parser.add_mutually_exclusive_group(required=True)
+    command.add_argument(
+        "--command",
+        help="Trial command template with {system} {strategy} {mutant} {prop} {seed} {timeout}"
+    )
+    command.add_argument(
+        "--stub",
+        action="store_true",
+        help="Use runners/stub_trial.py instead of a real trial command"
+    )
+    parser.add_argument(
+        "--target",
+        type=float,
+        default=0.2,
+        help="Stop once every staged strategy's CI width / geomean is at most this (default: 0.2)"
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="Confidence level of the intervals (default: 0.95)"
+    )
+    parser.add_argument(
+        "--initial-seeds",
+        type=int,
+        default=5,
+        help="Seeds in the first batch (default: 5)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=5,
+        help="Seeds added per later batch (default: 5)"
+    )
+    parser.add_argument(
+        "--max-seeds",
+        type=int,
+        default=30,
+        help="Seed budget per workload, also the fixed count savings are measured against (default: 30)"
+    )
+    parser.add_argument(
+        "--rng-seed",
+        type=int,
+        default=0,
+        help="Seed for drawing trial seeds (default: 0)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of trials run in parallel (default: number of CPUs)"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=TIMEOUT,
+        help=f"Per-trial timeout in seconds (default: {TIMEOUT:g})"
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=str(EVAL_DIR / "4.2_data" / "fresh"),
+        help="Root for the experiments trees (default: 4.2_data/fresh)"
+    )
+    args = parser.parse_args()
+
+    if args.initial_seeds < 2:
+        print("Error: --initial-seeds must be at least 2 to form an interval")
+        return 1
+
+    template = STUB_COMMAND if args.stub else args.command
+    seed_pool = make_seeds(random.Random(args.rng_seed), args.max_seeds)
+    estimates = load_estimates("precomputed")
+
+    log = {"target": args.target, "confidence": args.confidence, "max_seeds": args.max_seeds,
+           "seed_pool": seed_pool, "systems": {}}
+    for system in args.system or list(ETNA_TASKS):
+        log["systems"][system] = run_adaptive(system, args, template, seed_pool, estimates)
+
+    total_saved = sum(s["saved_seconds"] for r in log["systems"].values() for s in r["savings"].values())
+    total_fixed = sum(s["fixed_trial_seconds"] for r in log["systems"].values() for s in r["savings"].values())
+    print(f"\nTrial time saved: {total_saved:.1f}s of {total_fixed:.1f}s "
+          f"({100 * total_saved / total_fixed if total_fixed else 0:.1f}%)")
+
+    log_path = Path(args.output_dir) / "adaptive_sweep.json"
+    with open(log_path, "w") as f:
+        json.dump(log, f, indent=2)
+    print(f"Sweep log saved to {log_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Run an ETNA sweep locally on a worker pool and write the `fresh` trial files.
+
+A sweep spec (JSON) lists what to run; every key is optional:
+
+    {
+        "systems": ["BST", "STLC"],
+        "strategies": {"BST": ["baseBespoke", ...], "STLC": [...]},
+        "tasks": {"BST": {"insert_1": ["prop_InsertPost", ...]}, ...},
+        "seeds": [42, 101010, ...],
+        "timeout": 60
+    }
+
+Strategies and tasks default to the ones in the bundled data (12 strategies
+for BST, 8 for STLC). The command template is formatted with {system},
+{strategy}, {mutant}, {prop}, {seed} and {timeout} and run once per trial.
+If its output contains an `[exit ok, <t> duration ...]` or `[exit timeout]`
+line that result is recorded, otherwise the wall-clock time is. Trials that
+exceed the timeout are killed and recorded as `[exit timeout]`; trials that
+exit non-zero or cannot be started are reported and left unwritten.
+
+Only the 60 s timeout of the bundled data is supported for results meant to
+be analysed: parse_etna_data.py and everything downstream read a bare
+`[exit timeout]` as common.benchmarks.TIMEOUT, whatever timeout the sweep
+used. Another timeout only changes when trials are killed (e.g. for quick
+stub runs); it is recorded in sweep.json for reference but never read back.
+
+Each trial is written to
+    <output-dir>/<system>-experiments/oc3-<system>-<seed>/<SYSTEM>,<strategy>,<mutant>,<prop>.txt
+in the format parse_etna_data.py reads. Files are written atomically, and
+trials whose file already holds a result are skipped, so an interrupted sweep
+resumes where it stopped. Trials are started longest-expected first, using
+mean durations from --estimates (a parsed results source) when available.
+
+Each experiments directory is tagged with a sweep.json recording the number
+of concurrent workers (every level used, if a sweep was resumed with a
+different --workers), which parse_etna_data.py and run_etna_pipeline.py
+copy to parsed_4.2_data/{source}/meta/{system}_sweep.json. interference.py
+measures how much concurrency distorts durations.
+
+Usage:
+    python etna_scheduler.py --spec sweep.json --command "./run_trial.sh {system} {strategy} {mutant} {prop} {seed}"
+    python etna_scheduler.py --stub --seeds 1 2 3 --workers 8 --output-dir /tmp/etna_fresh
+"""
+
+import os
+import sys
+import json
+import time
+import shlex
+import socket
+import signal
+import argparse
+import subprocess
+from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+sys.path.insert(0, str(EVAL_DIR / "parsers"))
+
+from common.benchmarks import ETNA_TASKS, TIMEOUT, default_strategies
+from parse_etna_data import parse_trial, trial_status
+
+STUB_COMMAND = (f"{shlex.quote(sys.executable)} {shlex.quote(str(Path(__file__).parent / 'stub_trial.py'))} "
+                "--system {system} --strategy {strategy} --mutant {mutant} --prop {prop} --seed {seed}")
+
+
+def build_trials(spec):
+    """Expand a sweep spec into a list of trial dicts."""
+    trials = []
+    for system in spec.get("systems", list(ETNA_TASKS)):
+        strategies = spec.get("strategies", {}).get(system, default_strategies(system))
+        tasks = spec.get("tasks", {}).get(system, ETNA_TASKS[system])
+        for seed in spec["seeds"]:
+            for strategy in strategies:
+                for mutant, props in tasks.items():
+                    for prop in props:
+                        trials.append({
+                            "system": system,
+                            "strategy": strategy,
+                            "mutant": mutant,
+                            "prop": prop,
+                            "seed": str(seed),
+                        })
+    return trials
+
+
+def trial_path(output_dir, trial):
+    system = trial["system"]
+    return (Path(output_dir) / f"{system.lower()}-experiments" / f"oc3-{system.lower()}-{trial['seed']}"
+            / f"{system},{trial['strategy']},{trial['mutant']},{trial['prop']}.txt")
+
+
+def is_done(path):
+    """A trial is done when its file exists and holds a parseable result."""
+    try:
+        return parse_trial(path.read_text()) is not None
+    except OSError:
+        return False
+
+
+def load_estimates(source):
+    """
+    Return {system: ({(strategy, mutant, prop): mean}, {strategy: mean})} from
+    parsed_4.2_data/{source}/parsed, for whichever systems have been parsed.
+    """
+    estimates = {}
+    for path in (EVAL_DIR / "parsed_4.2_data" / source / "parsed").glob("*_results.json"):
+        system = path.name[:-len("_results.json")].upper()
+        with open(path) as f:
+            data = json.load(f)
+        by_task, by_strategy = defaultdict(list), defaultdict(list)
+        for mutant, properties in data.items():
+            for prop, values in properties.items():
+                for key, value in values.items():
+                    if value is None:
+                        continue
+                    strategy, _ = key.rsplit("_", 1)
+                    by_task[(strategy, mutant, prop)].append(value)
+                    by_strategy[strategy].append(value)
+        estimates[system] = (
+            {key: sum(v) / len(v) for key, v in by_task.items()},
+            {key: sum(v) / len(v) for key, v in by_strategy.items()},
+        )
+    return estimates
+
+
+def expected_duration(trial, estimates, timeout):
+    by_task, by_strategy = estimates.get(trial["system"], ({}, {}))
+    key = (trial["strategy"], trial["mutant"], trial["prop"])
+    return by_task.get(key, by_strategy.get(trial["strategy"], timeout))
+
+
+def trial_content(stdout, elapsed, timeout, seed):
+    """
+    Return (file content, status) for a finished trial's output. The trial's
+    own `[exit timeout]` is recorded as a timeout whatever --timeout is; a
+    trial without a result line is timed by its wall-clock `elapsed`.
+    """
+    status, duration = trial_status(stdout)
+    if status is None:
+        duration = elapsed
+    if status == "timeout" or duration >= timeout:
+        return "[start]\n[exit timeout]\n", "timeout"
+    return f"[start]\n[exit ok, {duration:.6f} duration {seed}]\n", "ok"
+
+
+def run_trial(trial, command, output_dir, timeout):
+    """
+    Run one trial and write its result file.
+
+    Returns (status, seconds) where status is 'ok', 'timeout' or 'failed'.
+    """
+    args = shlex.split(command.format(timeout=timeout, **trial))
+    start = time.perf_counter()
+    try:
+        process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   text=True, start_new_session=True)
+    except OSError as e:
+        print(f"  Failed to start: {' '.join(args)}: {e}")
+        return "failed", time.perf_counter() - start
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        # Kill the whole process group so the trial's children go too
+        os.killpg(process.pid, signal.SIGKILL)
+        process.communicate()
+        stdout, stderr = None, None
+    elapsed = time.perf_counter() - start
+
+    if stdout is None:
+        content, status = "[start]\n[exit timeout]\n", "timeout"
+    elif process.returncode != 0:
+        tail = stderr.strip().splitlines()[-1:] if stderr else []
+        print(f"  Failed ({process.returncode}): {' '.join(args)} {' '.join(tail)}")
+        return "failed", elapsed
+    else:
+        content, status = trial_content(stdout, elapsed, timeout, trial["seed"])
+
+    path = trial_path(output_dir, trial)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(content)
+    os.replace(tmp_path, path)
+    return status, elapsed
+
+
+def write_sweep_tag(output_dir, systems, workers, timeout):
+    """Record the concurrency level in <system>-experiments/sweep.json for each system."""
+    for system in systems:
+        path = Path(output_dir) / f"{system.lower()}-experiments" / "sweep.json"
+        levels = []
+        if path.exists():
+            with open(path) as f:
+                levels = json.load(f).get("concurrency_levels", [])
+        levels = sorted(set(levels) | {workers})
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({
+                "concurrency": max(levels),
+                "concurrency_levels": levels,
+                "timeout": timeout,
+                "host": socket.gethostname(),
+            }, f, indent=2)
+
+
+def run_sweep(trials, command, output_dir, workers, timeout, estimates=None):
+    """Run every pending trial, longest-expected first. Returns {status: count}."""
+    pending = [t for t in trials if not is_done(trial_path(output_dir, t))]
+    skipped = len(trials) - len(pending)
+    if skipped:
+        print(f"Resuming: {skipped} of {len(trials)} trials already have results")
+
+    estimates = estimates or {}
+    pending.sort(key=lambda t: expected_duration(t, estimates, timeout), reverse=True)
+
+    if pending:
+        write_sweep_tag(output_dir, sorted({t["system"] for t in pending}), workers, timeout)
+
+    counts = defaultdict(int, skipped=skipped)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_trial, t, command, output_dir, timeout) for t in pending]
+        for done, future in enumerate(as_completed(futures), 1):
+            status, _ = future.result()
+            counts[status] += 1
+            if done % 100 == 0 or done == len(futures):
+                print(f"  {done}/{len(futures)} trials finished")
+    return dict(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run ETNA trials locally and write the fresh trial files.")
+    parser.add_argument(
+        "--spec",
+        help="Sweep spec JSON file (see module docstring)"
+    )
+    parser.add_argument(
+        "--seeds",
+        type=int,
+        nargs="+",
+        help="Seeds to run (overrides the spec)"
+    )
+    parser.add_argument(
+        "--system",
+        choices=["BST", "STLC"],
+        action="append",
+        help="Restrict to a system (may be repeated; overrides the spec)"
+    )
+    command = parser.add_mutually_exclusive_group(required=True)
+    command.add_argument(
+        "--command",
+        help="Trial command template with {system} {strategy} {mutant} {prop} {seed} {timeout}"
+    )
+    command.add_argument(
+        "--stub",
+        action="store_true",
+        help="Use runners/stub_trial.py instead of a real trial command"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of trials run in parallel (default: number of CPUs)"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help=f"Per-trial timeout in seconds (default: spec value or {TIMEOUT:g})"
+    )
+    parser.add_argument(
+        "--estimates",
+        choices=["precomputed", "fresh"],
+        default="precomputed",
+        help="Parsed results used to order trials longest-first (default: precomputed)"
+    )
+    parser.add_argument(
+        "--output-dir",
+        help="Root for the experiments trees (default: 4.2_data/fresh)"
+    )
+    args = parser.parse_args()
+
+    spec = {}
+    if args.spec:
+        with open(args.spec) as f:
+            spec = json.load(f)
+    if args.seeds:
+        spec["seeds"] = args.seeds
+    if args.system:
+        spec["systems"] = args.system
+    if not spec.get("seeds"):
+        print("Error: No seeds given (use --seeds or a spec with 'seeds')")
+        return 1
+
+    timeout = args.timeout or spec.get("timeout", TIMEOUT)
+    output_dir = Path(args.output_dir) if args.output_dir else EVAL_DIR / "4.2_data" / "fresh"
+    template = STUB_COMMAND if args.stub else args.command
+
+    if timeout != TIMEOUT:
+        print(f"Note: timeouts are still recorded as {TIMEOUT:g}s by parse_etna_data.py (see module docstring)")
+
+    trials = build_trials(spec)
+    print(f"Sweep: {len(trials)} trials, {args.workers} workers, timeout {timeout:g}s -> {output_dir}")
+
+    start = time.perf_counter()
+    counts = run_sweep(trials, template, output_dir, args.workers, timeout, load_estimates(args.estimates))
+    elapsed = time.perf_counter() - start
+
+    print(f"Finished in {elapsed:.1f}s: {counts.get('ok', 0)} ok, {counts.get('timeout', 0)} timeouts, "
+          f"{counts.get('failed', 0)} failed, {counts.get('skipped', 0)} skipped")
+    return 1 if counts.get("failed") else 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Run the OCaml and Scala generator benchmarks over a grid of groups, sizes and
+environment variants, and write the `fresh` 4.1 result files.
+
+A sweep config (JSON) describes what to run; every key is optional:
+
+    {
+        "ocaml": {
+            "command": "./bench.exe {name} -quota {quota} -sizes {sizes}",
+            "groups": ["bst_bespoke", "stlc_type"],
+            "sizes": [10, 100, 1000, 10000],
+            "quota": "5s",
+            "format": "table",
+            "cwd": "../allegrocaml",
+            "timeout": 3600,
+            "parallel": 1
+        },
+        "scala": {
+            "command": "sbt 'jmh:run -i {iterations} -rf csv -rff {output} .*generate{group}.*'",
+            "groups": ["BstBespoke", "Term"],
+            "iterations": 5
+        },
+        "variants": {
+            "default": {},
+            "minor-1M": {"languages": ["ocaml"], "env": {"OCAMLRUNPARAM": "s=1M"}},
+            "g1": {"languages": ["scala"], "env": {"JAVA_TOOL_OPTIONS": "-XX:+UseG1GC"}},
+            "q10": {"params": {"quota": "10s"}}
+        }
+    }
+
+Groups default to every group the parsers know, sizes to the bundled grid.
+The command is formatted with {group} (the parser group, e.g. bst_bespoke or
+BstBespoke), {name} (the results_<name> file stem for OCaml), {sizes}
+(comma-separated), {output} and every other scalar key of its language
+section (quota, iterations, ...), which a variant's "params" override.
+A variant's "env" is added to the environment of its commands; "languages"
+restricts it to some languages. Without "variants" only "default" runs.
+
+If the command mentions {output} it writes that file itself (e.g. JMH -rff),
+otherwise its stdout is saved (Core_bench tables). Files are written
+atomically, and groups whose file already exists are skipped unless --force,
+so an interrupted sweep resumes where it stopped. The "default" variant
+writes where the parsers read, other variants below variants/<name>:
+
+    4.1_data_ocaml/fresh[/variants/<name>]/results_<name>.txt
+    4.1_data_scala/fresh[/variants/<name>]/results_scala.csv
+
+Scala groups are run one JMH invocation each (jmh/<group>.csv) and merged
+into results_scala.csv. Every output directory is tagged with a sweep.json
+recording the language, variant, env, params, sizes, command, concurrency
+and host; parse_results_ocaml.py and parse_results_scala_csv.py take
+--variant and copy the tag to meta/sweep.json of the parsed results.
+
+Timings taken concurrently distort each other (see interference.py), so
+each language runs "parallel" (default 1) jobs at a time and the languages
+run one after the other.
+
+Usage:
+    python generator_sweep.py --config gc_sweep.json
+    python generator_sweep.py --config gc_sweep.json --language ocaml --variant minor-1M --dry-run
+    python generator_sweep.py --stub --workers 4 --output-root /tmp/sweep
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import shlex
+import signal
+import socket
+import argparse
+import subprocess
+from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+sys.path.insert(0, str(EVAL_DIR / "parsers"))
+
+from common.benchmarks import GENERATOR_SIZES, SCALA_GROUPS
+from parse_results_ocaml import FORMAT_SUFFIXES, RESULT_FILES
+
+LANGUAGES = ["ocaml", "scala"]
+
+# Results stem (results_<name>) of each OCaml parser group
+OCAML_NAMES = {group: Path(filename).stem[len("results_"):] for filename, group in RESULT_FILES.items()}
+
+DEFAULT_GROUPS = {"ocaml": list(OCAML_NAMES), "scala": SCALA_GROUPS}
+DEFAULT_PARAMS = {"ocaml": {"quota": "5s"}, "scala": {"iterations": 5}}
+
+# Keys of a language section that are not command placeholders
+SETTINGS = {"command", "groups", "sizes", "format", "cwd", "timeout", "parallel"}
+
+STUB = f"{shlex.quote(sys.executable)} {shlex.quote(str(Path(__file__).parent / 'stub_generator_bench.py'))}"
+STUB_COMMANDS = {
+    "ocaml": STUB + " --language ocaml --group {group} --sizes {sizes} --quota {quota}",
+    "scala": STUB + " --language scala --group {group} --sizes {sizes} --output {output}",
+}
+
+
+def variant_dir(output_root, language, variant):
+    target = Path(output_root) / f"4.1_data_{language}" / "fresh"
+    return target if variant == "default" else target / "variants" / variant
+
+
+def output_path(target, language, group, section):
+    if language == "scala":
+        return target / "jmh" / f"{group}.csv"
+    return target / f"results_{OCAML_NAMES[group]}{FORMAT_SUFFIXES[section.get('format', 'table')]}"
+
+
+def build_jobs(config, output_root, languages=None, variants=None):
+    """Expand a sweep config into a list of job dicts, one per (language, variant, group)."""
+    jobs = []
+    all_variants = config.get("variants", {"default": {}})
+    for language in languages or LANGUAGES:
+        section = config.get(language, {})
+        groups = section.get("groups", DEFAULT_GROUPS[language])
+        unknown = sorted(set(groups) - set(DEFAULT_GROUPS[language]))
+        if unknown:
+            raise ValueError(f"Unknown {language} groups: {', '.join(unknown)}")
+        sizes = section.get("sizes", GENERATOR_SIZES)
+        for variant, spec in all_variants.items():
+            if variants and variant not in variants:
+                continue
+            if language not in spec.get("languages", LANGUAGES):
+                continue
+            params = dict(DEFAULT_PARAMS[language])
+            params.update({k: v for k, v in section.items() if k not in SETTINGS})
+            params.update(spec.get("params", {}))
+            target = variant_dir(output_root, language, variant)
+            for group in groups:
+                jobs.append({
+                    "language": language,
+                    "variant": variant,
+                    "group": group,
+                    "name": OCAML_NAMES.get(group, group),
+                    "sizes": sizes,
+                    "params": params,
+                    "env": spec.get("env", {}),
+                    "target": target,
+                    "output": output_path(target, language, group, section),
+                    "cwd": section.get("cwd"),
+                    "timeout": section.get("timeout"),
+                })
+    return jobs
+
+
+def format_command(template, job, output):
+    return template.format(
+        group=job["group"],
+        name=job["name"],
+        sizes=",".join(str(size) for size in job["sizes"]),
+        output=shlex.quote(str(output)),
+        **job["params"]
+    )
+
+
+def run_job(job, template):
+    """
+    Run one benchmark command and move its output into place.
+
+    Returns (status, seconds) where status is 'ok', 'timeout' or 'failed'.
+    """
+    output = job["output"]
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(output.name + ".tmp")
+    writes_output = "{output}" in template
+    args = shlex.split(format_command(template, job, tmp_path))
+    env = dict(os.environ, **{key: str(value) for key, value in job["env"].items()})
+
+    start = time.perf_counter()
+    try:
+        process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                   env=env, cwd=job["cwd"], start_new_session=True)
+    except OSError as e:
+        print(f"  Failed to start: {' '.join(args)}: {e}")
+        return "failed", time.perf_counter() - start
+    try:
+        stdout, stderr = process.communicate(timeout=job["timeout"])
+    except subprocess.TimeoutExpired:
+        # Kill the whole process group so the build tool's children (e.g. the JVM) go too
+        os.killpg(process.pid, signal.SIGKILL)
+        process.communicate()
+        tmp_path.unlink(missing_ok=True)
+        print(f"  Timed out after {job['timeout']}s: {job['language']}/{job['variant']}/{job['group']}")
+        return "timeout", time.perf_counter() - start
+    elapsed = time.perf_counter() - start
+
+    if process.returncode != 0:
+        tmp_path.unlink(missing_ok=True)
+        tail = stderr.strip().splitlines()[-1:]
+        print(f"  Failed ({process.returncode}): {' '.join(args)} {' '.join(tail)}")
+        return "failed", elapsed
+    if not writes_output:
+        tmp_path.write_text(stdout)
+    if not tmp_path.exists() or tmp_path.stat().st_size == 0:
+        tmp_path.unlink(missing_ok=True)
+        print(f"  No output from: {' '.join(args)}")
+        return "failed", elapsed
+    os.replace(tmp_path, output)
+    return "ok", elapsed
+
+
+def merge_jmh_csvs(target):
+    """Concatenate jmh/*.csv into results_scala.csv over the union of their columns."""
+    fieldnames, rows = [], []
+    for path in sorted((target / "jmh").glob("*.csv")):
+        with open(path, newline="") as f:
+            reader = csv.DictReader(f)
+            fieldnames += [name for name in reader.fieldnames or [] if name not in fieldnames]
+            rows += list(reader)
+    if not rows:
+        return 0
+    with open(target / "results_scala.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows)
+
+
+def write_sweep_tag(jobs, template, workers, results):
+    """Record each output directory's configuration and per-group outcome in its sweep.json."""
+    by_target = defaultdict(list)
+    for job in jobs:
+        by_target[job["target"]].append(job)
+    for target, target_jobs in by_target.items():
+        path = target / "sweep.json"
+        groups = {}
+        if path.exists():
+            with open(path) as f:
+                groups = json.load(f).get("groups", {})
+        first = target_jobs[0]
+        tag = {
+            "language": first["language"],
+            "variant": first["variant"],
+            "env": first["env"],
+            "params": first["params"],
+            "sizes": first["sizes"],
+            "command": template,
+            "concurrency": workers,
+            "host": socket.gethostname(),
+            "groups": groups,
+        }
+        for job in target_jobs:
+            key = (job["variant"], job["group"])
+            if key in results:
+                status, seconds = results[key]
+                tag["groups"][job["group"]] = {"status": status, "seconds": round(seconds, 3)}
+        target.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(tag, f, indent=2)
+
+
+def run_language(jobs, template, workers, force=False):
+    """Run the pending jobs of one language. Returns {status: count}."""
+    pending = [job for job in jobs if force or not job["output"].exists()]
+    counts = defaultdict(int, skipped=len(jobs) - len(pending))
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_job, job, template): job for job in pending}
+        for future in as_completed(futures):
+            job = futures[future]
+            status, seconds = future.result()
+            results[job["variant"], job["group"]] = (status, seconds)
+            counts[status] += 1
+            print(f"  {job['variant']}/{job['group']}: {status} ({seconds:.1f}s)")
+
+    if pending:
+        write_sweep_tag(pending, template, workers, results)
+    for target in sorted({job["target"] for job in jobs if job["language"] == "scala"}):
+        merged = merge_jmh_csvs(target)
+        if merged:
+            print(f"  Merged {merged} JMH rows into {target / 'results_scala.csv'}")
+    return dict(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run OCaml/Scala generator benchmarks and write the fresh 4.1 files.")
+    parser.add_argument(
+        "--config",
+        help="Sweep config JSON file (see module docstring)"
+    )
+    parser.add_argument(
+        "--language",
+        choices=LANGUAGES,
+        action="append",
+        help="Restrict to a language (may be repeated)"
+    )
+    parser.add_argument(
+        "--variant",
+        action="append",
+        help="Restrict to a variant of the config (may be repeated)"
+    )
+    parser.add_argument(
+        "--stub",
+        action="store_true",
+        help="Use runners/stub_generator_bench.py instead of the configured commands"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Jobs run in parallel per language (default: the config's 'parallel', else 1)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rerun groups whose output already exists"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the commands instead of running them"
+    )
+    parser.add_argument(
+        "--output-root",
+        default=str(EVAL_DIR),
+        help="Directory holding the 4.1_data_* trees (default: the eval directory)"
+    )
+    args = parser.parse_args()
+
+    config = {}
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+
+    try:
+        jobs = build_jobs(config, args.output_root, args.language, args.variant)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    if not jobs:
+        print("Error: No jobs selected")
+        return 1
+
+    failed = 0
+    start = time.perf_counter()
+    for language in LANGUAGES:
+        language_jobs = [job for job in jobs if job["language"] == language]
+        if not language_jobs:
+            continue
+        section = config.get(language, {})
+        template = STUB_COMMANDS[language] if args.stub else section.get("command")
+        if not template:
+            print(f"Error: No command for {language} (set '{language}.command' in the config or use --stub)")
+            return 1
+        workers = args.workers or section.get("parallel", 1)
+
+        if args.dry_run:
+            for job in language_jobs:
+                env = " ".join(f"{k}={shlex.quote(str(v))}" for k, v in job["env"].items())
+                print(f"{env + ' ' if env else ''}{format_command(template, job, job['output'])}")
+            continue
+
+        variants = sorted({job["variant"] for job in language_jobs})
+        print(f"{language}: {len(language_jobs)} jobs over {len(variants)} variants "
+              f"({', '.join(variants)}), {workers} workers")
+        if workers > 1:
+            print("  Warning: concurrent benchmarks inflate each other's timings (see interference.py)")
+        counts = run_language(language_jobs, template, workers, args.force)
+        failed += counts.get("failed", 0) + counts.get("timeout", 0)
+        print(f"  {counts.get('ok', 0)} ok, {counts.get('timeout', 0)} timeouts, "
+              f"{counts.get('failed', 0)} failed, {counts.get('skipped', 0)} skipped")
+
+    if not args.dry_run:
+        print(f"Finished in {time.perf_counter() - start:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    exit(main())
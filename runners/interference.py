@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Measure how running ETNA trials concurrently distorts their durations.
+
+The same sweep is run once per concurrency level in --levels, each into its
+own tree <output-dir>/c<N>/, with etna_scheduler.py using N workers. Level 1
+is run twice (c1/ and c1-repeat/) so that run-to-run noise can be told apart
+from interference.
+
+For every strategy and level N the matched trials (same mutant, property and
+seed, no timeout at either level) are compared with level 1:
+
+- inflation: geomean of duration(N) / duration(1),
+- log_sd: standard deviation of log(duration(N) / duration(1)), and
+  excess_sd, the part of it not explained by the c1 vs c1-repeat noise,
+- new_timeouts: trials that time out at N but not at level 1.
+
+Because calculate_speedups.py divides durations, uniform inflation cancels
+out, so the report also gives every workload's speedup drift: the flat
+geomean speedup (as in f17) at N divided by the one at level 1.
+
+A level is safe for a workload when, for all its strategies, inflation and
+drift are within --tolerance, excess_sd is at most log(1 + --tolerance) and
+no trial newly times out. The recommended parallelism is the highest level
+that is safe along with every level below it. The report is written to
+<output-dir>/interference.json.
+
+Usage:
+    python interference.py --stub --seeds 1 2 3 --levels 1 2 4 8 --output-dir /tmp/interference
+    python interference.py --command "./run_trial.sh {system} {strategy} {mutant} {prop} {seed}" --seeds 1 2 3
+    python interference.py --analyze-only --output-dir /tmp/interference
+"""
+
+import os
+import sys
+import json
+import math
+import argparse
+import statistics
+from pathlib import Path
+from collections import defaultdict
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+sys.path.insert(0, str(EVAL_DIR / "parsers"))
+sys.path.insert(0, str(EVAL_DIR / "etna_data_processing"))
+
+from common.benchmarks import TIMEOUT
+from common.stats import geomean
+from parse_etna_data import scan_results, sort_results
+from clean_under5ms_or_timeout import clean_results
+from calculate_speedups import WORKLOAD_KEYS, compute_speedup
+from timeout_budgets import flat_geomeans
+from etna_scheduler import STUB_COMMAND, build_trials, run_sweep
+
+REPEAT_DIR = "c1-repeat"
+
+
+def level_dir(output_dir, level):
+    return Path(output_dir) / f"c{level}"
+
+
+def levels_on_disk(output_dir):
+    """Concurrency levels with a c<N>/ tree under output_dir."""
+    levels = []
+    for path in Path(output_dir).iterdir():
+        if path.is_dir() and path.name[1:].isdigit() and path.name.startswith("c"):
+            levels.append(int(path.name[1:]))
+    return sorted(levels)
+
+
+def load_level(root, system):
+    """Return (parsed results, {(strategy, mutant, prop, seed): duration}) for one tree."""
+    experiments_dir = Path(root) / f"{system.lower()}-experiments"
+    if not experiments_dir.exists():
+        return None, {}
+    results, seeds, _ = scan_results(system, experiments_dir)
+    trials = {}
+    for mutant, properties in results.items():
+        for prop, values in properties.items():
+            for key, value in values.items():
+                strategy, seed = key.rsplit("_", 1)
+                trials[(strategy, mutant, prop, seed)] = value
+    return sort_results(results, seeds), trials
+
+
+def compare_trials(base, other):
+    """Per-strategy inflation, log_sd and new_timeouts of `other` against `base`."""
+    log_ratios, new_timeouts = defaultdict(list), defaultdict(int)
+    for key, reference in base.items():
+        value = other.get(key)
+        if value is None or reference >= TIMEOUT:
+            continue
+        if value >= TIMEOUT:
+            new_timeouts[key[0]] += 1
+        elif reference > 0 and value > 0:
+            log_ratios[key[0]].append(math.log(value / reference))
+
+    stats = {}
+    for strategy in sorted(set(log_ratios) | set(new_timeouts)):
+        logs = log_ratios[strategy]
+        stats[strategy] = {
+            "trials": len(logs),
+            "inflation": math.exp(statistics.mean(logs)) if logs else None,
+            "log_sd": statistics.stdev(logs) if len(logs) > 1 else 0.0,
+            "new_timeouts": new_timeouts[strategy],
+        }
+    return stats
+
+
+def speedup_geomeans(parsed):
+    """{workload: {strategy: flat geomean speedup}} from sorted parsed results."""
+    cleaned, _ = clean_results(parsed, timeout=TIMEOUT)
+    geomeans = {}
+    for workload in WORKLOAD_KEYS:
+        speedups = compute_speedup(cleaned, workload)
+        if speedups:
+            geomeans[workload] = flat_geomeans(speedups)
+    return geomeans
+
+
+def within(value, tolerance):
+    return value is not None and abs(math.log(value)) <= math.log(1 + tolerance)
+
+
+def analyze_system(output_dir, system, levels, tolerance):
+    base_parsed, base = load_level(level_dir(output_dir, 1), system)
+    if not base:
+        return None
+    _, repeat = load_level(Path(output_dir) / REPEAT_DIR, system)
+    noise = compare_trials(base, repeat) if repeat else {}
+    base_speedups = speedup_geomeans(base_parsed)
+
+    report = {"noise": noise, "levels": {}, "workloads": {}}
+    for level in levels:
+        if level == 1:
+            continue
+        parsed, trials = load_level(level_dir(output_dir, level), system)
+        if not trials:
+            continue
+        strategies = compare_trials(base, trials)
+        for strategy, entry in strategies.items():
+            noise_sd = noise.get(strategy, {}).get("log_sd", 0.0)
+            entry["excess_sd"] = math.sqrt(max(entry["log_sd"] ** 2 - noise_sd ** 2, 0.0))
+        speedups = speedup_geomeans(parsed)
+        drift = {
+            workload: {
+                strategy: value / base_speedups[workload][strategy]
+                for strategy, value in geomeans.items()
+                if base_speedups.get(workload, {}).get(strategy)
+            }
+            for workload, geomeans in speedups.items()
+        }
+        report["levels"][level] = {"strategies": strategies, "speedup_drift": drift}
+
+    for workload, (_, strategy_keys) in WORKLOAD_KEYS.items():
+        if workload not in base_speedups:
+            continue
+        verdicts = {}
+        for level, entry in report["levels"].items():
+            problems = []
+            for strategy in strategy_keys:
+                stats = entry["strategies"].get(strategy)
+                if stats is None:
+                    continue
+                if stats["new_timeouts"]:
+                    problems.append(f"{strategy}: {stats['new_timeouts']} new timeouts")
+                if stats["inflation"] is not None and not within(stats["inflation"], tolerance):
+                    problems.append(f"{strategy}: inflation {stats['inflation']:.3f}")
+                if stats["excess_sd"] > math.log(1 + tolerance):
+                    problems.append(f"{strategy}: excess log sd {stats['excess_sd']:.3f}")
+                drift = entry["speedup_drift"].get(workload, {}).get(strategy)
+                if drift is not None and not within(drift, tolerance):
+                    problems.append(f"{strategy}: speedup drift {drift:.3f}")
+            verdicts[level] = problems
+
+        safe = 1
+        for level in sorted(verdicts):
+            if verdicts[level]:
+                break
+            safe = level
+        report["workloads"][workload] = {
+            "max_safe_concurrency": safe,
+            "problems": {level: problems for level, problems in verdicts.items() if problems},
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure interference between concurrent ETNA trials.")
+    parser.add_argument(
+        "--spec",
+        help="Sweep spec JSON file (see etna_scheduler.py)"
+    )
+    parser.add_argument(
+        "--seeds",
+        type=int,
+        nargs="+",
+        help="Seeds to run (overrides the spec)"
+    )
+    parser.add_argument(
+        "--system",
+        choices=["BST", "STLC"],
+        action="append",
+        help="Restrict to a system (may be repeated; overrides the spec)"
+    )
+    command = parser.add_mutually_exclusive_group()
+    command.add_argument(
+        "--command",
+        help="Trial command template with {system} {strategy} {mutant} {prop} {seed} {timeout}"
+    )
+    command.add_argument(
+        "--stub",
+        action="store_true",
+        help="Use runners/stub_trial.py instead of a real trial command"
+    )
+    command.add_argument(
+        "--analyze-only",
+        action="store_true",
+        help="Only analyze the c<N>/ trees already under --output-dir"
+    )
+    parser.add_argument(
+        "--levels",
+        type=int,
+        nargs="+",
+        help="Concurrency levels to run (default: 1 2 4 ... up to the number of CPUs)"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help=f"Per-trial timeout in seconds (default: spec value or {TIMEOUT:g})"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.05,
+        help="Largest acceptable relative inflation, speedup drift and excess noise (default: 0.05)"
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=str(EVAL_DIR / "4.2_data" / "interference"),
+        help="Root for the per-level trees and the report (default: 4.2_data/interference)"
+    )
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir)
+    spec = {}
+    if args.spec:
+        with open(args.spec) as f:
+            spec = json.load(f)
+    if args.seeds:
+        spec["seeds"] = args.seeds
+    if args.system:
+        spec["systems"] = args.system
+
+    if args.analyze_only:
+        if not output_dir.exists():
+            print(f"Error: Output directory not found: {output_dir}")
+            return 1
+        levels = args.levels or levels_on_disk(output_dir)
+    else:
+        if not (args.command or args.stub):
+            print("Error: Give --command, --stub or --analyze-only")
+            return 1
+        if not spec.get("seeds"):
+            print("Error: No seeds given (use --seeds or a spec with 'seeds')")
+            return 1
+        levels = args.levels or [2 ** i for i in range(int(math.log2(os.cpu_count() or 1)) + 1)]
+        levels = sorted(set(levels) | {1})
+        timeout = args.timeout or spec.get("timeout", TIMEOUT)
+        template = STUB_COMMAND if args.stub else args.command
+        trials = build_trials(spec)
+
+        runs = [(level, level_dir(output_dir, level)) for level in levels]
+        runs.insert(1, (1, output_dir / REPEAT_DIR))
+        for level, root in runs:
+            print(f"Concurrency {level}: {len(trials)} trials -> {root}")
+            run_sweep(trials, template, root, level, timeout)
+
+    if 1 not in levels:
+        print("Error: Level 1 is needed as the reference")
+        return 1
+
+    report = {"tolerance": args.tolerance, "levels": levels, "systems": {}}
+    for system in spec.get("systems", ["BST", "STLC"]):
+        result = analyze_system(output_dir, system, levels, args.tolerance)
+        if result is None:
+            continue
+        report["systems"][system] = result
+
+        print(f"\n{system}:")
+        for level, entry in result["levels"].items():
+            inflation = geomean([s["inflation"] for s in entry["strategies"].values()])
+            worst = max(entry["strategies"].values(), key=lambda s: s["excess_sd"], default=None)
+            print(f"  c{level}: geomean inflation {inflation or float('nan'):.3f}x, "
+                  f"largest excess log sd {worst['excess_sd'] if worst else 0.0:.3f}, "
+                  f"{sum(s['new_timeouts'] for s in entry['strategies'].values())} new timeouts")
+        for workload, verdict in result["workloads"].items():
+            print(f"  {workload}: max safe concurrency {verdict['max_safe_concurrency']}")
+            for level, problems in verdict["problems"].items():
+                print(f"    c{level}: {'; '.join(problems[:3])}{' ...' if len(problems) > 3 else ''}")
+
+    if not report["systems"]:
+        print(f"Error: No level-1 results found under {output_dir}")
+        return 1
+
+    output_file = output_dir / "interference.json"
+    with open(output_file, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nInterference report saved to {output_file}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the OCaml (Core_bench) and Scala (JMH) generator benchmarks, for
+exercising generator_sweep.py without building either.
+
+Times are deterministic pseudo-random values derived from the group, with
+the same shapes as benchmarks/generate_synthetic_data.py. The OCaml stub
+prints a Core_bench box table for one group to stdout; the Scala stub writes
+a JMH CSV for one group to --output.
+
+Usage:
+    python stub_generator_bench.py --language ocaml --group bst_bespoke --sizes 10,100,1000 --quota 5s
+    python stub_generator_bench.py --language scala --group BstBespoke --sizes 10,100 --output /tmp/bst.csv
+"""
+
+import sys
+import random
+import argparse
+from pathlib import Path
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+sys.path.insert(0, str(EVAL_DIR / "benchmarks"))
+
+from common.benchmarks import SCALA_GROUPS
+from generate_synthetic_data import (BOOLLIST_VARIANTS, JMH_HEADER, OCAML_TABLES, OCAML_VARIANTS,
+                                     format_core_bench_table, jmh_lines)
+
+QUOTA_UNITS = {"ms": 1e-3, "s": 1.0, "m": 60.0}
+
+
+def parse_quota(quota):
+    """Seconds per benchmark of a Core_bench -quota like '5s' or '500ms' (5 for anything else)."""
+    for unit in sorted(QUOTA_UNITS, key=len, reverse=True):
+        if quota.endswith(unit):
+            try:
+                return float(quota[:-len(unit)]) * QUOTA_UNITS[unit]
+            except ValueError:
+                break
+    return 5.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate one generator benchmark group.")
+    parser.add_argument("--language", choices=["ocaml", "scala"], required=True)
+    parser.add_argument("--group", required=True)
+    parser.add_argument(
+        "--sizes",
+        required=True,
+        help="Comma-separated generator sizes"
+    )
+    parser.add_argument(
+        "--quota",
+        default="5s",
+        help="Core_bench quota shown in the table header (default: 5s)"
+    )
+    parser.add_argument(
+        "--output",
+        help="CSV file to write (required for --language scala)"
+    )
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    rng = random.Random(f"{args.language}/{args.group}")
+
+    if args.language == "ocaml":
+        tables = {group: prefix for group, prefix in OCAML_TABLES.values()}
+        if args.group not in tables:
+            print(f"Error: Unknown OCaml group {args.group}", file=sys.stderr)
+            return 1
+        variants = BOOLLIST_VARIANTS if args.group == "boollist_bespoke" else OCAML_VARIANTS
+        text, _ = format_core_bench_table(rng, tables[args.group], variants, sizes, parse_quota(args.quota))
+        sys.stdout.write(text)
+        return 0
+
+    if args.group not in SCALA_GROUPS:
+        print(f"Error: Unknown Scala group {args.group}", file=sys.stderr)
+        return 1
+    if not args.output:
+        print("Error: --output is required for --language scala", file=sys.stderr)
+        return 1
+    with open(args.output, "w") as f:
+        f.write(JMH_HEADER)
+        f.writelines(jmh_lines(rng, args.group, sizes))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
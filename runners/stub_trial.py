@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Stand-in for a real ETNA trial, for exercising the schedulers without OCaml.
+
+Sleeps for a deterministic pseudo-random time derived from the trial's
+(system, strategy, mutant, prop, seed), with the same per-task difficulty and
+staging speedups as benchmarks/generate_synthetic_data.py, scaled down by
+--time-scale. Prints the trial result in the format parse_etna_data.py reads.
+
+Usage:
+    python stub_trial.py --system BST --strategy baseBespokestaged --mutant insert_1 --prop prop_InsertPost --seed 42
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+# Base directory for eval data
+EVAL_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(EVAL_DIR))
+sys.path.insert(0, str(EVAL_DIR / "benchmarks"))
+
+from common.benchmarks import TIMEOUT
+from generate_synthetic_data import STAGE_SPEEDUPS
+
+
+def stub_duration(system, strategy, mutant, prop, seed):
+    """Simulated time to failure in seconds, before --time-scale is applied."""
+    difficulty = 10 ** random.Random(f"{system}/{mutant}/{prop}").uniform(-3.8, 0.5)
+    suffix = next(s for s in sorted(STAGE_SPEEDUPS, key=len, reverse=True) if strategy.endswith(s))
+    noise = random.Random(f"{system}/{strategy}/{mutant}/{prop}/{seed}").lognormvariate(0, 0.5)
+    return difficulty / STAGE_SPEEDUPS[suffix] * noise
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate one ETNA trial.")
+    parser.add_argument("--system", required=True)
+    parser.add_argument("--strategy", required=True)
+    parser.add_argument("--mutant", required=True)
+    parser.add_argument("--prop", required=True)
+    parser.add_argument("--seed", required=True)
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=0.01,
+        help="Fraction of the simulated time actually slept (default: 0.01)"
+    )
+    args = parser.parse_args()
+
+    duration = stub_duration(args.system, args.strategy, args.mutant, args.prop, args.seed)
+    print("[start]", flush=True)
+    time.sleep(min(duration, TIMEOUT) * args.time_scale)
+    if duration >= TIMEOUT:
+        print("[exit timeout]")
+    else:
+        print(f"[exit ok, {duration:.6f} duration {args.seed}]")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
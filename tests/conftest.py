@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The scripts import each other as top-level modules, as when run directly
+EVAL_DIR = Path(__file__).parent.parent
+for subdir in ("", "parsers", "etna_data_processing", "runners", "benchmarks"):
+    sys.path.insert(0, str(EVAL_DIR / subdir))
+
+SEEDS = ["1", "2", "3"]
+STRATEGIES = ["baseBespoke", "baseBespokestaged"]
+MUTANTS = ["delete_4", "insert_1"]
+PROPERTIES = ["prop_DeletePost", "prop_InsertValid"]
+
+
+@pytest.fixture
+def bst_experiments(tmp_path):
+    """A small bst-experiments tree with one oc3-bst-<seed>/ directory per seed and one timeout."""
+    base = tmp_path / "bst-experiments"
+    duration = 0.0
+    for seed in SEEDS:
+        seed_dir = base / f"oc3-bst-{seed}"
+        seed_dir.mkdir(parents=True)
+        for strategy in STRATEGIES:
+            for mutant in MUTANTS:
+                for prop in PROPERTIES:
+                    duration += 0.01
+                    content = f"[start]\n[exit ok, {duration:.6f} duration {seed}]\n"
+                    if (seed, strategy, mutant) == ("3", "baseBespoke", "insert_1"):
+                        content = "[start]\n[exit timeout]\n"
+                    (seed_dir / f"BST,{strategy},{mutant},{prop}.txt").write_text(content)
+    return base
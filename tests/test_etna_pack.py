@@ -0,0 +1,56 @@
+import filecmp
+import shutil
+
+from etna_pack import PackReader, pack_dir, unpack, verify
+from parse_etna_data import parse_results, scan_results
+
+
+def same_tree(left, right):
+    comparison = filecmp.dircmp(left, right)
+    if comparison.left_only or comparison.right_only:
+        return False
+    _, mismatch, errors = filecmp.cmpfiles(left, right, comparison.common_files, shallow=False)
+    return not mismatch and not errors
+
+
+def test_pack_unpack_round_trip(bst_experiments, tmp_path):
+    seed_dir = bst_experiments / "oc3-bst-1"
+    pack_path, added = pack_dir(seed_dir)
+
+    assert pack_path == bst_experiments / "oc3-bst-1.pack"
+    assert added == len(list(seed_dir.iterdir()))
+    assert verify(pack_path, seed_dir)
+    assert same_tree(seed_dir, unpack(pack_path, tmp_path / "oc3-bst-1"))
+
+
+def test_append_adds_only_new_files(bst_experiments, tmp_path):
+    seed_dir = bst_experiments / "oc3-bst-2"
+    new_file = seed_dir / "BST,baseBespoke,delete_4,prop_DeletePost.txt"
+    content = new_file.read_text()
+    new_file.unlink()
+    pack_path, _ = pack_dir(seed_dir)
+
+    new_file.write_text(content)
+    _, added = pack_dir(seed_dir, append=True)
+    assert added == 1
+    assert len(PackReader(pack_path).entries) == len(list(seed_dir.iterdir()))
+    assert same_tree(seed_dir, unpack(pack_path, tmp_path / "oc3-bst-2"))
+
+
+def test_packed_seeds_scan_like_directories(bst_experiments, tmp_path):
+    expected = scan_results("BST", bst_experiments)
+    expected_parse = parse_results("BST", bst_experiments)
+
+    packed = tmp_path / "packed"
+    shutil.copytree(bst_experiments, packed)
+    for seed in ("1", "3"):
+        pack_dir(packed / f"oc3-bst-{seed}")
+        shutil.rmtree(packed / f"oc3-bst-{seed}")
+    # A pack takes the place of a directory with the same seed
+    pack_dir(packed / "oc3-bst-2")
+
+    results, seeds, files = scan_results("BST", packed)
+    assert results == expected[0]
+    assert sorted(seeds) == sorted(expected[1])
+    assert sorted(files) == sorted(expected[2])
+    assert parse_results("BST", packed) == expected_parse
@@ -0,0 +1,71 @@
+import json
+import shutil
+from argparse import Namespace
+
+import pytest
+
+from etna_partials import cmd_merge, export_partial, load_partial, merge_partials
+from parse_etna_data import parse_results
+
+
+def split_by_seed(experiments, tmp_path, groups):
+    """Copy the seed directories of each group of seeds into its own experiments tree."""
+    trees = []
+    for i, seeds in enumerate(groups):
+        tree = tmp_path / f"machine{i}"
+        for seed in seeds:
+            shutil.copytree(experiments / f"oc3-bst-{seed}", tree / f"oc3-bst-{seed}")
+        trees.append(tree)
+    return trees
+
+
+def write_partial(path, partial):
+    with open(path, "w") as f:
+        json.dump(partial, f)
+    return str(path)
+
+
+def merge_args(partials, output, allow_overlap=False):
+    return Namespace(partials=partials, output=str(output), source="fresh",
+                     allow_overlap=allow_overlap, strict=False, trace_timing=False, profile=False)
+
+
+def test_merged_partials_equal_a_single_parse(bst_experiments, tmp_path):
+    trees = split_by_seed(bst_experiments, tmp_path, [["1", "3"], ["2"]])
+    paths = [write_partial(tmp_path / f"part{i}.json", export_partial("BST", tree))
+             for i, tree in enumerate(trees)]
+
+    output = tmp_path / "bst_results.json"
+    assert cmd_merge(merge_args(paths, output)) == 0
+    with open(output) as f:
+        assert json.load(f) == parse_results("BST", bst_experiments)
+
+
+def test_merge_reports_overlap_and_missing(bst_experiments, tmp_path):
+    trees = split_by_seed(bst_experiments, tmp_path, [["1", "2"], ["2", "3"]])
+    (trees[1] / "oc3-bst-3" / "BST,baseBespokestaged,delete_4,prop_DeletePost.txt").unlink()
+    partials = [export_partial("BST", tree) for tree in trees]
+
+    _, seeds, overlaps, missing = merge_partials(partials)
+    assert seeds == ["1", "2", "3"]
+    assert {cell[3] for cell in overlaps} == {"2"}
+    assert missing == [("delete_4", "prop_DeletePost", "baseBespokestaged", "3")]
+
+
+def test_duplicate_partials_are_rejected(bst_experiments, tmp_path):
+    path = write_partial(tmp_path / "part.json", export_partial("BST", bst_experiments))
+    output = tmp_path / "bst_results.json"
+
+    assert cmd_merge(merge_args([path, path], output)) == 1
+    assert not output.exists()
+    # Identical duplicates are only accepted on request
+    assert cmd_merge(merge_args([path, path], output, allow_overlap=True)) == 0
+
+
+def test_modified_partial_fails_its_checksum(bst_experiments, tmp_path):
+    partial = export_partial("BST", bst_experiments)
+    partial["records"]["delete_4"]["prop_DeletePost"]["baseBespoke_1"] = 1.0
+    path = write_partial(tmp_path / "part.json", partial)
+
+    with pytest.raises(ValueError, match="checksum"):
+        load_partial(path)
@@ -0,0 +1,39 @@
+from etna_scheduler import run_trial, trial_content
+from parse_etna_data import parse_trial, trial_status
+
+
+def test_trial_status():
+    assert trial_status("[start]\n[exit timeout]\n") == ("timeout", None)
+    assert trial_status("[start]\n[exit ok, 1.250000 duration 42]\n") == ("ok", 1.25)
+    assert trial_status("[start]\n") == (None, None)
+
+
+def test_parse_trial_keeps_60s_for_timeouts():
+    assert parse_trial("[start]\n[exit timeout]\n") == 60.0
+    assert parse_trial("[start]\n[exit ok, 1.250000 duration 42]\n") == 1.25
+
+
+def test_own_timeout_is_a_timeout_whatever_the_limit():
+    content, status = trial_content("[start]\n[exit timeout]\n", 0.5, 120, "42")
+    assert status == "timeout"
+    assert content == "[start]\n[exit timeout]\n"
+
+
+def test_durations_against_the_limit():
+    content, status = trial_content("[exit ok, 1.250000 duration 42]\n", 2.0, 120, "42")
+    assert (content, status) == ("[start]\n[exit ok, 1.250000 duration 42]\n", "ok")
+    _, status = trial_content("[exit ok, 90.000000 duration 42]\n", 90.0, 60, "42")
+    assert status == "timeout"
+
+
+def test_missing_result_line_uses_wall_clock():
+    content, status = trial_content("no result\n", 3.5, 60, "7")
+    assert (content, status) == ("[start]\n[exit ok, 3.500000 duration 7]\n", "ok")
+
+
+def test_unstartable_trial_counts_as_failed(tmp_path):
+    trial = {"system": "BST", "strategy": "baseBespoke", "mutant": "insert_1",
+             "prop": "prop_InsertPost", "seed": "42"}
+    status, _ = run_trial(trial, "/nonexistent/run_trial {seed}", tmp_path, 60)
+    assert status == "failed"
+    assert not list(tmp_path.rglob("*.txt"))
@@ -0,0 +1,53 @@
+import csv
+import json
+import sys
+
+from generator_sweep import STUB_COMMANDS, build_jobs, run_job, run_language
+
+
+def read_tag(target):
+    with open(target / "sweep.json") as f:
+        return json.load(f)
+
+
+def test_stub_sweep_writes_results_and_tags(tmp_path):
+    config = {"ocaml": {"groups": ["bst_bespoke"], "sizes": [10, 100]},
+              "scala": {"groups": ["BstBespoke", "Term"], "sizes": [10, 100]}}
+    for language in ("ocaml", "scala"):
+        jobs = build_jobs(config, tmp_path, [language])
+        assert run_language(jobs, STUB_COMMANDS[language], 2) == {"ok": len(jobs), "skipped": 0}
+        # A second run finds every output and skips it
+        assert run_language(jobs, STUB_COMMANDS[language], 2) == {"skipped": len(jobs)}
+
+    ocaml = tmp_path / "4.1_data_ocaml" / "fresh"
+    assert (ocaml / "results_bst.txt").read_text().strip()
+    assert read_tag(ocaml)["groups"]["bst_bespoke"]["status"] == "ok"
+
+    scala = tmp_path / "4.1_data_scala" / "fresh"
+    with open(scala / "results_scala.csv", newline="") as f:
+        benchmarks = {row["Benchmark"] for row in csv.DictReader(f)}
+    assert any("BstBespoke" in name for name in benchmarks)
+    assert any("Term" in name for name in benchmarks)
+    assert set(read_tag(scala)["groups"]) == {"BstBespoke", "Term"}
+
+
+def test_unstartable_command_is_a_failed_job(tmp_path):
+    config = {"ocaml": {"groups": ["bst_bespoke"]}}
+    jobs = build_jobs(config, tmp_path, ["ocaml"])
+
+    assert run_language(jobs, "/nonexistent/bench {name}", 1) == {"failed": 1, "skipped": 0}
+    target = jobs[0]["target"]
+    assert read_tag(target)["groups"]["bst_bespoke"]["status"] == "failed"
+    assert not jobs[0]["output"].exists()
+
+
+def test_timeout_and_failure_leave_no_output(tmp_path):
+    config = {"ocaml": {"groups": ["bst_bespoke"], "timeout": 1}}
+    job = build_jobs(config, tmp_path, ["ocaml"])[0]
+    python = f"{sys.executable} -c"
+
+    status, _ = run_job(job, python + " 'import time; time.sleep(30)'")
+    assert status == "timeout"
+    status, _ = run_job(job, python + " \"open('{output}', 'w').write('x'); exit(3)\"")
+    assert status == "failed"
+    assert not list(job["target"].iterdir())
@@ -0,0 +1,47 @@
+from etna_scheduler import STUB_COMMAND, build_trials, run_sweep
+from interference import REPEAT_DIR, analyze_system, level_dir
+from parse_etna_data import parse_trial
+
+SPEC = {
+    "systems": ["BST"],
+    "strategies": {"BST": ["baseBespoke", "baseBespokestaged", "baseBespokestagedc", "baseBespokestagedcsr"]},
+    "tasks": {"BST": {"insert_1": ["prop_InsertPost"], "delete_4": ["prop_DeletePost"]}},
+    "seeds": [1, 2],
+}
+
+
+def run_levels(output_dir, levels):
+    trials = build_trials(SPEC)
+    for level, root in [(1, output_dir / REPEAT_DIR)] + [(level, level_dir(output_dir, level)) for level in levels]:
+        counts = run_sweep(trials, STUB_COMMAND, root, level, 60)
+        assert counts.get("ok", 0) + counts.get("timeout", 0) == len(trials)
+
+
+def inflate(root, factor):
+    """Multiply every recorded duration under a level's tree by `factor`."""
+    for path in root.rglob("*.txt"):
+        duration = parse_trial(path.read_text())
+        path.write_text(f"[start]\n[exit ok, {duration * factor:.6f} duration 0]\n")
+
+
+def test_stub_levels_are_safe(tmp_path):
+    # The stub reports the same simulated duration at every concurrency level
+    run_levels(tmp_path, [1, 2])
+    report = analyze_system(tmp_path, "BST", [1, 2], 0.05)
+
+    for entry in report["levels"][2]["strategies"].values():
+        assert abs(entry["inflation"] - 1) < 1e-6
+        assert entry["new_timeouts"] == 0
+    assert report["workloads"]["bespoke"] == {"max_safe_concurrency": 2, "problems": {}}
+
+
+def test_inflated_level_is_unsafe(tmp_path):
+    run_levels(tmp_path, [1, 2, 4])
+    inflate(level_dir(tmp_path, 4), 1.5)
+    report = analyze_system(tmp_path, "BST", [1, 2, 4], 0.05)
+
+    for entry in report["levels"][4]["strategies"].values():
+        assert abs(entry["inflation"] - 1.5) < 1e-3
+    verdict = report["workloads"]["bespoke"]
+    assert verdict["max_safe_concurrency"] == 2
+    assert list(verdict["problems"]) == [4]
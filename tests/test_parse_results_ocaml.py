@@ -0,0 +1,77 @@
+import csv
+import io
+
+import pytest
+
+from conftest import EVAL_DIR
+from parse_results_ocaml import (
+    _parse_csv_lines, _parse_sexp_text, _parse_table_lines, parse_benchmark_file, parse_time_ns,
+)
+
+BST_TABLE = EVAL_DIR / "4.1_data_ocaml" / "precomputed" / "results_bst.txt"
+
+
+def table_cells(path):
+    """(name, time string) of every result row of a Core_bench box table."""
+    cells = []
+    for line in path.read_text().splitlines():
+        if not line.startswith('│ '):
+            continue
+        name, time_str = [col.strip() for col in line.strip('│ ').split('│')][:2]
+        if name != 'Name':
+            cells.append((name, time_str))
+    return cells
+
+
+def render_csv(cells):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["Name", "Time/Run"])
+    writer.writerows(cells)
+    return out.getvalue().splitlines(keepends=True)
+
+
+def render_sexp(cells):
+    """Core_bench -sexp analysis results: one record per benchmark with a time regression on Runs."""
+    records = [
+        f'((name "{name}") (results (((responder Time) '
+        f'(coefficients (((predictor Runs) (estimate {time_str.replace("_", "")}))))))))'
+        for name, time_str in cells
+    ]
+    return "(" + "\n".join(records) + ")"
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("557.90ns", 557.90),
+    ("1_935_512.45ns", 1_935_512.45),
+    ("3.2us", 3_200.0),
+    ("3.2µs", 3_200.0),
+    ("1.5ms", 1_500_000.0),
+    ("2s", 2e9),
+    ("1.5e3ns", 1_500.0),
+    ("42", 42.0),
+])
+def test_parse_time_ns_units(text, expected):
+    assert parse_time_ns(text) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("text", ["", "   ", "fast", "12w"])
+def test_parse_time_ns_rejects_non_times(text):
+    assert parse_time_ns(text) is None
+
+
+def test_csv_and_sexp_match_the_box_table():
+    table = _parse_table_lines(BST_TABLE.read_text().splitlines(keepends=True), "bst_bespoke")
+    assert table == parse_benchmark_file(BST_TABLE, "bst_bespoke")[0]
+    assert set(table) == {"base", "base_Staged_SR", "base_Staged_CSR"}
+    assert table["base"][10] == pytest.approx(3_223.69)
+
+    cells = table_cells(BST_TABLE)
+    assert _parse_csv_lines(render_csv(cells), "bst_bespoke") == table
+    assert _parse_sexp_text(render_sexp(cells), "bst_bespoke") == table
+
+
+def test_other_groups_are_left_out():
+    cells = table_cells(BST_TABLE)
+    assert not _parse_csv_lines(render_csv(cells), "bst_type")
+    assert not _parse_sexp_text(render_sexp(cells), "bst_type")
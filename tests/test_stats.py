@@ -0,0 +1,17 @@
+import pytest
+
+from common.stats import t_quantile
+
+
+@pytest.mark.parametrize("p, df, expected", [
+    (0.975, 1, 12.706),
+    (0.95, 1, 6.314),
+    (0.975, 2, 4.303),
+    (0.995, 2, 9.925),
+    (0.975, 3, 3.182),
+    (0.975, 10, 2.228),
+    (0.975, 30, 2.042),
+])
+def test_t_quantile_matches_tables(p, df, expected):
+    assert t_quantile(p, df) == pytest.approx(expected, rel=1e-2)
+    assert t_quantile(1 - p, df) == pytest.approx(-expected, rel=1e-2)